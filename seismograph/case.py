@@ -12,10 +12,14 @@ from . import steps
 from . import loader
 from . import reason
 from . import runnable
+from .utils import aio
 from .utils import pyv
+from . import watchdog
+from . import resources
 from . import extensions
 from .utils import common
 from .exceptions import Skip
+from .exceptions import CaseTimeout
 from .utils.common import measure_time
 from .utils.common import call_to_chain
 from .exceptions import DependencyError
@@ -64,14 +68,14 @@ def prepare(case, method):
 def setup_class_proxy(case):
     if getattr(case.__class__, '__setup_class_was_called__', False):
         return
-    case.setup_class()
+    aio.resolve(case.setup_class())
     setattr(case.__class__, '__setup_class_was_called__', True)
 
 
 def teardown_class_proxy(case):
     if getattr(case.__class__, '__teardown_class_was_called__', False):
         return
-    case.teardown_class()
+    aio.resolve(case.teardown_class())
     setattr(case.__class__, '__teardown_class_was_called__', True)
 
 
@@ -131,7 +135,7 @@ def flows(*flows):
                         self.log(
                             'Flow: ', pyv.unicode_string(flow),
                         )
-                f(self, flow, *args, **kwargs)
+                aio.resolve(f(self, flow, *args, **kwargs))
         return wrapped
     return wrapper
 
@@ -212,14 +216,20 @@ class CaseBox(object):
     def __len__(self):
         return len(self.__cases)
 
-    def __run_current__(self, result):
+    def __iter_run_current__(self, result, limit=None):
         if self.__current.__repeatable__ and self.__current.config.REPEAT > 0:
             for _ in pyv.xrange(self.__current.config.REPEAT):
-                self.__current(result)
+                yield self.__current.__iter_run__(result, limit=limit)
         else:
-            self.__current(result)
+            yield self.__current.__iter_run__(result, limit=limit)
 
     def __run__(self, result):
+        aio.drive(self.__iter_run__(result))
+
+    def __iter_run__(self, result, limit=None):
+        """
+        Cases are yielded as nested generators
+        """
         for case in self.__cases:
             self.__current = case
             try:
@@ -227,7 +237,7 @@ class CaseBox(object):
             except BaseException as error:
                 runnable.stopped_on(self.__current, 'setup_class')
                 raise error
-            self.__run_current__(result)
+            yield self.__iter_run_current__(result, limit=limit)
 
         if self.__current:
             try:
@@ -239,14 +249,19 @@ class CaseBox(object):
 
 class MountData(object):
 
-    def __init__(self, suite_name=None, require=None):
+    def __init__(self, suite_name=None, require=None, resources=None):
         self.__require = require
+        self.__resources = resources
         self.__suite_name = suite_name
 
     @property
     def require(self):
         return self.__require
 
+    @property
+    def resources(self):
+        return self.__resources
+
     @property
     def suite_name(self):
         return self.__suite_name
@@ -728,7 +743,9 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
     __flows__ = None
     __layers__ = None
     __static__ = False
+    __timeout__ = None
     __require__ = None
+    __resources__ = None
     __repeatable__ = True
     __create_reason__ = True
     __always_success__ = False
@@ -795,6 +812,17 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         return reason.join(*reasons)
 
     def __run__(self, result):
+        aio.drive(self.__iter_run__(result))
+
+    def __iter_run__(self, result, limit=None):
+        """
+        Run case step by step. Value which was returned
+        from test method is yielded to be resolved by caller,
+        coroutine can be awaited on event loop without thread.
+        Limit of time is taken from watchdog by default.
+        """
+        limit = limit or watchdog.limit
+
         self.__is_run = True
         timer = measure_time()
 
@@ -826,44 +854,52 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
 
                 was_success = True
 
-                for _ in iter(repeat(self)):
-                    with self.__context(self):
-                        try:
-                            test_method = prepare(
-                                self, getattr(self, runnable.method_name(self)),
-                            )
-                            for _ in iter(repeat_method(self)):
-                                test_method()
-                        except ALLOW_RAISED_EXCEPTIONS:
-                            result_proxy.current_state.should_stop = True
-                            raise
-                        except Skip as s:
-                            runnable.set_debug_if_allowed(self.config)
-                            was_success = False
-                            self.__context.on_skip(self, s.message, result_proxy)
-                            result_proxy.add_skip(
-                                self, s.message, timer(),
-                            )
-                        except AssertionError as fail:
-                            runnable.set_debug_if_allowed(self.config)
-                            was_success = False
-                            tb = traceback.format_exc()
-                            self.__context.on_fail(fail, self, result_proxy, tb, timer)
-                            result_proxy.add_fail(
-                                self, tb, timer(), fail,
-                            )
-                        except BaseException as error:
-                            runnable.set_debug_if_allowed(self.config)
-                            was_success = False
-                            tb = traceback.format_exc()
-                            self.__context.on_error(error, self, result_proxy, tb, timer)
-                            self.__context.on_any_error(error, self, result_proxy, tb, timer)
-                            result_proxy.add_error(
-                                self, tb, timer(), error,
-                            )
-
-                    if not was_success:
-                        break
+                def on_kill(stack):
+                    result_proxy.add_error(
+                        self, stack, timer(), CaseTimeout(),
+                    )
+                    result_proxy.console.flush()
+
+                with resources.hold(self), limit(self, on_kill=on_kill):
+                    for _ in iter(repeat(self)):
+                        with self.__context(self):
+                            try:
+                                test_method = prepare(
+                                    self, getattr(self, runnable.method_name(self)),
+                                )
+                                for _ in iter(repeat_method(self)):
+                                    yield test_method()
+                            except ALLOW_RAISED_EXCEPTIONS:
+                                result_proxy.current_state.should_stop = True
+                                raise
+                            except Skip as s:
+                                runnable.set_debug_if_allowed(self.config)
+                                was_success = False
+                                self.__context.on_skip(self, s.message, result_proxy)
+                                result_proxy.add_skip(
+                                    self, s.message, timer(),
+                                )
+                            except AssertionError as fail:
+                                runnable.set_debug_if_allowed(self.config)
+                                was_success = False
+                                tb = traceback.format_exc()
+                                self.__context.on_fail(fail, self, result_proxy, tb, timer)
+                                result_proxy.add_fail(
+                                    self, tb, timer(), fail,
+                                )
+                            except BaseException as error:
+                                runnable.set_debug_if_allowed(self.config)
+                                watchdog.disarm(error)
+                                was_success = False
+                                tb = traceback.format_exc()
+                                self.__context.on_error(error, self, result_proxy, tb, timer)
+                                self.__context.on_any_error(error, self, result_proxy, tb, timer)
+                                result_proxy.add_error(
+                                    self, tb, timer(), error,
+                                )
+
+                        if not was_success:
+                            break
 
                 if was_success:
                     self.__context.on_success(self, timer)
@@ -874,6 +910,7 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
                 raise
             except BaseException as error:
                 runnable.set_debug_if_allowed(self.config)
+                watchdog.disarm(error)
                 tb = traceback.format_exc()
                 self.__context.on_context_error(error, self, result_proxy, tb, timer)
                 self.__context.on_any_error(error, self, result_proxy, tb, timer)
@@ -980,6 +1017,7 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
         cls.__mount_data__ = MountData(
             suite_name=suite.name,
             require=common_require,
+            resources=suite.resources,
         )
 
         return cls
@@ -1014,6 +1052,13 @@ class Case(with_metaclass(steps.CaseMeta, runnable.RunnableObject, runnable.Moun
     def context(self):
         return self.__context
 
+    @property
+    def resources(self):
+        return resources.merge(
+            getattr(self.__mount_data__, 'resources', None),
+            self.__resources__,
+        )
+
     @property
     def assertion(self):
         return self.__assertion
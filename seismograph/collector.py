@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import hashlib
+import threading
 from random import Random
 
 from . import loader
+from . import history
 from . import extensions
+from .case import CaseBox
 from .suite import BuildRule
+from .utils import pyv
+from .config import parse_shard
 from .exceptions import CollectError
 from .utils.common import call_to_chain
 
@@ -20,6 +26,144 @@ def get_shuffle(config):
     return None
 
 
+def get_schedule(config):
+    if config.SCHEDULE == 'duration':
+        return history.Schedule(
+            history.load(config.HISTORY_PATH),
+            config.DEFAULT_RUNTIME,
+        )
+    return None
+
+
+def get_order(config):
+    shuffle = get_schedule(config) or get_shuffle(config)
+
+    if config.FAILED_FIRST:
+        return history.FailedFirst(
+            history.load(config.HISTORY_PATH).failed, shuffle=shuffle,
+        )
+
+    return shuffle
+
+
+def is_selected(case_id, command):
+    """
+    Command like "suite" or "suite:Case" selects case id like "suite:Case.test"
+    """
+    return case_id == command or \
+        case_id.startswith(command + ':') or \
+        case_id.startswith(command + '.')
+
+
+def get_last_failed(suites, config):
+    """
+    Get commands to run cases which were failed on the last run.
+    Cases which were removed or were not selected by "-t" are skipped.
+    """
+    known_ids = history.get_known_ids(suites)
+    commands = []
+
+    for case_id in history.load(config.HISTORY_PATH).failed:
+        if case_id not in known_ids:
+            if get_suite_name_from_command(case_id) in known_ids:
+                logger.warning(
+                    'Failed case "{}" was not found and will be skipped'.format(case_id),
+                )
+            continue
+
+        if config.TESTS and not any(is_selected(case_id, c) for c in config.TESTS):
+            continue
+
+        commands.append(case_id)
+
+    return commands
+
+
+def get_shard(config):
+    if config.SHARD:
+        return parse_shard(config.SHARD)
+    return None
+
+
+def get_unit_name(case):
+    """
+    Get stable name of case like "suite:Case.test".
+    Cases of box can not be separated, so name of class is used for them.
+    """
+    if isinstance(case, CaseBox):
+        return next(iter(case)).name
+    return history.get_case_id(case)
+
+
+def stable_hash(name):
+    # builtin hash of string is randomized on python 3
+    if isinstance(name, pyv.unicode):
+        name = name.encode('utf-8')
+    return int(hashlib.md5(name).hexdigest(), 16)
+
+
+def split_by_hash(units, total):
+    """
+    Get num of shard for each case by hash of name.
+    Hash is the same on each run and on each machine.
+    """
+    return dict(
+        (name, stable_hash(name) % total) for name, _ in units
+    )
+
+
+def split_by_runtime(units, total, schedule):
+    """
+    Get num of shard for each case by greedy bin packing.
+    The longest case is added to the shard which has got
+    the least runtime, so shards are finished at about the same time.
+    """
+    loads = [float()] * total
+    shards = {}
+
+    estimated = sorted(
+        ((schedule.estimate(case), name) for name, case in units),
+        key=lambda item: (-item[0], item[1]),
+    )
+
+    for runtime, name in estimated:
+        shard = loads.index(min(loads))
+        shards[name] = shard
+        loads[shard] += runtime
+
+    return shards
+
+
+def apply_shard(suites, shard, config):
+    """
+    Keep cases of current shard only. Suites which
+    have not got cases after that are dropped.
+    Each node should compute the same split, so history
+    is used only if path of it was given explicitly.
+    """
+    index, total = shard
+
+    units = [
+        (get_unit_name(case), case)
+        for suite in suites for case in suite
+    ]
+
+    run_history = history.load(config.HISTORY_PATH) if config.get('SHARD_BY_RUNTIME') else None
+
+    if run_history and (run_history.suites or run_history.cases):
+        schedule = history.Schedule(run_history, config.DEFAULT_RUNTIME)
+        shards = split_by_runtime(units, total, schedule)
+    else:
+        shards = split_by_hash(units, total)
+
+    for suite in suites:
+        suite.keep_cases(
+            lambda case: shards[get_unit_name(case)] == index - 1,
+        )
+
+    return [suite for suite in suites if suite]
+
+
 def get_suite_name_from_command(command):
     try:
         suite_name, _ = command.split(':')
@@ -53,6 +197,84 @@ def get_test_name_from_command(command):
         return None
 
 
+def is_lazy_build(config, shard):
+    """
+    Suites are built before run if all cases are
+    required for splitting them between shards
+    or for estimation of runtime of suites.
+    """
+    if config is None or not config.LAZY_BUILD:
+        return False
+
+    if shard or config.SCHEDULE == 'duration':
+        logger.debug('Suites will be built before run because of shard or schedule')
+        return False
+
+    return True
+
+
+class SuiteBuild(object):
+    """
+    Build of suite which can be done on background thread.
+    Error of build is raised on getting of suite.
+    """
+
+    def __init__(self, suite, shuffle=None):
+        self.__suite = suite
+        self.__shuffle = shuffle
+
+        self.__error = None
+        self.__thread = None
+
+    def build(self):
+        call_to_chain([self.__suite], 'build', shuffle=self.__shuffle)
+
+    def background_build(self):
+        try:
+            self.build()
+        except BaseException as error:
+            self.__error = error
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.background_build)
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def get(self):
+        if self.__thread is None:
+            self.build()
+        else:
+            self.__thread.join()
+
+            if self.__error is not None:
+                raise self.__error
+
+        return self.__suite
+
+
+def lazy_generator(suites, shuffle=None, prefetch=False):
+    """
+    Suites are built just before run of them. If prefetch is enabled,
+    the next suite is built on background thread while current is running.
+    """
+    suites = list(suites)
+
+    if shuffle:
+        shuffle(suites)
+
+    builds = [SuiteBuild(suite, shuffle=shuffle) for suite in suites]
+
+    for index, build in enumerate(builds):
+        suite = build.get()
+
+        if prefetch and index + 1 < len(builds):
+            builds[index + 1].start()
+
+        yield suite
+
+    extensions.clear()
+
+
 def try_apply_rules(suite, rules):
     for rule in rules[::-1]:
         if rule.is_of(suite):
@@ -60,10 +282,18 @@ def try_apply_rules(suite, rules):
             rules.remove(rule)
 
 
-def base_generator(suites, shuffle=None):
+def base_generator(suites, shuffle=None, shard=None, config=None):
+    if is_lazy_build(config, shard):
+        for suite in lazy_generator(suites, shuffle=shuffle, prefetch=config.PREFETCH):
+            yield suite
+        return
+
     call_to_chain(suites, 'build', shuffle=shuffle)
     extensions.clear()
 
+    if shard:
+        suites = apply_shard(suites, shard, config)
+
     if shuffle:
         shuffle(suites)
 
@@ -71,7 +301,7 @@ def base_generator(suites, shuffle=None):
         yield suite
 
 
-def generator_by_commands(suites, rules, shuffle=None):
+def generator_by_commands(suites, rules, shuffle=None, shard=None, config=None):
     loaded_suites = []
 
     for rule in rules[::-1]:
@@ -88,9 +318,17 @@ def generator_by_commands(suites, rules, shuffle=None):
             ),
         )
 
+    if is_lazy_build(config, shard):
+        for suite in lazy_generator(loaded_suites, shuffle=shuffle, prefetch=config.PREFETCH):
+            yield suite
+        return
+
     call_to_chain(loaded_suites, 'build', shuffle=shuffle)
     extensions.clear()
 
+    if shard:
+        loaded_suites = apply_shard(loaded_suites, shard, config)
+
     if shuffle:
         shuffle(loaded_suites)
 
@@ -99,7 +337,17 @@ def generator_by_commands(suites, rules, shuffle=None):
 
 
 def create_generator(suites, config):
-    if config.TESTS:
+    commands = config.TESTS
+
+    if config.LAST_FAILED:
+        last_failed = get_last_failed(suites, config)
+
+        if last_failed:
+            commands = last_failed
+        else:
+            logger.info('No failures on the last run, selected suites will be run')
+
+    if commands:
         logger.debug('Create suite generator by commands')
 
         rules = [
@@ -108,14 +356,20 @@ def create_generator(suites, config):
                 case_name=get_case_name_from_command(c),
                 test_name=get_test_name_from_command(c),
             )
-            for c in config.TESTS
+            for c in commands
         ]
         return generator_by_commands(
-            suites, rules, shuffle=get_shuffle(config),
+            suites, rules,
+            shuffle=get_order(config),
+            shard=get_shard(config),
+            config=config,
         )
 
     logger.debug('Create base suite generator')
 
     return base_generator(
-        suites, shuffle=get_shuffle(config),
+        suites,
+        shuffle=get_order(config),
+        shard=get_shard(config),
+        config=config,
     )
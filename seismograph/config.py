@@ -2,6 +2,7 @@
 
 import os
 import imp
+import sys
 import time
 import logging
 from optparse import OptionGroup
@@ -26,6 +27,25 @@ def create_option_parser():
         default=None,
         help='Path to xml file to store the xunit report in.',
     )
+    result_group.add_option(
+        '--repair-xunit-report',
+        dest='REPAIR_XUNIT_REPORT',
+        default=None,
+        help='Close xunit report which was truncated by crash of run and exit.',
+    )
+    result_group.add_option(
+        '--jsonl-report',
+        dest='JSONL_REPORT',
+        default=None,
+        help='Path to file to store events of start and finish of cases in JSON Lines.',
+    )
+    result_group.add_option(
+        '--binary-report',
+        dest='BINARY_REPORT',
+        default=None,
+        help='Path to file to store events of start and finish of cases '
+             'as marshalled data with length of it in header.',
+    )
     parser.add_option_group(result_group)
 
     console_group = OptionGroup(parser, 'Output options')
@@ -147,6 +167,28 @@ def create_option_parser():
         default=False,
         help='Run each of cases with first flow and exiting after that.',
     )
+    run_group.add_option(
+        '--schedule',
+        dest='SCHEDULE',
+        type='choice',
+        choices=('default', 'duration'),
+        default='default',
+        help='Order of run. "duration" runs the longest suites and cases first by history.',
+    )
+    run_group.add_option(
+        '--history',
+        dest='HISTORY_PATH',
+        type=str,
+        default=None,
+        help='Path to file to store runtimes and failures of suites and cases in.',
+    )
+    run_group.add_option(
+        '--default-runtime',
+        dest='DEFAULT_RUNTIME',
+        type=float,
+        default=float(1),
+        help='Estimated runtime of case which is not in history.',
+    )
     run_group.add_option(
         '--random-seed',
         dest='RANDOM_SEED',
@@ -174,6 +216,46 @@ def create_option_parser():
         default=False,
         help='Ignore tests on run.',
     )
+    run_group.add_option(
+        '--last-failed',
+        dest='LAST_FAILED',
+        action='store_true',
+        default=False,
+        help='Run only cases which were failed on the last run. '
+             'Failures are stored to history file.',
+    )
+    run_group.add_option(
+        '--failed-first',
+        dest='FAILED_FIRST',
+        action='store_true',
+        default=False,
+        help='Run cases which were failed on the last run first.',
+    )
+    run_group.add_option(
+        '--shard',
+        dest='SHARD',
+        default=None,
+        help='Run part of cases like "INDEX/TOTAL", INDEX is from 1 to TOTAL. '
+             'Cases are split by runtime from history if "--history" is given '
+             'or by hash of name otherwise. Shards are split by runtime the same '
+             'way on each node only if the same history file is given to each of them.',
+    )
+    run_group.add_option(
+        '--lazy-build',
+        dest='LAZY_BUILD',
+        action='store_true',
+        default=False,
+        help='Build suites just before run of them. Not used with '
+             '"--shard" and "--schedule duration" which need all cases.',
+    )
+    run_group.add_option(
+        '--prefetch',
+        dest='PREFETCH',
+        action='store_true',
+        default=False,
+        help='Build next suite on background thread while current '
+             'suite is running. Enables "--lazy-build".',
+    )
     run_group.add_option(
         '--async-suites',
         type=int,
@@ -188,6 +270,23 @@ def create_option_parser():
         default=0,
         help='Num tests from suite to async run.',
     )
+    run_group.add_option(
+        '--max-threads',
+        type=int,
+        dest='MAX_THREADS',
+        default=0,
+        help='Num of threads which are shared between all suites. '
+             'Default is "--async-suites" multiplied by "--async-tests", '
+             'on asyncio it is not more than num of cores plus 4.',
+    )
+    run_group.add_option(
+        '--workers',
+        dest='WORKERS',
+        default=None,
+        help='Topology of run like "P:T". P processes are running suites and '
+             'T cases are running concurrently inside each of them '
+             'on threads or on asyncio executor with "--asyncio".',
+    )
     run_group.add_option(
         '--split-flows',
         dest='SPLIT_FLOWS',
@@ -195,6 +294,13 @@ def create_option_parser():
         default=False,
         help='Allow to create separated case classes for flow from base case.',
     )
+    run_group.add_option(
+        '--split-suites',
+        dest='SPLIT_SUITES',
+        action='store_true',
+        default=False,
+        help='Distribute cases of suite between processes. For multiprocessing only.',
+    )
     run_group.add_option(
         '--mp-timeout',
         type=float,
@@ -202,6 +308,22 @@ def create_option_parser():
         default=float(1800),
         help='Timeout to release and join multiprocessing process.',
     )
+    run_group.add_option(
+        '--case-timeout',
+        type=float,
+        dest='CASE_TIMEOUT',
+        default=float(0),
+        help='Timeout of case running. Case is interrupted with error after it. '
+             'Can be redefined by "__timeout__" attribute of case class.',
+    )
+    run_group.add_option(
+        '--grace-timeout',
+        type=float,
+        dest='GRACE_TIMEOUT',
+        default=float(10),
+        help='Timeout for running tests to be finished after fail fast '
+             'or interrupt. Worker processes are terminated after it.',
+    )
     run_group.add_option(
         '--gevent',
         dest='GEVENT',
@@ -216,6 +338,13 @@ def create_option_parser():
         default=False,
         help='Use threading groups for run.',
     )
+    run_group.add_option(
+        '--asyncio',
+        dest='ASYNCIO',
+        action='store_true',
+        default=False,
+        help='Use asyncio groups for run. Allow for python 3 only.',
+    )
     run_group.add_option(
         '--multiprocessing',
         dest='MULTIPROCESSING',
@@ -223,6 +352,68 @@ def create_option_parser():
         default=False,
         help='Use multiprocessing groups for run.',
     )
+    run_group.add_option(
+        '--preload',
+        action='append',
+        dest='PRELOAD',
+        default=[],
+        help='Import module before fork of worker processes. '
+             'Can be used several times.',
+    )
+    run_group.add_option(
+        '--coordinator',
+        dest='COORDINATOR',
+        default=None,
+        help='Run suites on agents which are connecting to "HOST:PORT". '
+             'Data of agents is trusted after token was checked, '
+             'so port must not be exposed to untrusted network.',
+    )
+    run_group.add_option(
+        '--agent',
+        dest='AGENT',
+        default=None,
+        help='Connect to coordinator on "HOST:PORT" and run suites '
+             'which are coming from it. Agent should be started '
+             'with the same suites and options as coordinator, '
+             'reports and history are written by coordinator.',
+    )
+    run_group.add_option(
+        '--agent-token',
+        dest='AGENT_TOKEN',
+        default=None,
+        help='Secret which is shared by coordinator and agents. '
+             'Agent which has sent another token is not accepted.',
+    )
+    run_group.add_option(
+        '--serve',
+        dest='SERVE',
+        action='store_true',
+        default=False,
+        help='Keep suites loaded and run them by requests of clients. '
+             'Each run is forked from loaded state of daemon.',
+    )
+    run_group.add_option(
+        '--client',
+        dest='CLIENT',
+        action='store_true',
+        default=False,
+        help='Send options of run to daemon which was started '
+             'with "--serve" and print output of run.',
+    )
+    run_group.add_option(
+        '--watch',
+        dest='WATCH',
+        action='store_true',
+        default=False,
+        help='Run suites and run again suites of modules '
+             'which were changed.',
+    )
+    run_group.add_option(
+        '--daemon-socket',
+        dest='DAEMON_SOCKET',
+        default='.seismograph.sock',
+        help='Path to unix socket of daemon. Default: ".seismograph.sock".',
+    )
     run_group.add_option(
         '--pdb',
         dest='PDB',
@@ -235,6 +426,44 @@ def create_option_parser():
     return parser
 
 
+def parse_workers(value):
+    """
+    Get num of processes and num of cases per process from "P:T"
+    """
+    try:
+        processes, threads = (int(v) for v in value.split(':'))
+    except ValueError:
+        raise ConfigError(
+            'Incorrect value of workers "{}", should be like "P:T"'.format(value),
+        )
+
+    if processes < 1 or threads < 1:
+        raise ConfigError(
+            'Num of processes and num of cases should be greater than 0',
+        )
+
+    return processes, threads
+
+
+def parse_shard(value):
+    """
+    Get index of shard and num of shards from "INDEX/TOTAL"
+    """
+    try:
+        index, total = (int(v) for v in value.split('/'))
+    except ValueError:
+        raise ConfigError(
+            'Incorrect value of shard "{}", should be like "INDEX/TOTAL"'.format(value),
+        )
+
+    if total < 1 or not 1 <= index <= total:
+        raise ConfigError(
+            'Index of shard should be from 1 to {}'.format(total),
+        )
+
+    return index, total
+
+
 def prepare_config(config):
     logging_settings = config.get('LOGGING_SETTINGS')
 
@@ -242,13 +471,61 @@ def prepare_config(config):
         from logging.config import dictConfig
         dictConfig(logging_settings)
 
-    if not config.GEVENT and not config.THREADING and (
+    if config.COORDINATOR and config.AGENT:
+        raise ConfigError(
+            '"--coordinator" can not be used with "--agent"',
+        )
+
+    if config.ASYNCIO and sys.version_info < (3, 4):
+        raise ConfigError(
+            '"--asyncio" is supported on python 3 only',
+        )
+
+    if config.AGENT:
+        # the same options are given to agents,
+        # but reports are written by coordinator
+        config.XUNIT_REPORT = None
+        config.JSONL_REPORT = None
+        config.BINARY_REPORT = None
+
+    if sum(bool(v) for v in (config.SERVE, config.CLIENT, config.WATCH)) > 1:
+        raise ConfigError(
+            '"--serve", "--client" and "--watch" can not be used together',
+        )
+
+    if config.WORKERS:
+        if config.GEVENT or config.THREADING:
+            raise ConfigError(
+                '"--workers" can not be used with "--gevent" or "--threading"',
+            )
+
+        config.ASYNC_SUITES, config.ASYNC_TESTS = parse_workers(config.WORKERS)
+        config.MULTIPROCESSING = True
+
+    if not config.GEVENT and not config.THREADING and not config.ASYNCIO and (
             config.ASYNC_SUITES or config.ASYNC_TESTS):
         config.MULTIPROCESSING = True
 
     if (config.STEPS_LOG or config.FLOWS_LOG) and not config.VERBOSE:
         config.VERBOSE = True
 
+    if config.SHARD:
+        parse_shard(config.SHARD)
+
+        # default history can differ between nodes,
+        # so it is not used for split of shards
+        config.SHARD_BY_RUNTIME = bool(config.HISTORY_PATH)
+
+    if config.PREFETCH:
+        config.LAZY_BUILD = True
+
+    is_history_required = config.SCHEDULE == 'duration' or \
+        config.LAST_FAILED or config.FAILED_FIRST
+
+    if is_history_required and not config.HISTORY_PATH:
+        from .history import DEFAULT_HISTORY_PATH
+        config.HISTORY_PATH = DEFAULT_HISTORY_PATH
+
 
 def get_config_path_by_env(env_name, default=None, base_path=None):
     config_path = os.getenv(env_name, default)
@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+
+"""
+Daemon mode. Daemon is keeping interpreter with imported modules
+of suites, client sends options of run to it over unix socket.
+Each run is forked from loaded state of daemon, so runs do not
+affect each other. Modules which were changed since previous run
+are imported again by daemon before fork.
+
+Watch mode is using the same warm state for running
+suites of modules which were changed.
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import logging
+import traceback
+
+from . import loader
+from . import runnable
+from .utils import mp
+from .utils import net
+from .exceptions import ConfigError
+
+
+logger = logging.getLogger(__name__)
+
+
+MESSAGE_RUN = 'run'
+MESSAGE_EXIT = 'exit'
+MESSAGE_OUTPUT = 'output'
+MESSAGE_INTERRUPT = 'interrupt'
+
+DAEMON_FLAGS = ('--serve', '--client', '--watch')
+DAEMON_SOCKET_OPTION = '--daemon-socket'
+
+READ_SIZE = 64 * 1024
+POLL_INTERVAL = 1.0
+
+WATCH_INTERVAL = 0.2
+SETTLE_INTERVAL = 0.1
+
+
+def strip_daemon_options(argv):
+    """
+    Options of run without options of daemon
+    """
+    stripped = []
+    args = iter(argv)
+
+    for arg in args:
+        if arg in DAEMON_FLAGS or arg.startswith(DAEMON_SOCKET_OPTION + '='):
+            continue
+
+        if arg == DAEMON_SOCKET_OPTION:
+            next(args, None)
+            continue
+
+        stripped.append(arg)
+
+    return stripped
+
+
+def get_exit_code(error):
+    if error.code is None:
+        return 0
+
+    if isinstance(error.code, int):
+        return int(error.code)
+
+    sys.stderr.write('{}\n'.format(error.code))
+    return 1
+
+
+def check_program(program):
+    if not hasattr(os, 'fork') or not hasattr(socket, 'AF_UNIX'):
+        raise ConfigError('Daemon mode is not supported on this platform')
+
+    if not program.suites_path or program.suites_path == '__main__':
+        raise ConfigError('Path to suites is required for daemon mode')
+
+
+def run_program(program_factory, argv):
+    """
+    Run program in forked process and exit with code of run
+    """
+    sys.argv[1:] = argv
+
+    try:
+        runnable.run(program_factory())
+        code = 0
+    except SystemExit as error:
+        code = get_exit_code(error)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+    os._exit(code)
+
+
+def connect(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    return sock
+
+
+def is_running(path):
+    try:
+        connect(path).close()
+    except socket.error:
+        return False
+    return True
+
+
+class Session(object):
+    """
+    Run which was requested by client. Handler of session
+    is forked from daemon and forks run with output redirected
+    to pipe, so exit code can be sent to client after output.
+    """
+
+    def __init__(self, sock, program_factory, argv):
+        self.__socket = sock
+        self.__channel = net.Channel(sock)
+        self.__program_factory = program_factory
+        self.__argv = argv
+
+    def run(self, output):
+        self.__socket.close()
+
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+        os.dup2(output, sys.stdout.fileno())
+        os.dup2(output, sys.stderr.fileno())
+        os.close(output)
+
+        run_program(self.__program_factory, self.__argv)
+
+    def send(self, message, payload):
+        try:
+            self.__channel.send((message, payload))
+        except (IOError, OSError):
+            # client was gone, run is terminated
+            pass
+
+    def serve(self):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            os.close(read_fd)
+            self.run(write_fd)
+
+        os.close(write_fd)
+        waitable = [read_fd, self.__channel]
+
+        while read_fd in waitable:
+            ready = mp.wait(waitable)
+
+            if read_fd in ready:
+                data = os.read(read_fd, READ_SIZE)
+
+                if data:
+                    self.send(MESSAGE_OUTPUT, data)
+                else:
+                    waitable.remove(read_fd)
+
+            if self.__channel in ready:
+                try:
+                    self.__channel.recv()
+                    os.kill(pid, signal.SIGINT)
+                except (EOFError, IOError, OSError, ValueError):
+                    waitable.remove(self.__channel)
+                    os.kill(pid, signal.SIGTERM)
+
+        os.close(read_fd)
+        _, status = os.waitpid(pid, 0)
+
+        if os.WIFEXITED(status):
+            code = os.WEXITSTATUS(status)
+        else:
+            code = 1
+
+        self.send(MESSAGE_EXIT, code)
+        self.__channel.close()
+
+
+class Server(object):
+    """
+    Program of daemon is not run, it is used
+    for taking path to suites and options.
+    """
+
+    def __init__(self, program, program_factory):
+        check_program(program)
+
+        self.__listener = None
+        self.__path = program.suites_path
+        self.__recursive = program.recursive_load
+        self.__socket_path = program.config.DAEMON_SOCKET
+        self.__program_factory = program_factory
+        self.__argv = strip_daemon_options(sys.argv[1:])
+
+    def preload(self):
+        if self.__path not in sys.path:
+            sys.path.append(self.__path)
+
+        for module_name in loader.preload_modules(self.__path, recursive=self.__recursive):
+            logger.debug('Module "{}" was preloaded'.format(module_name))
+
+    def listen(self):
+        if os.path.exists(self.__socket_path):
+            if is_running(self.__socket_path):
+                raise ConfigError(
+                    'Daemon is already running on "{}"'.format(self.__socket_path),
+                )
+            os.unlink(self.__socket_path)
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.__socket_path)
+        listener.listen(socket.SOMAXCONN)
+
+        return listener
+
+    def handle(self, sock):
+        channel = net.Channel(sock)
+
+        try:
+            if not channel.poll(POLL_INTERVAL):
+                raise EOFError('Client has not sent options of run')
+
+            message, argv = channel.recv()
+        except (EOFError, IOError, OSError, ValueError) as error:
+            logger.error('Run was not requested: {}'.format(error))
+            channel.close()
+            return
+
+        # changes of modules are taken by each run
+        self.preload()
+
+        if os.fork() == 0:
+            self.__listener.close()
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+            try:
+                Session(sock, self.__program_factory, self.__argv + argv).serve()
+            finally:
+                os._exit(0)
+
+        # connection is used by handler of session
+        sock.close()
+
+    @staticmethod
+    def reap():
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0]:
+                pass
+        except OSError:  # there are no children
+            pass
+
+    def serve_forever(self):
+        self.preload()
+        self.__listener = self.listen()
+
+        logger.info(
+            'Daemon is waiting for runs on "{}"'.format(self.__socket_path),
+        )
+
+        try:
+            while True:
+                if net.is_ready(self.__listener, POLL_INTERVAL):
+                    sock, _ = self.__listener.accept()
+                    self.handle(sock)
+
+                self.reap()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.__listener.close()
+            os.unlink(self.__socket_path)
+
+
+class Watcher(object):
+    """
+    Suites of modules which were changed are run as soon
+    as files were not changed for settle interval.
+    Runs are forked from watcher one by one.
+    """
+
+    def __init__(self, program, program_factory):
+        check_program(program)
+
+        self.__path = program.suites_path
+        self.__recursive = program.recursive_load
+        self.__suite_class = program.__suite_class__
+        self.__program_factory = program_factory
+        self.__argv = strip_daemon_options(sys.argv[1:])
+
+        # names of suites by name of module, modules which
+        # were broken by change are keeping previous suites
+        self.__suites = {}
+
+    def snapshot(self):
+        mtimes = {}
+
+        for module_name, file_path in loader.find_modules(self.__path, recursive=self.__recursive):
+            try:
+                mtimes[module_name] = os.path.getmtime(file_path)
+            except OSError:  # file was removed
+                pass
+
+        return mtimes
+
+    def wait_changes(self, snapshot):
+        """
+        Wait for files to be changed and settled down.
+        Returns new snapshot and names of changed modules.
+        """
+        current = snapshot
+
+        while current == snapshot:
+            time.sleep(WATCH_INTERVAL)
+            current = self.snapshot()
+
+        settled = None
+
+        while settled != current:
+            time.sleep(SETTLE_INTERVAL)
+            settled, current = current, self.snapshot()
+
+        changed = [
+            module_name for module_name, mtime in current.items()
+            if snapshot.get(module_name) != mtime
+        ]
+
+        return current, changed
+
+    def preload(self):
+        if self.__path not in sys.path:
+            sys.path.append(self.__path)
+
+        for module_name in loader.preload_modules(self.__path, recursive=self.__recursive):
+            module = loader.load_module(module_name)
+            self.__suites[module_name] = [
+                suite.name for suite in loader.load_suites_from_module(module, self.__suite_class)
+            ]
+
+    def get_suites(self, modules):
+        suites = []
+
+        for module_name in sorted(modules):
+            for suite_name in self.__suites.get(module_name, []):
+                if suite_name not in suites:
+                    suites.append(suite_name)
+
+        return suites
+
+    def run(self, suites=None):
+        argv = list(self.__argv)
+
+        for suite_name in suites or []:
+            argv.extend(['-t', suite_name])
+
+        pid = os.fork()
+
+        if pid == 0:
+            run_program(self.__program_factory, argv)
+
+        try:
+            os.waitpid(pid, 0)
+        except KeyboardInterrupt:
+            # run is interrupted too, it is waited for
+            # to be finished before exit of watcher
+            os.waitpid(pid, 0)
+            raise
+
+    def serve_forever(self):
+        self.preload()
+        snapshot = self.snapshot()
+
+        try:
+            self.run()
+
+            while True:
+                logger.info(
+                    'Watching for changes of suites in "{}"'.format(self.__path),
+                )
+
+                snapshot, changed = self.wait_changes(snapshot)
+                self.preload()
+
+                suites = self.get_suites(changed)
+
+                if suites:
+                    self.run(suites)
+        except KeyboardInterrupt:
+            pass
+
+
+class Client(object):
+    """
+    Output of run is printed as it is coming.
+    Interrupt is sent to daemon, so run is stopped
+    as if it was interrupted in terminal.
+    """
+
+    def __init__(self, config):
+        self.__socket_path = config.DAEMON_SOCKET
+
+    def run(self, argv):
+        try:
+            channel = net.Channel(connect(self.__socket_path))
+        except socket.error as error:
+            raise ConfigError(
+                'Daemon is not running on "{}": {}'.format(self.__socket_path, error),
+            )
+
+        output = getattr(sys.stdout, 'buffer', sys.stdout)
+        channel.send((MESSAGE_RUN, argv))
+
+        try:
+            while True:
+                try:
+                    if not channel.poll(POLL_INTERVAL):
+                        continue
+                except KeyboardInterrupt:
+                    channel.send((MESSAGE_INTERRUPT, None))
+                    continue
+
+                try:
+                    message, payload = channel.recv()
+                except EOFError:
+                    return 1
+
+                if message == MESSAGE_EXIT:
+                    return payload
+
+                output.write(payload)
+                output.flush()
+        finally:
+            channel.close()
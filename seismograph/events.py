@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streams of result events for machine consumers. Events are written
+on start and on finish of each case in process where case was run.
+Agents of distributed run are not writing events, finish events of
+their cases are written by coordinator.
+Events are collected in buffer and buffer is written to file by one
+call. File is opened for append, so workers are sharing it without
+locks and events of different workers are not mixed.
+
+JSON Lines stream has one event per line. Binary stream has
+marshalled event with length of it in header for each event.
+"""
+
+import os
+import json
+import time
+import struct
+import marshal
+import threading
+
+from . import runnable
+from .result import ResultListener
+
+
+EVENT_START = 'start'
+EVENT_FINISH = 'finish'
+
+BUFFER_SIZE = 64 * 1024
+
+HEADER = struct.Struct('!I')
+# the same format of data on python 2 and python 3
+MARSHAL_VERSION = 2
+
+
+def get_worker_id():
+    return '{}/{}'.format(os.getpid(), threading.current_thread().name)
+
+
+def create_start_event(runnable_object):
+    return {
+        'event': EVENT_START,
+        'time': time.time(),
+        'worker': get_worker_id(),
+        'class_name': runnable.class_name(runnable_object),
+        'method_name': runnable.method_name(runnable_object),
+    }
+
+
+def create_finish_event(status, xunit_data):
+    event = xunit_data.to_dict()
+    event.update(
+        event=EVENT_FINISH,
+        time=time.time(),
+        status=status,
+        worker=get_worker_id(),
+    )
+    return event
+
+
+def dump_json(event):
+    data = json.dumps(event, sort_keys=True) + '\n'
+
+    if isinstance(data, bytes):
+        return data
+
+    return data.encode('utf-8')
+
+
+def dump_binary(event):
+    data = marshal.dumps(event, MARSHAL_VERSION)
+    return HEADER.pack(len(data)) + data
+
+
+def read_json(file_path):
+    """
+    Iterate over events of JSON Lines stream.
+    Line which was written partially is skipped.
+    """
+    with open(file_path, 'rb') as fp:
+        for line in fp:
+            if line.endswith(b'\n'):
+                yield json.loads(line.decode('utf-8'))
+
+
+def read_binary(file_path):
+    """
+    Iterate over events of binary stream.
+    Event which was written partially is skipped.
+    """
+    with open(file_path, 'rb') as fp:
+        while True:
+            header = fp.read(HEADER.size)
+
+            if len(header) < HEADER.size:
+                return
+
+            size, = HEADER.unpack(header)
+            data = fp.read(size)
+
+            if len(data) < size:
+                return
+
+            yield marshal.loads(data)
+
+
+class EventStream(object):
+    """
+    Buffer which was copied to worker by fork
+    belongs to parent, so it is dropped by worker.
+    """
+
+    def __init__(self, file_path, dump, buffer_size=BUFFER_SIZE):
+        self.__fd = os.open(
+            file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644,
+        )
+        self.__dump = dump
+        self.__pid = os.getpid()
+        self.__lock = threading.Lock()
+        self.__buffer = []
+        self.__buffer_size = buffer_size
+        self.__size = 0
+        self.__closed = False
+
+    @property
+    def closed(self):
+        return self.__closed
+
+    def __check_process(self):
+        if self.__pid != os.getpid():
+            self.__pid = os.getpid()
+            self.__buffer = []
+            self.__size = 0
+
+    def __flush(self):
+        data = b''.join(self.__buffer)
+
+        self.__buffer = []
+        self.__size = 0
+
+        while data:
+            data = data[os.write(self.__fd, data):]
+
+    def write(self, event):
+        data = self.__dump(event)
+
+        with self.__lock:
+            if self.__closed:
+                return
+
+            self.__check_process()
+            self.__buffer.append(data)
+            self.__size += len(data)
+
+            if self.__size >= self.__buffer_size:
+                self.__flush()
+
+    def flush(self):
+        with self.__lock:
+            if not self.__closed:
+                self.__check_process()
+                self.__flush()
+
+    def close(self):
+        with self.__lock:
+            if self.__closed:
+                return
+
+            self.__check_process()
+            self.__flush()
+            self.__closed = True
+
+            os.close(self.__fd)
+
+
+class StreamListener(ResultListener):
+
+    is_local = True
+
+    def __init__(self, stream):
+        self.__stream = stream
+
+    @property
+    def stream(self):
+        return self.__stream
+
+    def on_start(self, runnable_object):
+        self.__stream.write(create_start_event(runnable_object))
+
+    def on_result(self, status, runnable_object, xunit_data):
+        self.__stream.write(create_finish_event(status, xunit_data))
+
+    def on_close(self):
+        self.__stream.close()
+
+
+def create_listeners(config):
+    listeners = []
+
+    if config.JSONL_REPORT:
+        listeners.append(
+            StreamListener(EventStream(config.JSONL_REPORT, dump_json)),
+        )
+
+    if config.BINARY_REPORT:
+        listeners.append(
+            StreamListener(EventStream(config.BINARY_REPORT, dump_binary)),
+        )
+
+    return listeners
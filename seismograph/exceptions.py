@@ -39,6 +39,15 @@ class TimeoutException(SeismographError):
     pass
 
 
+class CaseTimeout(TimeoutException):
+
+    def __init__(self, message=None, *args, **kwargs):
+        # exception can be raised asynchronously without arguments
+        super(CaseTimeout, self).__init__(
+            message or 'Timeout of case was exceeded', *args, **kwargs
+        )
+
+
 class ExtensionNotFound(SeismographError):
     pass
 
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 import os
-import time
 from threading import Lock
 
 import requests
@@ -13,6 +12,7 @@ from .mocks import BaseMock
 from .tools import endpoint
 from .client import MockServerClient
 from .exceptions import MockServerError
+from ...utils.polling import Poller
 from .mocks import get_mock_class_by_file_name
 from .tools import set_log_level_for_dependency
 from .mocks import on_file as fill_mock_from_file
@@ -163,20 +163,13 @@ class MockServer(object):
         if self._stopped:
             raise MockServerError('Mock server is not started')
 
-        is_error = True
-        t_start = time.time()
-
-        while time.time() <= t_start + timeout:
-            if not is_error:
-                break
-
+        for _ in Poller(timeout):
             try:
                 self._client.get('/')
-                is_error = False
+                break
             except requests.ConnectionError:
                 pass
-
-        if is_error:
+        else:
             raise MockServerError(
                 'Mock server has not been started for "{}" sec.'.format(timeout),
             )
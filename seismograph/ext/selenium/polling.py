@@ -1,6 +1,5 @@
 # -*- coding: utf8 -*-
 
-import time
 import socket
 import logging
 from functools import wraps
@@ -13,6 +12,7 @@ except ImportError:  # please python 3
 from selenium.common.exceptions import WebDriverException
 
 from ...utils import pyv
+from ...utils.polling import Poller
 from .exceptions import PollingTimeoutExceeded
 
 
@@ -37,9 +37,8 @@ def do(callback,
         @wraps(f)
         def wrapped(*args, **kwargs):
             exc = None
-            t_start = time.time()
 
-            while time.time() <= t_start + timeout:
+            for _ in Poller(timeout, max_delay=delay):
                 try:
                     logger.debug(
                         u'Do polling, try to call "{}", args={}, kwargs={}'.format(
@@ -52,13 +51,10 @@ def do(callback,
                     raise
                 except exceptions as error:
                     exc = error
-                    if delay:
-                        time.sleep(delay)
-                    continue
-            else:
-                if exc:
-                    raise
-                raise PollingTimeoutExceeded(str(timeout))
+
+            if exc:
+                raise exc
+            raise PollingTimeoutExceeded(str(timeout))
 
         return wrapped
     return wrapper(callback)
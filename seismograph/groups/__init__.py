@@ -8,15 +8,63 @@ Combine runnable objects and run their.
 from __future__ import absolute_import
 
 
-def get_pool_size_of_value(value, in_two=False):
+# threads for synchronous parts of cases over num of cores on asyncio
+ASYNCIO_EXTRA_THREADS = 4
+
+
+def get_suites_pool_size(config):
+    """
+    Num of suites which are run concurrently.
+    It is num of worker processes for multiprocessing.
+    """
+    if config.ASYNC_SUITES > 0:
+        return config.ASYNC_SUITES
+
     from multiprocessing import cpu_count
 
-    if value <= 0:
-        size = cpu_count()
+    return cpu_count()
+
+
+def get_cases_pool_size(config, cases_count=None):
+    """
+    Num of cases from suite which are run concurrently.
+    It is per worker process for multiprocessing, one case
+    at a time by default because processes use all of cores.
+    """
+    if config.ASYNC_TESTS > 0:
+        size = config.ASYNC_TESTS
+    elif config.MULTIPROCESSING:
+        size = 1
     else:
-        size = value
+        from multiprocessing import cpu_count
+
+        size = int(round(cpu_count() / 2)) or 2
+
+    if cases_count is None:
+        return size
+
+    return min(size, cases_count or 1)
+
+
+def get_threads_pool_size(config):
+    """
+    Num of threads which are shared between all of case groups.
+    Num of cases from one suite is limited by it too. By default
+    it is enough for cases of all suites which are run concurrently.
+    Awaiting of coroutine does not take thread on asyncio,
+    so it is limited by num of cores there.
+    """
+    if config.MAX_THREADS > 0:
+        return config.MAX_THREADS
+
+    size = get_cases_pool_size(config)
+
+    if not config.MULTIPROCESSING:
+        size *= get_suites_pool_size(config)
+
+    if config.ASYNCIO:
+        from multiprocessing import cpu_count
 
-    if in_two and value <= 0:
-        return int(round(size / 2)) or 2
+        return min(size, cpu_count() + ASYNCIO_EXTRA_THREADS)
 
     return size
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+"""
+Groups are working on one event loop which is shared between all
+suites and cases of program. Cases with coroutine test methods
+are run as tasks of the loop, num of them is limited by semaphore.
+Synchronous parts of them are run in shared pool of threads,
+so waiting for coroutine does not take thread. Other cases
+are run in shared pool of threads as a whole.
+"""
+
+from __future__ import absolute_import
+
+import time
+from contextlib import contextmanager
+
+from .. import runnable
+from .. import resources
+from ..case import Case
+from ..case import CaseBox
+from ..utils import aio
+from .. import watchdog
+from ..exceptions import CaseTimeout
+from ..groups import get_cases_pool_size
+from ..groups import get_suites_pool_size
+from .threading import get_cases
+from .threading import get_executor
+from .threading import take_resources
+from .threading import RESOURCES_POLL_INTERVAL
+from .threading import SharedExecutor
+
+
+def is_coroutine_case(obj):
+    if isinstance(obj, CaseBox):
+        return any(is_coroutine_case(case) for case in obj)
+
+    return isinstance(obj, Case) and aio.is_coroutine_function(
+        getattr(obj, runnable.method_name(obj)),
+    )
+
+
+class Deadline(object):
+    """
+    Limit of time for case which is run on event loop.
+    Is used instead of watchdog, waiting for
+    coroutines is limited by driver of case.
+    """
+
+    def __init__(self):
+        self.__value = None
+
+    def __call__(self):
+        return self.__value
+
+    @contextmanager
+    def limit(self, case, on_kill=None):
+        timeout = watchdog.get_case_timeout(case)
+        self.__value = time.time() + timeout if timeout else None
+
+        try:
+            yield
+        finally:
+            self.__value = None
+
+
+def run_case(case, result, executor, semaphore):
+    """
+    Resources of case are taken on event loop before it is driven,
+    so case which is waiting for them does not take thread.
+    """
+    import asyncio
+
+    loop = asyncio.get_event_loop()
+    done = loop.create_future()
+    cases = get_cases(case)
+    acquired = []
+
+    def on_acquire(future):
+        if future.cancelled():
+            done.cancel()
+            return
+
+        take_and_drive()
+
+    def take_and_drive():
+        if done.cancelled():
+            semaphore.release()
+            return
+
+        taken = take_resources(case)
+
+        if taken is None:
+            loop.call_later(RESOURCES_POLL_INTERVAL, take_and_drive)
+            return
+
+        acquired.extend(taken)
+
+        if acquired:
+            resources.mark_held(cases)
+
+        deadline = Deadline()
+        case_future = aio.drive_in_loop(
+            case.__iter_run__(result, limit=deadline.limit),
+            executor,
+            get_deadline=deadline,
+            timeout_error=CaseTimeout,
+        )
+        case_future.add_done_callback(on_finish)
+        done.add_done_callback(
+            lambda f: f.cancelled() and case_future.cancel(),
+        )
+
+    def on_finish(future):
+        if acquired:
+            resources.release_held(cases, acquired)
+
+        semaphore.release()
+        aio.chain(future, done)
+
+    acquire = asyncio.ensure_future(semaphore.acquire())
+    acquire.add_done_callback(on_acquire)
+    done.add_done_callback(
+        lambda f: f.cancelled() and acquire.cancel(),
+    )
+
+    return done
+
+
+def run_coroutine_cases(cases, result, executor, limit):
+    """
+    Is called in thread of event loop
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(limit)
+
+    return asyncio.gather(
+        *[run_case(case, result, executor, semaphore) for case in cases]
+    )
+
+
+class AsyncioSuiteGroup(runnable.RunnableGroup):
+
+    def __run__(self, result):
+        self._is_run = True
+
+        if aio.get_shared_loop() is None:
+            with aio.shared_loop():
+                return self.__run__(result)
+
+        size = get_suites_pool_size(self.config)
+        executor = SharedExecutor(
+            size, grace_timeout=self.config.GRACE_TIMEOUT,
+        )
+
+        try:
+            executor.run(self.objects, result, size)
+        finally:
+            executor.shutdown()
+
+
+class AsyncioCaseGroup(runnable.RunnableGroup):
+
+    def __run__(self, result):
+        self._is_run = True
+
+        if aio.get_shared_loop() is None:
+            with aio.shared_loop():
+                return self.__run__(result)
+
+        executor = get_executor(self.config)
+        limit = get_cases_pool_size(self.config, len(self.objects))
+
+        coroutine_cases = [obj for obj in self.objects if is_coroutine_case(obj)]
+        objects = [obj for obj in self.objects if not is_coroutine_case(obj)]
+
+        future = None
+
+        if coroutine_cases:
+            future = aio.call_in_loop(
+                aio.get_shared_loop(),
+                run_coroutine_cases, coroutine_cases, result, executor, limit,
+            )
+
+        try:
+            if objects:
+                executor.run(objects, result, limit)
+        except BaseException:
+            if future is not None:
+                future.cancel()
+            raise
+
+        if future is not None:
+            aio.wait(future)
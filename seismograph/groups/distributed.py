@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""
+Distributed run. Coordinator is collecting suites and hands them
+(or cases of them with "--split-suites") to agents which are
+connected over TCP. Agent is running the same suites with
+"--agent HOST:PORT" option and sends records of result back,
+coordinator merges them into one result.
+"""
+
+from __future__ import absolute_import
+
+import sys
+import time
+import logging
+
+from .. import runnable
+from ..utils import net
+from .multiprocessing import MPResult
+from .multiprocessing import BaseWorker
+from .multiprocessing import Multiprocessing
+from .multiprocessing import run_tasks
+from .multiprocessing import TASK_STOP
+
+
+logger = logging.getLogger(__name__)
+
+
+MESSAGE_HELLO = 'hello'
+
+HANDSHAKE_TIMEOUT = 10.0
+
+
+def get_layout(suites):
+    """
+    Agent should have built the same suites in the same
+    order, because objects are matched by position.
+    Data is marshalled, so version of python should be the same.
+    """
+    return [
+        list(sys.version_info[:2]),
+        [[suite.name, len(list(suite))] for suite in suites],
+    ]
+
+
+class CoordinatorResult(MPResult):
+    """
+    Console and streams of agent are not shared with
+    coordinator, so records are written to them on sync
+    """
+
+    def sync_event(self, suite, event):
+        status, runnable_object, xunit_data = self.unpack_event(event)
+
+        result_proxy = self.create_proxy(
+            name=suite.name,
+        )
+        result_proxy.add_result(status, runnable_object, xunit_data)
+        result_proxy.mark(status, runnable_object, xunit_data)
+
+        # streams of events are not written by agents,
+        # so records of them are written by coordinator
+        for listener in self.get_local_listeners():
+            listener.on_result(status, runnable_object, xunit_data)
+        result_proxy.console.flush()
+
+        self.merge(suite, result_proxy)
+
+
+class AgentResult(MPResult):
+    """
+    Records are kept by agent too, so summary and
+    exit code of agent are telling about cases which were
+    run by it. Reports are written by coordinator only.
+    """
+
+    def collect(self, worker_result):
+        self.result.extend(worker_result)
+
+
+class RemoteWorker(BaseWorker):
+    """
+    Agent which was connected to coordinator.
+    Agent is closing connection after stop.
+    """
+
+    def __init__(self, channel, address):
+        super(RemoteWorker, self).__init__(channel)
+
+        self.__address = address
+        self.__is_closed = False
+
+    @property
+    def address(self):
+        return '{}:{}'.format(*self.__address)
+
+    @property
+    def exit_reason(self):
+        return 'Agent "{}" was disconnected'.format(self.address)
+
+    def receive(self):
+        try:
+            return super(RemoteWorker, self).receive()
+        except (EOFError, IOError, OSError):
+            self.__is_closed = True
+            raise
+
+    def is_alive(self):
+        return not self.__is_closed
+
+    def join(self, timeout=None):
+        deadline = time.time() + (timeout or 0)
+
+        while not self.__is_closed:
+            if not self.connection.poll(max(deadline - time.time(), 0)):
+                return
+
+            try:
+                # messages which are coming after stop are dropped
+                self.connection.recv()
+            except (EOFError, IOError, OSError):
+                self.__is_closed = True
+
+    def terminate(self):
+        if not self.__is_closed:
+            self.__is_closed = True
+            self.connection.close()
+
+
+class Coordinator(Multiprocessing):
+    """
+    Agents are accepted while suites are running,
+    so they can be connected at any time.
+    """
+
+    __result_class__ = CoordinatorResult
+
+    def __init__(self, result, config, suites=None):
+        super(Coordinator, self).__init__(result, config, suites=suites)
+
+        self.token = config.AGENT_TOKEN
+        self.address = net.parse_address(config.COORDINATOR)
+        self.listener = net.listen(self.address)
+
+        # agents which were accepted and have not sent hello yet
+        self.pending = []
+
+        logger.info(
+            'Coordinator is waiting for agents on "{}:{}"'.format(*self.address),
+        )
+
+    def accept(self):
+        """
+        Handshake is finished when agent has sent hello,
+        so dispatching is not blocked by agents which are connecting
+        """
+        channel, address = net.accept(self.listener)
+        self.pending.append(
+            (channel, address, time.time() + HANDSHAKE_TIMEOUT),
+        )
+
+    def try_handshake(self):
+        for pending in self.pending[:]:
+            channel, address, deadline = pending
+
+            if channel.poll():
+                self.pending.remove(pending)
+                self.handshake(channel, address)
+            elif time.time() > deadline:
+                self.pending.remove(pending)
+                logger.error(
+                    'Agent "{}:{}" was not accepted: '
+                    'it has not sent hello'.format(*address),
+                )
+                channel.close()
+
+    def handshake(self, channel, address):
+        try:
+            # rest of hello is coming soon when it was started,
+            # but agent which has sent part of it can not block
+            channel.settimeout(HANDSHAKE_TIMEOUT)
+
+            if not net.check_token(channel, self.token):
+                raise ValueError('token is incorrect')
+
+            message, _, layout = channel.recv()
+            channel.settimeout(None)
+        except (EOFError, IOError, OSError, ValueError) as error:
+            logger.error(
+                'Agent "{}:{}" was not accepted: {}'.format(address[0], address[1], error),
+            )
+            channel.close()
+            return
+
+        if message != MESSAGE_HELLO or layout != get_layout(self.suites):
+            logger.error(
+                'Agent "{}:{}" was not accepted, because it has got another suites '
+                'or version of python'.format(*address),
+            )
+            channel.send((TASK_STOP, None, None))
+            channel.close()
+            return
+
+        logger.info('Agent "{}:{}" was connected'.format(*address))
+        self.workers.append(RemoteWorker(channel, address))
+
+    def preload(self):
+        # agents are not forked from coordinator
+        pass
+
+    def create_worker(self):
+        # agents are connecting by itself
+        pass
+
+    def get_waitable(self):
+        return super(Coordinator, self).get_waitable() + [self.listener] + [
+            channel for channel, _, _ in self.pending
+        ]
+
+    def try_release(self):
+        while net.is_ready(self.listener):
+            self.accept()
+
+        self.try_handshake()
+
+        super(Coordinator, self).try_release()
+
+    def terminate_all(self):
+        super(Coordinator, self).terminate_all()
+
+        for channel, _, _ in self.pending:
+            channel.close()
+
+        del self.pending[:]
+        self.listener.close()
+
+
+class CoordinatorSuiteGroup(runnable.RunnableGroup):
+
+    def __run__(self, result):
+        self._is_run = True
+
+        with Coordinator(result, self.config, suites=self.objects) as coordinator:
+            coordinator.serve()
+
+
+class AgentSuiteGroup(runnable.RunnableGroup):
+    """
+    Suites are run by tasks from coordinator
+    """
+
+    def __run__(self, result):
+        self._is_run = True
+
+        suites = list(self.objects)
+        mp_result = AgentResult(result)
+
+        for index, suite in enumerate(suites):
+            mp_result.match(index, suite)
+
+        address = net.parse_address(self.config.AGENT)
+        channel = net.connect(
+            address, timeout=self.config.MULTIPROCESSING_TIMEOUT,
+        )
+
+        logger.info('Agent was connected to "{}:{}"'.format(*address))
+
+        try:
+            net.send_token(channel, self.config.AGENT_TOKEN)
+            channel.send((MESSAGE_HELLO, None, get_layout(suites)))
+            run_tasks(channel, suites, mp_result)
+        finally:
+            channel.close()
@@ -2,30 +2,58 @@
 
 from __future__ import absolute_import
 
+import gevent
 from gevent.pool import Pool
+from gevent.lock import Semaphore
 
 from .. import runnable
-from ..groups import get_pool_size_of_value
+from ..groups import get_cases_pool_size
+from ..groups import get_suites_pool_size
+from ..groups import get_threads_pool_size
 from ..exceptions import ALLOW_RAISED_EXCEPTIONS
 
 
+_pool = None
+
+
 def target(runnable_object, result):
     runnable_object(result)
 
 
+def limited_target(semaphore, runnable_object, result):
+    try:
+        target(runnable_object, result)
+    finally:
+        semaphore.release()
+
+
+def get_pool(config):
+    """
+    Pool is shared between all of case groups,
+    so num of greenlets is limited globally.
+    """
+    global _pool
+
+    if _pool is None:
+        _pool = Pool(get_threads_pool_size(config))
+
+    return _pool
+
+
 class GeventSuiteGroup(runnable.RunnableGroup):
 
     def __run__(self, result):
         self._is_run = True
 
         pool = Pool(
-            get_pool_size_of_value(
-                self.config.ASYNC_SUITES,
-            ),
+            get_suites_pool_size(self.config),
         )
 
         try:
             for suite in self.objects:
+                if result.current_state.should_stop:
+                    break
+
                 pool.spawn(target, suite, result)
 
             pool.join()
@@ -39,17 +67,25 @@ class GeventCaseGroup(runnable.RunnableGroup):
     def __run__(self, result):
         self._is_run = True
 
-        pool = Pool(
-            get_pool_size_of_value(
-                self.config.ASYNC_TESTS, in_two=True,
-            ),
+        pool = get_pool(self.config)
+        semaphore = Semaphore(
+            get_cases_pool_size(self.config, len(self.objects)),
         )
+        greenlets = []
 
         try:
             for case in self.objects:
-                pool.spawn(target, case, result)
+                # suite can not take more than own limit from shared pool
+                semaphore.acquire()
 
-            pool.join()
+                if result.current_state.should_stop:
+                    break
+
+                greenlets.append(
+                    pool.spawn(limited_target, semaphore, case, result),
+                )
+
+            gevent.joinall(greenlets)
         except ALLOW_RAISED_EXCEPTIONS:
-            pool.kill()
+            gevent.killall(greenlets)
             raise
@@ -2,125 +2,553 @@
 
 from __future__ import absolute_import
 
+import gc
+import time
+import signal
+import logging
+import importlib
+import traceback
+from threading import Lock
+
 from .. import runnable
+from .. import watchdog
+from .. import resources
+from .. import collector
 from ..case import CaseBox
 from ..xunit import XUnitData
-from ..utils.common import waiting_for
-from ..groups import get_pool_size_of_value
+from ..result import ResultListener
+from ..utils import mp
+from ..utils.common import measure_time
+from ..groups import get_suites_pool_size
+from ..exceptions import ConfigError
+from ..exceptions import TimeoutException
+from ..exceptions import ALLOW_RAISED_EXCEPTIONS
+
+
+logger = logging.getLogger(__name__)
+
+
+MPPipe = MPProcess = None
+
 
+MESSAGE_EVENT = 'event'
+MESSAGE_RESOURCES = 'resources'
 
-MPProcess = mp_manager = None
+
+TASK_STOP = 'stop'
+TASK_RUN_SUITE = 'run_suite'
+TASK_RUN_CASES = 'run_cases'
+TASK_CLOSE_SUITE = 'close_suite'
 
 
 def import_mp():
-    global MPProcess, mp_manager
+    global MPPipe, MPProcess
 
+    from multiprocessing import Pipe
     from multiprocessing import Process
-    from multiprocessing import Manager
 
+    MPPipe = Pipe
     MPProcess = Process
-    mp_manager = Manager()
 
 
-def target(suite, mp_result):
-    suite(mp_result)
-    mp_result.save_result()
+class EventListener(ResultListener):
+    """
+    Sends each record of worker result to parent process
+    at the moment when it was added. Cases can be run
+    in threads of worker, so sending is under lock.
+    """
 
+    def __init__(self, connection, mp_result):
+        self.index = None
+
+        self.__lock = Lock()
+        self.__mp_result = mp_result
+        self.__connection = connection
+
+    def on_result(self, status, runnable_object, xunit_data):
+        event = self.__mp_result.pack_event(status, runnable_object, xunit_data)
+
+        with self.__lock:
+            self.__connection.send(
+                (MESSAGE_EVENT, self.index, event),
+            )
+
+    def on_resources(self, name, units):
+        with self.__lock:
+            self.__connection.send(
+                (MESSAGE_RESOURCES, self.index, (name, units)),
+            )
+
+
+def preload(config):
+    """
+    Prepare process for fork of workers. Test modules and extensions
+    of suites were loaded on build, heavy modules which are imported
+    lazily are taken from "PRELOAD" setting. Workers are getting all of
+    them copy-on-write, so start-up of worker costs fork only.
+    """
+    for module_name in config.PRELOAD:
+        logger.debug('Preload module "{}"'.format(module_name))
+
+        try:
+            importlib.import_module(module_name)
+        except ImportError as error:
+            raise ConfigError(
+                'Module "{}" can not be preloaded: {}'.format(module_name, error),
+            )
+
+    # group of cases is imported by suite on run
+    if not config.GEVENT and not config.ASYNCIO:
+        from .threading import ThreadingCaseGroup  # noqa
+
+    # objects of parent are not touched by collector
+    # of worker, so memory pages of them are kept shared
+    gc.collect()
+
+    if hasattr(gc, 'freeze'):  # python 3.7+
+        gc.freeze()
+
+
+def target(connection, suites, mp_result):
+    # interrupt is handled by parent process,
+    # worker is stopped via should_stop or terminated
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    run_tasks(connection, suites, mp_result, track_resources=True)
+
+
+def run_tasks(connection, suites, mp_result, track_resources=False):
+    """
+    Run tasks which are coming from connection until stop.
+    Connection is pipe of worker process or channel of agent.
+    Semaphores of resources are shared with parent by worker
+    process only, so units held by it are tracked by parent.
+    """
+    watchdog.kill_process_on_hang(mp_result.config.GRACE_TIMEOUT)
+
+    sessions = {}
+    listener = EventListener(connection, mp_result)
+
+    if track_resources:
+        resources.track(listener.on_resources)
+
+    while True:
+        try:
+            task, index, payload = connection.recv()
+        except EOFError:
+            break
+
+        if task == TASK_STOP:
+            break
+
+        suite = suites[index]
+        listener.index = index
+        worker_result = mp_result.create_worker_result(listener)
+
+        if task == TASK_RUN_SUITE:
+            suite(worker_result)
+        else:
+            with worker_result.proxy(suite) as result_proxy:
+                if task == TASK_RUN_CASES:
+                    if index not in sessions:
+                        sessions[index] = SuiteSession(suite)
+                        sessions[index].open(result_proxy)
+
+                    sessions[index].run(payload, result_proxy)
+                elif index in sessions:
+                    sessions.pop(index).close(result_proxy)
+
+        mp_result.collect(worker_result)
+        connection.send(
+            (task, index, mp_result.pack_runtime(worker_result)),
+        )
+
+    for local_listener in mp_result.get_local_listeners():
+        local_listener.on_close()
+
+    connection.close()
 
-class MPResult(object):
 
-    MATCH = {}
+class SuiteSession(object):
+    """
+    Context of suite which was opened on worker
+    for running the part of cases from the suite.
+    Setup and teardown of suite are called once per worker.
+    """
+
+    def __init__(self, suite):
+        self.suite = suite
+        self.cases = list(suite)
+
+        self.timer = None
+        self.is_open = False
+
+    def on_error(self, error, result):
+        runnable.set_debug_if_allowed(self.suite.config)
+        tb = traceback.format_exc()
+        self.suite.context.on_error(error, self.suite, result, tb, self.timer)
+        result.add_error(
+            self.suite, tb, self.timer(), error,
+        )
+
+    def open(self, result):
+        self.timer = measure_time()
+
+        if result.current_state.should_stop:
+            return
+
+        try:
+            self.suite.context.on_run(self.suite)
+            self.suite.context.start_context(self.suite)
+            self.is_open = True
+        except ALLOW_RAISED_EXCEPTIONS:
+            raise
+        except BaseException as error:
+            self.on_error(error, result)
+
+    def run(self, indexes, result):
+        if not self.is_open:
+            return
+
+        group = self.suite._make_group(
+            [self.cases[i] for i in indexes],
+        )
+
+        try:
+            group(result)
+        except ALLOW_RAISED_EXCEPTIONS:
+            raise
+        except BaseException as error:
+            self.on_error(error, result)
+
+    def close(self, result):
+        if not self.is_open:
+            return
+
+        self.is_open = False
+
+        try:
+            self.suite.context.stop_context(self.suite)
+        except ALLOW_RAISED_EXCEPTIONS:
+            raise
+        except BaseException as error:
+            self.on_error(error, result)
+
+
+class MPResult(object):
+    """
+    Runnable objects are matched by position in list of suites,
+    so events can be unpacked by process which has built
+    the same suites without fork of it.
+    """
 
     def __init__(self, result):
         self.result = result
-        self.queue = mp_manager.Queue()
+        self.suite_proxies = {}
+
+        self.keys = {}
+        self.objects = {}
 
-        self.result.support_mp(mp_manager)
+        self.result.support_mp()
 
     def __getattr__(self, item):
         return getattr(self.result, item)
 
-    @staticmethod
-    def pack_result_storage(storage):
-        return [
-            (runnable.id, xunit_data.to_marshal())
-            for runnable, xunit_data in storage
-        ]
+    def pack_event(self, status, runnable_object, xunit_data):
+        return (
+            status,
+            self.keys[runnable_object.id],
+            runnable.stopped_on(runnable_object),
+            xunit_data.to_marshal(),
+        )
+
+    def unpack_event(self, event):
+        status, key, stopped_on, xunit_data = event
+        runnable_object = self.objects[tuple(key)]
+        runnable.stopped_on(runnable_object, stopped_on)
+        return status, runnable_object, XUnitData.from_marshal(xunit_data)
 
-    def unpack_result_storage(self, storage):
-        for runnable_id, xunit_data in storage:
-            yield self.MATCH[runnable_id], XUnitData.from_marshal(xunit_data)
+    def add_match(self, key, runnable_object):
+        self.keys[runnable_object.id] = key
+        self.objects[key] = runnable_object
 
-    def match(self, suite):
-        self.MATCH[suite.id] = suite
-        suite.support_mp(mp_manager)
+    def match(self, index, suite):
+        self.add_match((index, ), suite)
 
-        for case in suite:
+        for i, case in enumerate(suite):
             if isinstance(case, CaseBox):
-                for c in case:
-                    self.MATCH[c.id] = c
-                    c.support_mp(mp_manager)
+                for j, c in enumerate(case):
+                    self.add_match((index, i, j), c)
             else:
-                self.MATCH[case.id] = case
-                case.support_mp(mp_manager)
-
-    def save_result(self):
-        if self.result.proxies:
-            self.queue.put(
-                (
-                    self.result.proxies[0].name,
-                    self.result.proxies[0].runtime,
-
-                    self.pack_result_storage(
-                        self.result.successes,
-                    ),
-                    self.pack_result_storage(
-                        self.result.skipped,
-                    ),
-                    self.pack_result_storage(
-                        self.result.failures,
-                    ),
-                    self.pack_result_storage(
-                        self.result.errors,
-                    ),
-                ),
-            )
+                self.add_match((index, i), case)
 
-    def sync(self):
-        while not self.queue.empty():
-            name, runtime, successes, skipped, failures, errors = self.queue.get()
+    def get_local_listeners(self):
+        return [l for l in self.result.listeners if l.is_local]
 
-            result_proxy = self.create_proxy(
-                name=name,
-            )
-            result_proxy.runtime = runtime
+    def create_worker_result(self, listener):
+        return self.result.create_proxy(
+            listeners=[listener] + self.get_local_listeners(),
+        )
 
-            result_proxy.errors.extend(
-                self.unpack_result_storage(errors),
-            )
-            result_proxy.successes.extend(
-                self.unpack_result_storage(successes),
-            )
-            result_proxy.skipped.extend(
-                self.unpack_result_storage(skipped),
-            )
-            result_proxy.failures.extend(
-                self.unpack_result_storage(failures),
+    def collect(self, worker_result):
+        """
+        Is called by worker with result of each task after it was run.
+        Records of worker are sent to parent by listener, so result
+        of worker process is not kept here. Subclasses are overriding
+        it if worker should keep records, for example agent does.
+        """
+
+    def get_suite_proxy(self, suite):
+        """
+        Result proxy of suite on parent process.
+        Records of suite are coming to it from workers.
+        """
+        if suite.id not in self.suite_proxies:
+            result_proxy = self.create_proxy(
+                name=suite.name,
             )
+            result_proxy.set_timer(measure_time())
 
-            self.result.extend(result_proxy)
+            self.suite_proxies[suite.id] = result_proxy
             self.result.proxies.append(result_proxy)
 
+        return self.suite_proxies[suite.id]
+
+    @staticmethod
+    def pack_runtime(worker_result):
+        if not worker_result.proxies:
+            return None
+        return worker_result.proxies[0].runtime
+
+    def merge(self, suite, result_proxy):
+        self.result.extend(result_proxy)
+        self.get_suite_proxy(suite).extend(result_proxy)
+
+    def sync_event(self, suite, event):
+        result_proxy = self.create_proxy(
+            name=suite.name,
+        )
+        result_proxy.add_result(*self.unpack_event(event))
+
+        self.merge(suite, result_proxy)
+
+    def sync(self, task, suite, runtime):
+        if task == TASK_CLOSE_SUITE:
+            self.get_suite_proxy(suite).stop_timer()
+        elif task == TASK_RUN_SUITE and runtime is not None:
+            self.get_suite_proxy(suite).runtime = runtime
+
+    def add_crash(self, task, suite, message):
+        result_proxy = self.create_proxy(
+            name=suite.name,
+        )
+        result_proxy.add_error(
+            suite, message, float(), RuntimeError(message),
+        )
+        result_proxy.console.flush()
+
+        self.merge(suite, result_proxy)
+
+        if task != TASK_RUN_CASES:
+            self.get_suite_proxy(suite).stop_timer()
+
+
+class BaseWorker(object):
+    """
+    Tasks are sent over connection, records of result are coming
+    back as events while task is running and message
+    about finish of task is coming after each of them.
+    """
+
+    def __init__(self, connection):
+        self.tasks = []
+        # keys of objects which have got records in current task
+        self.records = set()
+        # units of resources which are held by worker by name of resource
+        self.resources = {}
+
+        self.__connection = connection
+
+    @property
+    def connection(self):
+        return self.__connection
+
+    @property
+    def is_busy(self):
+        return bool(self.tasks)
+
+    @property
+    def exit_reason(self):
+        raise NotImplementedError(
+            'Property "exit_reason" is not implemented in "{}"'.format(
+                self.__class__.__name__,
+            ),
+        )
+
+    @property
+    def was_killed(self):
+        """
+        Worker was killed by watchdog because case was hanging
+        """
+        return False
+
+    def start(self):
+        pass
+
+    def send(self, task, index, payload=None):
+        self.__connection.send((task, index, payload))
+
+        if task != TASK_STOP:
+            self.tasks.append((task, index, payload))
+
+    @property
+    def waitable(self):
+        """
+        Objects which will be ready when worker sent message or died
+        """
+        return [self.__connection]
+
+    def poll(self):
+        try:
+            return self.__connection.poll()
+        except (IOError, OSError):
+            # connection is broken, receiving will raise error
+            return True
+
+    def receive(self):
+        message = self.__connection.recv()
+
+        if message[0] == MESSAGE_RESOURCES:
+            name, units = message[2]
+            self.resources[name] = self.resources.get(name, 0) + units
+        elif message[0] == MESSAGE_EVENT:
+            self.records.add(tuple(message[2][1]))
+        else:
+            self.tasks.pop(0)
+            self.records.clear()
+
+        return message
+
+    def is_alive(self):
+        raise NotImplementedError(
+            'Method "is_alive" is not implemented in "{}"'.format(
+                self.__class__.__name__,
+            ),
+        )
+
+    def stop(self):
+        try:
+            self.send(TASK_STOP, None)
+        except (IOError, OSError):
+            pass
+
+    def join(self, timeout=None):
+        raise NotImplementedError(
+            'Method "join" is not implemented in "{}"'.format(
+                self.__class__.__name__,
+            ),
+        )
+
+    def terminate(self):
+        raise NotImplementedError(
+            'Method "terminate" is not implemented in "{}"'.format(
+                self.__class__.__name__,
+            ),
+        )
+
+
+class Worker(BaseWorker):
+    """
+    Long-lived process which is running tasks one by one
+    """
+
+    def __init__(self, suites, mp_result):
+        connection, self.__child_connection = MPPipe()
+
+        super(Worker, self).__init__(connection)
+
+        self.__process = MPProcess(
+            target=target,
+            args=(self.__child_connection, suites, mp_result),
+        )
+
+    @property
+    def exitcode(self):
+        return self.__process.exitcode
+
+    @property
+    def exit_reason(self):
+        return 'Worker process was exited with code {}'.format(self.exitcode)
+
+    @property
+    def was_killed(self):
+        return self.exitcode == watchdog.KILL_EXIT_CODE
+
+    def start(self):
+        self.__process.start()
+        self.__child_connection.close()
+
+    @property
+    def waitable(self):
+        """
+        Sentinel of process is not supported on python 2,
+        but pipe will be closed if process died.
+        """
+        sentinel = getattr(self.__process, 'sentinel', None)
+
+        if sentinel is None:
+            return [self.connection]
+        return [self.connection, sentinel]
+
+    def is_alive(self):
+        return self.__process.is_alive()
+
+    def join(self, timeout=None):
+        self.__process.join(timeout=timeout)
+
+    def terminate(self):
+        """
+        Changes of units of resources which were
+        sent before termination are received from pipe
+        """
+        if not self.is_alive():
+            return
+
+        self.__process.terminate()
+        self.__process.join()
+
+        try:
+            while self.connection.poll():
+                self.receive()
+        except (EOFError, IOError, OSError):
+            pass
+
 
 class Multiprocessing(object):
 
+    __result_class__ = MPResult
+
     def __init__(self, result, config, suites=None):
         self.queue = []
-        self.stack = []
-
-        self.mp_result = MPResult(result)
+        self.cases = []
+        self.suites = []
+        self.workers = []
+
+        # Workers which have opened context of suite by index of suite
+        # and num of cases from suite which were not sent to workers
+        self.sessions = {}
+        self.remaining = {}
+
+        self.config = config
+        self.mp_result = self.__result_class__(result)
+        self.schedule = collector.get_schedule(config)
+        self.split_suites = config.SPLIT_SUITES
+        self.grace_timeout = config.GRACE_TIMEOUT
         self.release_timeout = config.MULTIPROCESSING_TIMEOUT
-        self.max_processes = get_pool_size_of_value(config.ASYNC_SUITES)
+        self.max_processes = get_suites_pool_size(config)
+
+        # semaphores of resources should be created
+        # before fork to be shared between workers
+        resources.get_pool(config)
 
         if suites:
             self.add_suites(suites)
@@ -129,59 +557,287 @@ class Multiprocessing(object):
         return self
 
     def __exit__(self, *args, **kwargs):
-        self.terminate_all()
+        self.stop_all()
         self.join_all()
-        self.mp_result.sync()
+        self.terminate_all()
+
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+
+    @property
+    def should_stop(self):
+        return self.mp_result.current_state.should_stop
 
     def add_suite(self, suite):
-        self.mp_result.match(suite)
+        index = len(self.suites)
+        self.mp_result.match(index, suite)
 
-        self.queue.append(
-            MPProcess(
-                target=target,
-                args=(suite, self.mp_result),
-            ),
-        )
+        self.suites.append(suite)
+        self.cases.append(list(suite))
+
+        if self.split_suites:
+            cases_count = len(self.cases[index])
+
+            self.remaining[index] = cases_count
+            self.queue.extend(
+                (TASK_RUN_CASES, index, [i])
+                for i in range(cases_count)
+            )
+        else:
+            self.queue.append(
+                (TASK_RUN_SUITE, index, None),
+            )
 
     def add_suites(self, suites):
         for suite in suites:
             self.add_suite(suite)
 
+        if self.schedule and self.split_suites:
+            self.queue.sort(key=self.estimate, reverse=True)
+
+    def estimate(self, task):
+        _, index, payload = task
+
+        return sum(
+            self.schedule.estimate(self.cases[index][i]) for i in payload
+        )
+
+    def create_worker(self):
+        worker = Worker(self.suites, self.mp_result)
+        worker.start()
+        self.workers.append(worker)
+        return worker
+
+    def preload(self):
+        preload(self.config)
+
+    def start_workers(self):
+        self.preload()
+
+        for _ in range(min(self.max_processes, len(self.queue))):
+            self.create_worker()
+
+    def dispatch(self, worker, task, index, payload):
+        worker.send(task, index, payload)
+
+        if task != TASK_RUN_CASES:
+            return
+
+        self.mp_result.get_suite_proxy(self.suites[index])
+
+        sessions = self.sessions.setdefault(index, [])
+        if worker not in sessions:
+            sessions.append(worker)
+
+        self.remaining[index] -= 1
+
+        if not self.remaining[index]:
+            for w in self.sessions.pop(index):
+                w.send(TASK_CLOSE_SUITE, index)
+
     def try_release(self):
-        for process in self.stack[::-1]:
-            if not process.is_alive():
-                process.join(timeout=self.release_timeout)
-                self.stack.remove(process)
+        for worker in self.workers[::-1]:
+            if not worker.is_busy:
+                continue
+
+            if worker.poll():
+                self.receive_all(worker)
+            elif not worker.is_alive() and not worker.poll():
+                self.release_crashed(worker)
+
+    def receive_all(self, worker):
+        while worker.is_busy and worker.poll():
+            try:
+                message, index, payload = worker.receive()
+            except (EOFError, IOError, OSError):
+                self.release_crashed(worker)
+                return
+
+            if message == MESSAGE_RESOURCES:
+                continue
+            elif message == MESSAGE_EVENT:
+                self.mp_result.sync_event(self.suites[index], payload)
+            else:
+                self.mp_result.sync(message, self.suites[index], payload)
+
+    def get_keys(self, task, index, payload):
+        """
+        Keys of cases which are run by task
+        """
+        if task == TASK_RUN_SUITE:
+            payload = range(len(self.cases[index]))
+        elif task != TASK_RUN_CASES:
+            return [(index, )]
+
+        keys = []
+
+        for i in payload:
+            case = self.cases[index][i]
+
+            if isinstance(case, CaseBox):
+                keys.extend((index, i, j) for j in range(len(case)))
+            else:
+                keys.append((index, i))
+
+        return keys
+
+    def release_crashed(self, worker):
+        task, index, payload = worker.tasks[0]
+        worker.join(timeout=self.release_timeout)
+
+        message = '{} while suite "{}" was running'.format(
+            worker.exit_reason, self.suites[index].name,
+        )
+        logger.error(message)
+
+        self.workers.remove(worker)
+        self.release_resources(worker)
+
+        for sessions in self.sessions.values():
+            if worker in sessions:
+                sessions.remove(worker)
+
+        keys = self.get_keys(task, index, payload)
+
+        # case which was hanging was recorded before kill
+        if worker.was_killed and worker.records.issuperset(keys):
+            if task != TASK_RUN_CASES:
+                self.mp_result.get_suite_proxy(self.suites[index]).stop_timer()
+        else:
+            self.mp_result.add_crash(task, self.suites[index], message)
+
+        for task, index, _ in worker.tasks[1:]:
+            if task == TASK_CLOSE_SUITE:
+                self.mp_result.sync(task, self.suites[index], None)
+
+        if self.queue:
+            self.create_worker()
+
+    def release_resources(self, worker):
+        """
+        Units of resources which were held by dead worker
+        are released, so cases of other workers can take them
+        """
+        pool = resources.get_pool(self.config)
+
+        for name, units in worker.resources.items():
+            resource = pool.get(name)
+
+            if resource is not None and units > 0:
+                logger.debug(
+                    'Release {} units of resource "{}" held by dead worker'.format(
+                        units, name,
+                    ),
+                )
+                resource.release(units)
+
+        worker.resources.clear()
+
+    def get_waitable(self):
+        return [o for w in self.workers if w.is_busy for o in w.waitable]
 
     def is_release(self):
         self.try_release()
-        return len(self.stack) < self.max_processes
+        return any(not w.is_busy for w in self.workers)
+
+    def is_done(self):
+        self.try_release()
+        return not any(w.is_busy for w in self.workers)
+
+    def is_release_or_stop(self):
+        return self.is_release() or self.should_stop
+
+    def wait_for(self, condition, timeout=None):
+        """
+        Sleep until workers will be ready to be released
+        and check condition after that
+        """
+        timeout = self.release_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+
+        while not condition():
+            remaining = deadline - time.time()
+            waitable = self.get_waitable()
+
+            if remaining <= 0 or not waitable or not mp.wait(waitable, timeout=remaining):
+                raise TimeoutException(
+                    'Process list has not been release for "{}" sec.'.format(
+                        timeout,
+                    ),
+                )
 
     def wait_release(self):
-        waiting_for(
-            self.is_release,
-            timeout=self.release_timeout,
-            message='Process list has not been release for "{}" sec.'.format(
-                self.release_timeout,
-            ),
-        )
+        self.wait_for(self.is_release_or_stop)
+
+    def wait_done(self):
+        self.wait_for(self.is_done)
+
+    def wait_grace(self):
+        """
+        Running tasks have got grace timeout to be finished.
+        Workers which are busy after that will be terminated.
+        """
+        try:
+            self.wait_for(self.is_done, timeout=self.grace_timeout)
+        except TimeoutException:
+            logger.warning(
+                'Worker processes were not finished for grace timeout "{}" sec. '
+                'and will be terminated'.format(self.grace_timeout),
+            )
+
+    def cancel(self):
+        """
+        Drop tasks which were not sent to workers.
+        Suites which were opened on workers are closed.
+        """
+        del self.queue[:]
+
+        for index, sessions in self.sessions.items():
+            for worker in sessions:
+                try:
+                    worker.send(TASK_CLOSE_SUITE, index)
+                except (IOError, OSError):
+                    pass
+
+        self.sessions.clear()
+
+    def stop_all(self):
+        for worker in self.workers:
+            worker.stop()
 
     def join_all(self):
-        for process in self.stack:
-            process.join(timeout=self.release_timeout)
+        deadline = time.time() + self.grace_timeout
+
+        for worker in self.workers:
+            worker.join(timeout=max(deadline - time.time(), 0))
 
     def terminate_all(self):
-        for process in self.stack:
-            process.terminate()
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.terminate()
+                self.release_resources(worker)
 
     def serve(self):
-        while self.queue:
-            process = self.queue.pop()
-            process.start()
-            self.stack.append(process)
-            self.wait_release()
+        self.start_workers()
 
-        self.join_all()
+        try:
+            while self.queue and not self.should_stop:
+                self.wait_release()
+
+                for worker in self.workers:
+                    if not worker.is_busy and self.queue and not self.should_stop:
+                        self.dispatch(worker, *self.queue.pop(0))
+
+            if self.should_stop:
+                self.cancel()
+                self.wait_grace()
+            else:
+                self.wait_done()
+        except ALLOW_RAISED_EXCEPTIONS:
+            self.mp_result.current_state.should_stop = True
+            self.cancel()
+            self.wait_grace()
+            raise
 
 
 class MultiprocessingSuiteGroup(runnable.RunnableGroup):
@@ -2,35 +2,367 @@
 
 from __future__ import absolute_import
 
-from multiprocessing.pool import ThreadPool
+import os
+import time
+import threading
+from collections import deque
 
 from .. import runnable
-from ..groups import get_pool_size_of_value
-from ..exceptions import ALLOW_RAISED_EXCEPTIONS
+from .. import resources
+from ..case import Case
+from ..case import CaseBox
+from ..groups import get_cases_pool_size
+from ..groups import get_suites_pool_size
+from ..groups import get_threads_pool_size
+
+
+_lock = threading.Lock()
+_executor = None
+
+# resources can be released by other process without notification
+RESOURCES_POLL_INTERVAL = 0.05
 
 
 def target(runnable_object, result):
     runnable_object(result)
 
 
+def get_cases(runnable_object):
+    """
+    Cases which are taking resources when object is run
+    """
+    if isinstance(runnable_object, CaseBox):
+        return list(runnable_object)
+
+    if isinstance(runnable_object, Case):
+        return [runnable_object]
+
+    return []
+
+
+def take_resources(runnable_object):
+    """
+    Resources of case are taken by scheduler without waiting,
+    so case which is waiting for them does not take thread.
+    Returns taken units or None if some of resources are busy.
+    """
+    cases = get_cases(runnable_object)
+
+    if not cases:
+        return []
+
+    try:
+        required = resources.merge(*[case.resources for case in cases])
+
+        if not required:
+            return []
+
+        return resources.get_pool(cases[0].config).take(required, blocking=False)
+    except BaseException:
+        # error will be raised by case when it is taking resources
+        return []
+
+
+def get_executor(config):
+    """
+    Executor is created once per process and shared
+    between all of case groups.
+    """
+    global _executor
+
+    with _lock:
+        if _executor is None or not _executor.is_owned:
+            _executor = SharedExecutor(
+                get_threads_pool_size(config),
+                grace_timeout=config.GRACE_TIMEOUT,
+            )
+
+    return _executor
+
+
+class Quota(object):
+    """
+    Tasks of group and num of threads which can be taken by the group.
+    Tasks are pulled from iterator on demand, so suites which are built
+    lazily are not built before threads are ready to run them.
+    Tasks which were not started are dropped when result should stop.
+    """
+
+    def __init__(self, tasks, limit, state, expected=None):
+        self.limit = limit
+        self.state = state
+        # tasks which were pulled and are waiting for resources
+        self.tasks = deque()
+        # num of tasks which can be run at once, threads are started by it
+        self.expected = limit if expected is None else min(limit, expected)
+
+        self.running = 0
+        # num of tasks which were pulled and are not finished
+        self.remaining = 0
+
+        self.error = None
+
+        self.__tasks = iter(tasks)
+        self.__is_exhausted = False
+
+    @property
+    def has_tasks(self):
+        return bool(self.tasks) or not self.__is_exhausted
+
+    @property
+    def is_done(self):
+        if self.error is not None:
+            return not self.running
+
+        return self.__is_exhausted and not self.remaining
+
+    def pull(self):
+        """
+        Pull next task to tasks. Error of building
+        is error of group, it is raised after running tasks.
+        """
+        if self.__is_exhausted:
+            return False
+
+        try:
+            self.tasks.append(next(self.__tasks))
+        except StopIteration:
+            self.__is_exhausted = True
+            return False
+        except BaseException as error:
+            self.__is_exhausted = True
+            self.error = error
+            return False
+
+        self.remaining += 1
+        return True
+
+    def cancel(self):
+        self.remaining -= len(self.tasks)
+        self.tasks.clear()
+        self.__is_exhausted = True
+
+
+class SharedExecutor(object):
+    """
+    Pool of threads which is shared between case groups of program.
+    Num of threads is limited globally, each group can take
+    only fair share of them if other groups are waiting.
+    Threads are started on demand and are reused by next groups.
+    """
+
+    def __init__(self, size, grace_timeout=None):
+        self.__size = size
+        self.__pid = os.getpid()
+        self.__grace_timeout = grace_timeout
+
+        self.__idle = 0
+        self.__calls = deque()
+        self.__is_deferred = False
+        self.__quotas = []
+        self.__threads = []
+        self.__is_shutdown = False
+        self.__condition = threading.Condition()
+
+    @property
+    def size(self):
+        return self.__size
+
+    @property
+    def is_owned(self):
+        # threads are not inherited by forked process
+        return self.__pid == os.getpid()
+
+    def __start_thread(self):
+        thread = threading.Thread(target=self.__work)
+        thread.daemon = True
+        thread.start()
+        self.__threads.append(thread)
+
+    def __take_task(self, quota):
+        """
+        First task which resources are free is taken,
+        tasks which are waiting for resources are deferred.
+        Num of deferred tasks is limited by limit of group.
+        """
+        index = 0
+
+        while index < len(quota.tasks) or (index < quota.limit and quota.pull()):
+            task = quota.tasks[index]
+            acquired = take_resources(task[0])
+
+            if acquired is not None:
+                del quota.tasks[index]
+                return task, acquired
+
+            self.__is_deferred = True
+            index += 1
+
+        return None, None
+
+    def __next_task(self):
+        self.__is_deferred = False
+
+        if self.__calls:
+            return None, self.__calls.popleft(), None
+
+        share = max(1, self.__size // len(self.__quotas)) if self.__quotas else 0
+
+        for quota in list(self.__quotas):
+            # round robin between groups
+            self.__quotas.remove(quota)
+            self.__quotas.append(quota)
+
+            if quota.has_tasks and quota.state.should_stop:
+                quota.cancel()
+                self.__condition.notify_all()
+                continue
+
+            if quota.has_tasks and quota.error is None and quota.running < min(quota.limit, share):
+                task, acquired = self.__take_task(quota)
+
+                if task is not None:
+                    quota.running += 1
+                    return quota, task, acquired
+
+                if quota.is_done:
+                    # iterator of tasks was exhausted or has raised error
+                    self.__condition.notify_all()
+
+        return None, None, None
+
+    def __work(self):
+        while True:
+            with self.__condition:
+                quota, task, acquired = self.__next_task()
+
+                while task is None:
+                    if self.__is_shutdown:
+                        return
+
+                    self.__idle += 1
+                    self.__condition.wait(
+                        RESOURCES_POLL_INTERVAL if self.__is_deferred else None,
+                    )
+                    self.__idle -= 1
+                    quota, task, acquired = self.__next_task()
+
+            if quota is None:
+                self.__call(*task)
+                continue
+
+            try:
+                with resources.held(get_cases(task[0]), acquired):
+                    target(*task)
+            except BaseException as error:
+                if quota.error is None:
+                    quota.error = error
+            finally:
+                with self.__condition:
+                    quota.running -= 1
+                    quota.remaining -= 1
+                    self.__condition.notify_all()
+
+    @staticmethod
+    def __call(future, func, args):
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            future.set_result(func(*args))
+        except BaseException as error:
+            future.set_exception(error)
+
+    def __wait_running(self, quota):
+        """
+        Running tasks have got grace timeout to be finished
+        after interrupt. Threads can not be killed, so they
+        are left as is after that.
+        """
+        if not self.__grace_timeout:
+            return
+
+        deadline = time.time() + self.__grace_timeout
+
+        while quota.running and time.time() < deadline:
+            self.__condition.wait(deadline - time.time())
+
+    def submit(self, func, *args):
+        """
+        Interface of "concurrent.futures" executor. Calls are taking
+        threads before tasks of groups, they are short synchronous
+        parts of coroutine cases which are run on event loop.
+        """
+        from concurrent.futures import Future
+
+        future = Future()
+
+        with self.__condition:
+            self.__calls.append((future, func, args))
+
+            if not self.__idle and len(self.__threads) < self.__size:
+                self.__start_thread()
+
+            self.__condition.notify()
+
+        return future
+
+    def shutdown(self):
+        """
+        Threads are finished when they have not got tasks
+        """
+        with self.__condition:
+            self.__is_shutdown = True
+            self.__condition.notify_all()
+
+    def run(self, objects, result, limit):
+        quota = Quota(
+            ((runnable_object, result) for runnable_object in objects),
+            limit,
+            result.current_state,
+            # suites which are built lazily have not got len
+            expected=len(objects) if hasattr(objects, '__len__') else None,
+        )
+
+        with self.__condition:
+            # group without tasks is done at once
+            quota.pull()
+            self.__quotas.append(quota)
+
+            while len(self.__threads) < min(self.__size, sum(q.expected for q in self.__quotas if q.has_tasks)):
+                self.__start_thread()
+
+            self.__condition.notify_all()
+
+            try:
+                while not quota.is_done:
+                    self.__condition.wait()
+            except BaseException:
+                quota.cancel()
+                self.__wait_running(quota)
+                raise
+            finally:
+                self.__quotas.remove(quota)
+                self.__condition.notify_all()
+
+        if quota.error is not None:
+            raise quota.error
+
+
 class ThreadingSuiteGroup(runnable.RunnableGroup):
 
     def __run__(self, result):
         self._is_run = True
 
-        pool = ThreadPool(
-            get_pool_size_of_value(self.config.ASYNC_SUITES),
+        size = get_suites_pool_size(self.config)
+        executor = SharedExecutor(
+            size, grace_timeout=self.config.GRACE_TIMEOUT,
         )
 
         try:
-            for suite in self.objects:
-                pool.apply_async(target, args=(suite, result))
-
-            pool.close()
-            pool.join()
-        except ALLOW_RAISED_EXCEPTIONS:
-            pool.terminate()
-            raise
+            executor.run(self.objects, result, size)
+        finally:
+            executor.shutdown()
 
 
 class ThreadingCaseGroup(runnable.RunnableGroup):
@@ -38,16 +370,6 @@ class ThreadingCaseGroup(runnable.RunnableGroup):
     def __run__(self, result):
         self._is_run = True
 
-        pool = ThreadPool(
-            get_pool_size_of_value(self.config.ASYNC_TESTS, in_two=True),
+        get_executor(self.config).run(
+            self.objects, result, get_cases_pool_size(self.config, len(self.objects)),
         )
-
-        try:
-            for case in self.objects:
-                pool.apply_async(target, args=(case, result))
-
-            pool.close()
-            pool.join()
-        except ALLOW_RAISED_EXCEPTIONS:
-            pool.terminate()
-            raise
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+"""
+History of runs. Runtimes of suites and cases are stored
+to local file and used for scheduling of next runs.
+Ids of cases which were failed are stored for rerun of them.
+"""
+
+import os
+import json
+import logging
+
+from . import runnable
+from .suite import Suite
+from .case import Case, CaseBox
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HISTORY_PATH = '.seismograph_history'
+
+
+def get_case_id(case):
+    """
+    Get id of case like "suite:Case.test"
+    """
+    return '{}.{}'.format(case.name, runnable.method_name(case))
+
+
+def get_known_ids(suites):
+    """
+    Names of suites, names of case classes like "suite:Case"
+    and ids of cases which can be built from suites
+    """
+    known_ids = set()
+
+    for suite in suites:
+        known_ids.add(suite.name)
+
+        for case_name, case_map in suite.get_map().items():
+            case_class_id = '{}:{}'.format(suite.name, case_name)
+            known_ids.add(case_class_id)
+
+            for test_name in case_map['tests']:
+                known_ids.add('{}.{}'.format(case_class_id, test_name))
+
+    return known_ids
+
+
+class History(object):
+
+    def __init__(self, suites=None, cases=None, failed=None):
+        self.__suites = suites or {}
+        self.__cases = cases or {}
+        self.__failed = failed or []
+
+    @property
+    def suites(self):
+        return self.__suites
+
+    @property
+    def cases(self):
+        return self.__cases
+
+    @property
+    def failed(self):
+        """
+        Ids of cases like "suite:Case.test" and names of suites
+        which were failed or had errors on the last run of them
+        """
+        return self.__failed
+
+    def to_dict(self):
+        return {
+            'suites': self.__suites,
+            'cases': self.__cases,
+            'failed': self.__failed,
+        }
+
+    def get_suite_runtime(self, suite, default=None):
+        return self.__suites.get(suite.name, default)
+
+    def get_case_runtime(self, case, default=None):
+        return self.__cases.get(get_case_id(case), default)
+
+    def update(self, result, suites=None):
+        """
+        Failures of cases which were removed from
+        suites are dropped if suites were given
+        """
+        ran = set()
+        failed = set()
+
+        for result_proxy in result.proxies:
+            self.__suites[result_proxy.name] = result_proxy.get_state().runtime
+            ran.add(result_proxy.name)
+
+        for storage in (
+                result.errors,
+                result.skipped,
+                result.failures,
+                result.successes):
+            is_failed = storage is result.errors or storage is result.failures
+
+            for runnable_object, xunit_data in storage:
+                if isinstance(runnable_object, Case):
+                    case_id = get_case_id(runnable_object)
+                    self.__cases[case_id] = xunit_data.runtime
+                elif isinstance(runnable_object, Suite):
+                    case_id = runnable_object.name
+                else:
+                    continue
+
+                ran.add(case_id)
+
+                if is_failed:
+                    failed.add(case_id)
+
+        # failures of cases which were not run are kept
+        failed |= set(self.__failed) - ran
+
+        if suites is not None:
+            failed &= get_known_ids(suites)
+
+        self.__failed = sorted(failed)
+
+
+class Schedule(object):
+    """
+    Sort suites and cases by estimated runtime, the longest are first.
+    Can be used as shuffle function of collector.
+    """
+
+    def __init__(self, history, default_runtime):
+        self.__history = history
+        self.__default_runtime = default_runtime
+
+    def __call__(self, objects):
+        objects.sort(key=self.estimate, reverse=True)
+
+    def estimate(self, obj):
+        if isinstance(obj, Suite):
+            runtime = self.__history.get_suite_runtime(obj)
+            if runtime is None:
+                return sum(self.estimate(case) for case in obj)
+            return runtime
+
+        if isinstance(obj, CaseBox):
+            return sum(self.estimate(case) for case in obj)
+
+        return self.__history.get_case_runtime(
+            obj, default=self.__default_runtime,
+        )
+
+
+class FailedFirst(object):
+    """
+    Move suites and cases which were failed on the last run
+    to the front. Order of others is kept from shuffle.
+    """
+
+    def __init__(self, failed, shuffle=None):
+        self.__failed = set(failed)
+        self.__shuffle = shuffle
+
+        self.__suites = set(
+            case_id.split(':')[0] for case_id in self.__failed
+        )
+
+    def __call__(self, objects):
+        if self.__shuffle:
+            self.__shuffle(objects)
+
+        # sort is stable
+        objects.sort(key=lambda obj: not self.is_failed(obj))
+
+    def is_failed(self, obj):
+        if isinstance(obj, Suite):
+            return obj.name in self.__suites
+
+        if isinstance(obj, CaseBox):
+            return any(self.is_failed(case) for case in obj)
+
+        return get_case_id(obj) in self.__failed
+
+
+def load(path):
+    if not os.path.isfile(path):
+        return History()
+
+    try:
+        with open(path) as fp:
+            data = json.load(fp)
+    except ValueError:
+        logger.warning(
+            'History file "{}" is broken and will be ignored'.format(path),
+        )
+        return History()
+
+    return History(
+        suites=data.get('suites'),
+        cases=data.get('cases'),
+        failed=data.get('failed'),
+    )
+
+
+def save(path, history):
+    with open(path, 'w') as fp:
+        json.dump(history.to_dict(), fp, indent=2, sort_keys=True)
+
+
+def update(path, result, suites=None):
+    history = load(path)
+    history.update(result, suites=suites)
+    save(path, history)
@@ -4,6 +4,7 @@ import os
 import sys
 import time
 import logging
+import importlib
 from random import randint
 from importlib import import_module
 
@@ -19,6 +20,11 @@ DEFAULT_TEST_NAME = 'test'
 TASK_NAME_PREFIX = 'task'
 
 
+# Modules of suites which were imported by daemon
+# before fork of run: name -> (module, mtime of file)
+_preloaded = {}
+
+
 def check_path_is_exist(path):
     if not os.path.exists(path):
         raise LoaderError('Dir "{}" is not exist'.format(path))
@@ -40,6 +46,10 @@ def load_module(module_name, package=None):
         package + '.' if package else '', module_name,
     )
 
+    if module_name in _preloaded:
+        logger.debug('Take preloaded module "{}"'.format(module_name))
+        return _preloaded[module_name][0]
+
     logger.debug('Load module "{}"'.format(module_name))
 
     # Can be conflict with global name
@@ -170,35 +180,85 @@ def load_suites_from_module(module, suite_class):
             yield value
 
 
-def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True):
-    logger.debug(
-        'Load suites from path "{}"'.format(path_to_dir),
-    )
-
+def find_modules(path_to_dir, package=None, recursive=True):
+    """
+    Find modules of suites. Names of modules are given with package.
+    """
     check_path_is_exist(path_to_dir)
 
     lst_dir = os.listdir(path_to_dir)
     full_path = lambda *n: os.path.join(path_to_dir, *n)
 
-    modules = (n.replace('.py', '') for n in lst_dir if is_py_module(n))
-
-    for module_name in modules:
-        module = load_module(module_name, package=package)
+    for file_name in (n for n in lst_dir if is_py_module(n)):
+        module_name = file_name.replace('.py', '')
 
-        for suite in load_suites_from_module(module, suite_class):
-            yield suite
+        yield (
+            '{}.{}'.format(package, module_name) if package else module_name,
+            full_path(file_name),
+        )
 
     if recursive:
         packs = (n for n in lst_dir if is_package(full_path(n)))
 
         for pack in packs:
 
-            for suite in load_suites_from_path(
+            for module in find_modules(
                     full_path(pack),
-                    suite_class,
                     recursive=recursive,
                     package='{}.{}'.format(package, pack) if package else pack):
-                yield suite
+                yield module
+
+
+def load_suites_from_path(path_to_dir, suite_class, package=None, recursive=True):
+    logger.debug(
+        'Load suites from path "{}"'.format(path_to_dir),
+    )
+
+    for module_name, _ in find_modules(path_to_dir, package=package, recursive=recursive):
+        module = load_module(module_name)
+
+        for suite in load_suites_from_module(module, suite_class):
+            yield suite
+
+
+def preload_modules(path_to_dir, package=None, recursive=True):
+    """
+    Import modules of suites and keep them for next loads.
+    Modules which were changed since previous call are imported again,
+    modules which can not be imported are left to be loaded by run,
+    so error is raised in it. Returns names of imported modules.
+    """
+    if hasattr(importlib, 'invalidate_caches'):  # python 3.3+
+        importlib.invalidate_caches()
+
+    found = set()
+    loaded = []
+
+    for module_name, file_path in find_modules(path_to_dir, package=package, recursive=recursive):
+        found.add(module_name)
+        mtime = os.path.getmtime(file_path)
+
+        if module_name in _preloaded:
+            if _preloaded[module_name][1] == mtime:
+                continue
+
+            del _preloaded[module_name]
+
+        try:
+            module = load_module(module_name)
+        except Exception as error:
+            logger.warning(
+                'Module "{}" was not preloaded: {}'.format(module_name, error),
+            )
+            continue
+
+        _preloaded[module_name] = (module, mtime)
+        loaded.append(module_name)
+
+    for module_name in set(_preloaded) - found:
+        del _preloaded[module_name]
+
+    return loaded
 
 
 def load_separated_classes_for_flows(case_cls):
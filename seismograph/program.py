@@ -8,6 +8,7 @@ import traceback
 from . import ext
 from . import config
 from . import loader
+from . import history
 from . import runnable
 from .utils import pyv
 from . import collector
@@ -185,8 +186,9 @@ class Program(runnable.RunnableObject):
                 'No suites or scripts for execution',
             )
 
+        loaded_suites = self.__suites
         self.__suites = collector.create_generator(
-            self.__suites, self.__config,
+            loaded_suites, self.__config,
         )
 
         if self.__config.TREE:
@@ -215,6 +217,12 @@ class Program(runnable.RunnableObject):
                     self, tb, timer(), error,
                 )
 
+        # history is updated by coordinator of agents
+        if self.__config.HISTORY_PATH and not self.__config.AGENT:
+            history.update(
+                self.__config.HISTORY_PATH, self.__result, suites=loaded_suites,
+            )
+
         if self.__exit:
             sys.exit(not self.__result.current_state.was_success)
 
@@ -337,6 +345,28 @@ class Program(runnable.RunnableObject):
                 self.__suites, self.__config,
             )
 
+        if self.config.COORDINATOR:
+            logger.debug(
+                'Use "CoordinatorSuiteGroup" to making suite group',
+            )
+
+            from .groups.distributed import CoordinatorSuiteGroup
+
+            return CoordinatorSuiteGroup(
+                self.__suites, self.__config,
+            )
+
+        if self.config.AGENT:
+            logger.debug(
+                'Use "AgentSuiteGroup" to making suite group',
+            )
+
+            from .groups.distributed import AgentSuiteGroup
+
+            return AgentSuiteGroup(
+                self.__suites, self.__config,
+            )
+
         if self.config.GEVENT:
             logger.debug(
                 'Use "GeventSuiteGroup" to making suite group',
@@ -370,6 +400,17 @@ class Program(runnable.RunnableObject):
                 self.__suites, self.__config,
             )
 
+        if self.config.ASYNCIO:
+            logger.debug(
+                'Use "AsyncioSuiteGroup" to making suite group',
+            )
+
+            from .groups.asyncio import AsyncioSuiteGroup
+
+            return AsyncioSuiteGroup(
+                self.__suites, self.__config,
+            )
+
         logger.debug(
             'Use "DefaultSuiteGroup" to making suite group',
         )
@@ -513,6 +554,44 @@ class Program(runnable.RunnableObject):
 
 
 def main(*args, **kwargs):
-    runnable.run(
-        Program(*args, **kwargs),
-    )
+    program = Program(*args, **kwargs)
+
+    if program.config.REPAIR_XUNIT_REPORT:
+        from .xunit import repair_xml_document
+
+        repair_xml_document(program.config.REPAIR_XUNIT_REPORT)
+
+        if program.exit:
+            sys.exit(0)
+        return True
+
+    if program.config.SERVE:
+        from .daemon import Server
+
+        # argv of kwargs is in sys.argv already
+        server = Server(
+            program, lambda: Program(*args, **dict(kwargs, argv=None)),
+        )
+        return server.serve_forever()
+
+    if program.config.WATCH:
+        from .daemon import Watcher
+
+        watcher = Watcher(
+            program, lambda: Program(*args, **dict(kwargs, argv=None)),
+        )
+        return watcher.serve_forever()
+
+    if program.config.CLIENT:
+        from .daemon import Client
+        from .daemon import strip_daemon_options
+
+        code = Client(program.config).run(
+            strip_daemon_options(sys.argv[1:]),
+        )
+
+        if program.exit:
+            sys.exit(code)
+        return not code
+
+    runnable.run(program)
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""
+Limits of concurrency for cases which are using scarce resources.
+Capacities are taken from "RESOURCES" setting of config, for example
+RESOURCES = {'db': 1, 'browser': 4}. Cases and suites are declaring
+num of units which they need like __resources__ = {'db': 1}.
+Resources which have not got capacity in config are unlimited.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+
+from .exceptions import ConfigError
+
+
+logger = logging.getLogger(__name__)
+
+
+_lock = threading.Lock()
+_pool = None
+
+# ids of runnable objects which resources were taken by scheduler
+_held = set()
+
+# callback of worker process which is getting changes of units held by it
+_tracker = None
+
+
+def merge(*declarations):
+    """
+    Merge declarations of resources. Max num of units is taken.
+    """
+    merged = {}
+
+    for declaration in declarations:
+        for name, units in (declaration or {}).items():
+            merged[name] = max(units, merged.get(name, 0))
+
+    return merged
+
+
+def get_primitives(config):
+    """
+    Get classes of lock and semaphore for mode of run.
+    Semaphores of multiprocessing are shared with workers
+    if they were created before fork.
+    """
+    if config.GEVENT:
+        from gevent.lock import Semaphore
+        from gevent.lock import BoundedSemaphore
+
+        return Semaphore, BoundedSemaphore
+
+    if config.MULTIPROCESSING:
+        from multiprocessing import Lock
+        from multiprocessing import BoundedSemaphore
+
+        return Lock, BoundedSemaphore
+
+    return threading.Lock, threading.BoundedSemaphore
+
+
+def get_pool(config):
+    """
+    Pool is created once and is inherited by worker processes
+    """
+    global _pool
+
+    capacities = config.get('RESOURCES') or {}
+
+    with _lock:
+        if _pool is None or _pool.capacities != capacities:
+            _pool = ResourcePool(capacities, *get_primitives(config))
+
+    return _pool
+
+
+@contextmanager
+def hold(runnable_object):
+    """
+    Take resources which are required for runnable object.
+    They are not taken again if scheduler has taken them.
+    """
+    required = runnable_object.resources
+
+    if not required or id(runnable_object) in _held:
+        yield
+        return
+
+    with get_pool(runnable_object.config).hold(required):
+        yield
+
+
+def mark_held(runnable_objects):
+    """
+    Resources of objects were taken by scheduler. Steps of object
+    can be run by different threads, so mark is not local to thread.
+    """
+    with _lock:
+        _held.update(id(o) for o in runnable_objects)
+
+
+def release_held(runnable_objects, acquired):
+    with _lock:
+        _held.difference_update(id(o) for o in runnable_objects)
+
+    ResourcePool.release(acquired)
+
+
+@contextmanager
+def held(runnable_objects, acquired):
+    """
+    Resources which were taken by scheduler are
+    held while task is running and are released after it
+    """
+    if not acquired:
+        yield
+        return
+
+    mark_held(runnable_objects)
+
+    try:
+        yield
+    finally:
+        release_held(runnable_objects, acquired)
+
+
+def track(callback):
+    """
+    Units which are taken by process are passed to callback
+    as positive num and released units as negative num,
+    so parent can release units of worker which died.
+    """
+    global _tracker
+
+    _tracker = callback
+
+
+def notify(name, units):
+    if _tracker is not None:
+        _tracker(name, units)
+
+
+class Resource(object):
+
+    def __init__(self, name, capacity, lock, semaphore):
+        self.__name = name
+        self.__capacity = capacity
+
+        # units are taken by one case at a time,
+        # so cases which are waiting can not take them partly
+        self.__lock = lock
+        self.__semaphore = semaphore
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    def acquire(self, units, blocking=True):
+        """
+        Returns False if units are busy and acquiring is not blocking
+        """
+        if units > self.__capacity:
+            raise ConfigError(
+                'Required {} units of resource "{}", but capacity is {}'.format(
+                    units, self.__name, self.__capacity,
+                ),
+            )
+
+        acquired = 0
+
+        if not self.__lock.acquire(blocking):
+            return False
+
+        try:
+            while acquired < units:
+                if not self.__semaphore.acquire(blocking):
+                    self.__release(acquired)
+                    return False
+                acquired += 1
+        except BaseException:
+            self.__release(acquired)
+            raise
+        finally:
+            self.__lock.release()
+
+        notify(self.__name, units)
+        return True
+
+    def release(self, units):
+        # parent is notified before releasing, because
+        # units which were released twice will raise error
+        notify(self.__name, -units)
+        self.__release(units)
+
+    def __release(self, units):
+        for _ in range(units):
+            self.__semaphore.release()
+
+
+class ResourcePool(object):
+
+    def __init__(self, capacities, lock_class, semaphore_class):
+        self.__capacities = dict(capacities)
+        self.__resources = dict(
+            (name, Resource(name, capacity, lock_class(), semaphore_class(capacity)))
+            for name, capacity in capacities.items()
+        )
+
+    @property
+    def capacities(self):
+        return self.__capacities
+
+    def __contains__(self, name):
+        return name in self.__resources
+
+    def get(self, name):
+        return self.__resources.get(name)
+
+    def take(self, required, blocking=True):
+        """
+        Take units of resources. Resources are taken in the same
+        order by all cases, so they can not wait for each other.
+        Returns taken units or None if some of resources
+        are busy and taking is not blocking.
+        """
+        acquired = []
+
+        try:
+            for name in sorted(required):
+                resource = self.__resources.get(name)
+
+                if resource is None:
+                    logger.debug(
+                        'Capacity of resource "{}" is not configured'.format(name),
+                    )
+                    continue
+
+                units = required[name]
+
+                if not resource.acquire(units, blocking=blocking):
+                    self.release(acquired)
+                    return None
+
+                acquired.append((resource, units))
+        except BaseException:
+            self.release(acquired)
+            raise
+
+        return acquired
+
+    @staticmethod
+    def release(acquired):
+        for resource, units in reversed(acquired):
+            resource.release(units)
+
+    @contextmanager
+    def hold(self, required):
+        """
+        Take units of resources while block is running
+        """
+        acquired = self.take(required)
+
+        try:
+            yield
+        finally:
+            self.release(acquired)
@@ -21,6 +21,27 @@ DEFAULT_NAME = 'seismograph'
 START_MESSAGE = 'Seismograph is measuring'
 
 
+STATUS_FAIL = 'fail'
+STATUS_SKIP = 'skip'
+STATUS_ERROR = 'error'
+STATUS_SUCCESS = 'success'
+
+
+STORAGE_BY_STATUS = {
+    STATUS_FAIL: 'failures',
+    STATUS_SKIP: 'skipped',
+    STATUS_ERROR: 'errors',
+    STATUS_SUCCESS: 'successes',
+}
+
+XUNIT_TAG_BY_STATUS = {
+    STATUS_FAIL: 'failure',
+    STATUS_SKIP: 'skipped',
+    STATUS_ERROR: 'error',
+    STATUS_SUCCESS: None,
+}
+
+
 def get_runnable_from_storage_item(item):
     runnable_object, _ = item
     return runnable_object
@@ -38,6 +59,9 @@ def get_last_item_from_storage(storage):
 
 
 def get_xunit_data_from_storage(storage, runnable_object):
+    if isinstance(storage, Storage):
+        return storage.get(runnable_object)
+
     for item in storage:
         if get_runnable_from_storage_item(item) == runnable_object:
             return get_xunit_data_from_storage_item(item)
@@ -47,6 +71,9 @@ def get_xunit_data_from_storage(storage, runnable_object):
 def reset_item_of_storage(storage, runnable_object, xunit_data):
     assert isinstance(xunit_data, xunit.XUnitData)
 
+    if isinstance(storage, Storage):
+        return storage.reset(runnable_object, xunit_data)
+
     for item in storage:
         if get_runnable_from_storage_item(item) == runnable_object:
             storage.remove(item)
@@ -57,12 +84,263 @@ def reset_item_of_storage(storage, runnable_object, xunit_data):
 
 
 def get_runtime_from_storage(storage):
+    if isinstance(storage, Storage):
+        return storage.runtime
+
     rt = float()
     for item in storage:
         rt += get_xunit_data_from_storage_item(item).runtime
     return rt
 
 
+class Storage(object):
+    """
+    Records of result with the same status in order of adding.
+    Records are indexed by runnable object, so they can be found,
+    reset or popped without scan of storage. Removed records are
+    left as holes which are dropped when there are too many of them.
+    Num of records and total runtime are kept up to date on each change.
+
+    Storage of proxy is linked to storage of parent as a chunk without
+    copying of records. Records of chunks are taken into index only
+    when they are looked up, so nested proxies are merged in constant time.
+    Storage which was linked is not changed after that, changes which
+    are coming late are made on storage which it was linked to.
+    """
+
+    __slots__ = (
+        '__lock',
+        '__items',
+        '__index',
+        '__chunks',
+        '__size',
+        '__removed',
+        '__runtime',
+        '__linked_to',
+    )
+
+    __hash__ = None
+
+    def __init__(self, items=None):
+        self.__lock = Lock()
+
+        self.__items = []
+        self.__index = {}
+        self.__chunks = []
+
+        self.__size = 0
+        self.__removed = 0
+        self.__runtime = float()
+        self.__linked_to = None
+
+        if items:
+            self.extend(items)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __iter__(self):
+        # chunks are walked without recursion of generators,
+        # records of chunk are following records of storage
+        storages = [self]
+
+        while storages:
+            items, chunks = storages.pop().__snapshot()
+
+            for item in items:
+                if item is not None:
+                    yield item
+
+            storages.extend(reversed(chunks))
+
+    def __len__(self):
+        return self.__size
+
+    def __bool__(self):
+        return self.__nonzero__()
+
+    def __nonzero__(self):
+        return self.__size > 0
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __getitem__(self, index):
+        with self.__lock:
+            self.__absorb()
+
+            if self.__removed:
+                self.__compact()
+
+            return self.__items[index]
+
+    @property
+    def runtime(self):
+        return self.__runtime
+
+    def __snapshot(self):
+        with self.__lock:
+            return list(self.__items), list(self.__chunks)
+
+    def __put(self, item):
+        runnable_object, _ = item
+
+        self.__index.setdefault(id(runnable_object), []).append(len(self.__items))
+        self.__items.append(item)
+
+    def __append(self, item):
+        _, xunit_data = item
+
+        self.__put(item)
+        self.__size += 1
+        self.__runtime += xunit_data.runtime or float()
+
+    def __absorb(self):
+        """
+        Take records of linked chunks into index.
+        Num of records and runtime were counted on link.
+        """
+        if not self.__chunks:
+            return
+
+        chunks, self.__chunks = self.__chunks, []
+
+        for chunk in chunks:
+            for item in chunk:
+                self.__put(item)
+
+    def __remove(self, runnable_object):
+        key = id(runnable_object)
+        positions = self.__index.get(key)
+
+        if not positions:
+            return None
+
+        position = positions.pop(0)
+
+        if not positions:
+            del self.__index[key]
+
+        _, xunit_data = self.__items[position]
+        self.__items[position] = None
+        self.__size -= 1
+        self.__removed += 1
+        self.__runtime -= xunit_data.runtime or float()
+
+        return xunit_data
+
+    def __compact(self):
+        items = [item for item in self.__items if item is not None]
+
+        # runtime is summed again, so error of
+        # float subtractions is not accumulated
+        self.__items = []
+        self.__index = {}
+        self.__size = 0
+        self.__removed = 0
+        self.__runtime = float()
+
+        for item in items:
+            self.__append(item)
+
+    def __link(self, storage):
+        # records are not added to storage while it is being linked
+        with storage.__lock:
+            storage.__linked_to = self
+
+            # empty storage is linked for late changes only
+            if storage.__size:
+                self.__chunks.append(storage)
+                self.__size += storage.__size
+                self.__runtime += storage.__runtime
+
+    def append(self, item):
+        with self.__lock:
+            if self.__linked_to is None:
+                # order of records is kept, chunks are
+                # taken before record which is added after them
+                self.__absorb()
+                self.__append(item)
+                return
+
+        self.__linked_to.append(item)
+
+    def extend(self, items):
+        if isinstance(items, Storage) and items is not self:
+            with self.__lock:
+                if self.__linked_to is None:
+                    self.__link(items)
+                    return
+
+            self.__linked_to.extend(items)
+            return
+
+        items = list(items)
+
+        with self.__lock:
+            if self.__linked_to is None:
+                self.__absorb()
+
+                for item in items:
+                    self.__append(item)
+                return
+
+        self.__linked_to.extend(items)
+
+    def get(self, runnable_object):
+        with self.__lock:
+            self.__absorb()
+            positions = self.__index.get(id(runnable_object))
+
+            if positions:
+                return get_xunit_data_from_storage_item(
+                    self.__items[positions[0]],
+                )
+
+        return None
+
+    def pop(self, runnable_object):
+        """
+        Remove the first record of runnable object and return
+        xunit data of it, so record can be moved to another storage.
+        """
+        with self.__lock:
+            if self.__linked_to is None:
+                self.__absorb()
+                xunit_data = self.__remove(runnable_object)
+
+                if self.__removed > len(self.__items) // 2:
+                    self.__compact()
+
+                return xunit_data
+
+        return self.__linked_to.pop(runnable_object)
+
+    def reset(self, runnable_object, xunit_data):
+        """
+        Replace the first record of runnable object,
+        new record is moved to the end of storage.
+        """
+        with self.__lock:
+            if self.__linked_to is None:
+                self.__absorb()
+
+                if self.__remove(runnable_object) is None:
+                    return False
+
+                self.__append((runnable_object, xunit_data))
+
+                if self.__removed > len(self.__items) // 2:
+                    self.__compact()
+
+                return True
+
+        return self.__linked_to.reset(runnable_object, xunit_data)
+
+
 class CaptureStream(object):
 
     def __init__(self):
@@ -275,20 +553,67 @@ class Markers(object):
             return colors.red(self.SMALL_ERROR)
 
 
+class ResultListener(object):
+    """
+    Listener is notified about each record
+    at the moment when it was added to result.
+    Listeners are shared between result and its proxies.
+
+    Local listener is notified in process where case was run,
+    so it is taken by workers and records which were synced
+    from workers to parent are skipped by it.
+    """
+
+    is_local = False
+
+    def on_start(self, runnable_object):
+        pass
+
+    def on_result(self, status, runnable_object, xunit_data):
+        pass
+
+    def on_close(self):
+        pass
+
+
+class XUnitListener(ResultListener):
+    """
+    Test cases are written to stream of xunit report
+    as soon as they were added to result
+    """
+
+    def __init__(self, stream):
+        self.__stream = stream
+
+    @property
+    def stream(self):
+        return self.__stream
+
+    def on_result(self, status, runnable_object, xunit_data):
+        self.__stream.write(xunit_data, XUNIT_TAG_BY_STATUS[status])
+
+
 class State(object):
+    """
+    Counters and runtime are taken from storages of result
+    which are keeping them up to date, so reading of state
+    does not depend on num of records.
+    """
 
     def __init__(self, result, should_stop=False):
         self.__result = result
         self.__should_stop = MPSupportedValue(should_stop)
 
-    def support_mp(self, manager):
+    def support_mp(self):
+        from multiprocessing import Value
+
         self.__should_stop.set(
-            manager.Value('b', self.should_stop)
+            Value('b', self.should_stop, lock=False),
         )
 
     @property
     def should_stop(self):
-        return self.__should_stop.value
+        return bool(self.__should_stop.value)
 
     @should_stop.setter
     def should_stop(self, value):
@@ -339,122 +664,30 @@ class State(object):
         return not self.__result.errors and not self.__result.failures
 
 
-class Result(object):
-
-    __marker_class__ = Markers
-
-    def __init__(self, config, name=None, stream=None, current_state=None, is_proxy=False):
-        self.errors = []
-        self.skipped = []
-        self.failures = []
-        self.successes = []
-
-        self.proxies = []
-
-        self.__config = config
-        self.__is_proxy = is_proxy
-        self.__name = name or DEFAULT_NAME
-        self.__current_state = current_state or State(self)
-
-        self._stream = stream or sys.stdout
-        self._marker = self.__marker_class__(self.__config)
-
-        self.__timer = None
-        self.__runtime = None
-        self.__capture = None
-        self.__console = Console(
-            self._stream,
-            verbose=self.__config.VERBOSE,
-        )
-
-        if not is_proxy:
-            global lock
-
-            self.__capture = LogCapture(config)
+class BaseResult(object):
+    """
+    Records of result and proxies of it. Records are added
+    to storages of object, console of object is writing markers
+    of them and listeners of object are notified about them.
+    """
 
-            if self.__config.GEVENT:
-                from gevent.lock import Semaphore
+    __slots__ = ()
 
-                lock = Semaphore()
-
-            if self.__config.MULTIPROCESSING:
-                from multiprocessing import Lock
-
-                lock = Lock()
-
-    def __enter__(self):
-        self.begin()
-        return self
-
-    def __exit__(self, *args, **kwargs):
-        self.final()
-
-        if self.__config.XUNIT_REPORT:
-            self.create_report(self.__config.XUNIT_REPORT)
-
-    def __repr__(self):
-        state = self.get_state()
-        return '<Result(tests={}, failures={}, errors={}, skipped={} success={})>'.format(
-            state.tests,
-            state.failures,
-            state.errors,
-            state.skipped,
-            state.successes,
-        )
-
-    @property
-    def name(self):
-        return self.__name
-
-    @property
-    def is_proxy(self):
-        return self.__is_proxy
-
-    @property
-    def config(self):
-        return self.__config
-
-    @property
-    def capture(self):
-        return self.__capture
-
-    @property
-    def console(self):
-        return self.__console
-
-    @property
-    def runtime(self):
-        return self.__runtime
-
-    @runtime.setter
-    def runtime(self, value):
-        self.__runtime = value
-
-    @property
-    def current_state(self):
-        return self.__current_state
-
-    def support_mp(self, manager):
-        self.__current_state.support_mp(manager)
-
-    def set_timer(self, timer):
-        self.__timer = timer
-
-    def stop_timer(self):
-        if self.__timer:
-            self.__runtime = self.__timer()
+    is_proxy = False
 
     def create_proxy(self, **kwargs):
-        logger.debug('Create proxy to result')
-
-        return self.__class__(
-            self.__config,
-            is_proxy=True,
-            stream=self._stream,
-            current_state=self.__current_state,
-            **kwargs
+        raise NotImplementedError(
+            'Method "create_proxy" is not implemented in "{}"'.format(
+                self.__class__.__name__,
+            ),
         )
 
+    def notify(self, status, runnable_object, xunit_data, is_synced=False):
+        for listener in self.listeners:
+            if is_synced and listener.is_local:
+                continue
+            listener.on_result(status, runnable_object, xunit_data)
+
     def extend(self, result):
         assert result.is_proxy, 'result can not be extended from no proxy'
 
@@ -492,11 +725,14 @@ class Result(object):
         finally:
             proxy.stop_timer()
             self.extend(proxy)
-            proxy.console.flush()
+            proxy.flush()
+
+    def flush(self):
+        self.console.flush()
 
     def get_state(self):
         return State(
-            self, should_stop=self.__current_state.should_stop,
+            self, should_stop=self.current_state.should_stop,
         )
 
     def get_fail_by(self, runnable_object):
@@ -525,7 +761,7 @@ class Result(object):
 
     def add_error(self, runnable_object, traceback, runtime, exc):
         error_reason = reason.create(
-            runnable_object, traceback, config=self.__config,
+            runnable_object, traceback, config=self.config,
         )
 
         xunit_data = xunit.XUnitData(
@@ -537,14 +773,15 @@ class Result(object):
         )
 
         self.errors.append((runnable_object, xunit_data))
+        self.notify(STATUS_ERROR, runnable_object, xunit_data)
         self.finish(self._marker.error())
 
-        if self.__config.STOP:
-            self.__current_state.should_stop = True
+        if self.config.STOP:
+            self.current_state.should_stop = True
 
     def add_fail(self, runnable_object, traceback, runtime, exc):
         fail_reason = reason.create(
-            runnable_object, traceback, config=self.__config,
+            runnable_object, traceback, config=self.config,
         )
 
         xunit_data = xunit.XUnitData(
@@ -556,10 +793,11 @@ class Result(object):
         )
 
         self.failures.append((runnable_object, xunit_data))
+        self.notify(STATUS_FAIL, runnable_object, xunit_data)
         self.finish(self._marker.fail())
 
-        if self.__config.STOP:
-            self.__current_state.should_stop = True
+        if self.config.STOP:
+            self.current_state.should_stop = True
 
     def add_success(self, runnable_object, runtime):
         xunit_data = xunit.XUnitData(
@@ -569,6 +807,7 @@ class Result(object):
         )
 
         self.successes.append((runnable_object, xunit_data))
+        self.notify(STATUS_SUCCESS, runnable_object, xunit_data)
         self.finish(self._marker.success())
 
     def add_skip(self, runnable_object, reason, runtime):
@@ -580,50 +819,366 @@ class Result(object):
         )
 
         self.skipped.append((runnable_object, xunit_data))
+        self.notify(STATUS_SKIP, runnable_object, xunit_data)
         self.finish(self._marker.skip(reason))
 
-    def create_report(self, file_path):
-        if self.__is_proxy:
-            raise RuntimeError(
-                'Proxy result can not be independent',
-            )
+    def add_result(self, status, runnable_object, xunit_data):
+        """
+        Add ready record to storage by status.
+        Is used for records which were created out of
+        the result, for example on worker process.
+        """
+        assert isinstance(xunit_data, xunit.XUnitData)
 
-        with open(file_path, 'w') as f:
-            f.write(
-                xunit.create_xml_document(self),
-            )
+        getattr(self, STORAGE_BY_STATUS[status]).append(
+            (runnable_object, xunit_data),
+        )
+        self.notify(status, runnable_object, xunit_data, is_synced=True)
+
+    def mark(self, status, runnable_object, xunit_data):
+        """
+        Write record which was added out of the result to console
+        """
+        if status == STATUS_SKIP:
+            marker = self._marker.skip(xunit_data.reason)
+        else:
+            marker = getattr(self._marker, status)()
+
+        self.__write_start(runnable_object)
+        self.finish(marker)
 
     def start(self, runnable_object):
-        if self.__config.VERBOSE:
-            self.__console.write(
+        for listener in self.listeners:
+            listener.on_start(runnable_object)
+
+        self.__write_start(runnable_object)
+
+    def __write_start(self, runnable_object):
+        if self.config.VERBOSE:
+            self.console.write(
                 '* {}: '.format(str(runnable_object)),
             )
 
     def finish(self, status):
-        if self.__config.VERBOSE:
-            self.__console.writeln(status)
+        if self.config.VERBOSE:
+            self.console.writeln(status)
         else:
-            self.__console.write(status)
+            self.console.write(status)
+
+
+class ProxyState(object):
+    """
+    Data which is own for proxy, the rest is taken from parent
+    """
+
+    __slots__ = (
+        'name',
+        'timer',
+        'runtime',
+        'console',
+        'proxies',
+        'listeners',
+    )
+
+    def __init__(self, name, listeners):
+        self.name = name
+        self.timer = None
+        self.runtime = None
+        self.console = None
+        self.proxies = None
+        self.listeners = listeners
+
+
+class ResultProxy(BaseResult):
+    """
+    Proxy of result for runnable object. Records of proxy are linked
+    to parent on exit. Console of proxy is created on first write to
+    stream of parent, config, markers, state and listeners are of parent.
+    """
+
+    __slots__ = (
+        '__parent',
+        '__storage',
+        '__state',
+    )
+
+    is_proxy = True
+
+    def __init__(self, parent, name=None, listeners=None):
+        self.__parent = parent
+        self.__storage = (Storage(), Storage(), Storage(), Storage())
+        self.__state = ProxyState(name or DEFAULT_NAME, listeners)
 
-    def begin(self):
-        if self.__is_proxy:
-            raise RuntimeError(
-                'Proxy result can not be independent',
+    def __repr__(self):
+        return '<ResultProxy(name={})>'.format(self.__state.name)
+
+    @property
+    def parent(self):
+        return self.__parent
+
+    @property
+    def errors(self):
+        return self.__storage[0]
+
+    @property
+    def skipped(self):
+        return self.__storage[1]
+
+    @property
+    def failures(self):
+        return self.__storage[2]
+
+    @property
+    def successes(self):
+        return self.__storage[3]
+
+    @property
+    def proxies(self):
+        if self.__state.proxies is None:
+            self.__state.proxies = []
+        return self.__state.proxies
+
+    @property
+    def name(self):
+        return self.__state.name
+
+    @property
+    def config(self):
+        return self.__parent.config
+
+    @property
+    def capture(self):
+        return None
+
+    @property
+    def console(self):
+        if self.__state.console is None:
+            self.__state.console = Console(
+                self.__parent._stream, verbose=self.config.VERBOSE,
             )
+        return self.__state.console
+
+    @property
+    def runtime(self):
+        return self.__state.runtime
+
+    @runtime.setter
+    def runtime(self, value):
+        self.__state.runtime = value
+
+    @property
+    def listeners(self):
+        if self.__state.listeners is None:
+            return self.__parent.listeners
+        return self.__state.listeners
+
+    @property
+    def current_state(self):
+        return self.__parent.current_state
+
+    @property
+    def _stream(self):
+        return self.__parent._stream
+
+    @property
+    def _marker(self):
+        return self.__parent._marker
+
+    def create_proxy(self, **kwargs):
+        logger.debug('Create proxy to result')
+
+        return self.__class__(self, **kwargs)
+
+    def support_mp(self):
+        self.__parent.support_mp()
+
+    def set_timer(self, timer):
+        self.__state.timer = timer
+
+    def stop_timer(self):
+        if self.__state.timer:
+            self.__state.runtime = self.__state.timer()
+
+    def flush(self):
+        # console was not created if nothing was written
+        if self.__state.console is not None:
+            self.__state.console.flush()
+
+
+class Result(BaseResult):
+    """
+    Proxies of result are created for each runnable object,
+    so they are sharing markers and state with parent
+    and records of them are linked to parent on exit.
+    """
+
+    __slots__ = (
+        'errors',
+        'skipped',
+        'failures',
+        'successes',
+        'proxies',
+        '_stream',
+        '_marker',
+        '__config',
+        '__name',
+        '__listeners',
+        '__current_state',
+        '__timer',
+        '__runtime',
+        '__capture',
+        '__console',
+        '__xunit_stream',
+    )
+
+    __marker_class__ = Markers
+    __proxy_class__ = ResultProxy
+
+    def __init__(self,
+                 config,
+                 name=None,
+                 stream=None,
+                 marker=None,
+                 listeners=None,
+                 current_state=None):
+        self.errors = Storage()
+        self.skipped = Storage()
+        self.failures = Storage()
+        self.successes = Storage()
+
+        self.proxies = []
+
+        self.__config = config
+        self.__name = name or DEFAULT_NAME
+        self.__listeners = listeners if listeners is not None else []
+        self.__current_state = current_state or State(self)
+
+        self._stream = stream or sys.stdout
+        self._marker = marker or self.__marker_class__(self.__config)
+
+        self.__timer = None
+        self.__runtime = None
+        self.__xunit_stream = None
+        self.__capture = LogCapture(config)
+        self.__console = Console(
+            self._stream,
+            verbose=self.__config.VERBOSE,
+        )
+
+        global lock
+
+        if self.__config.GEVENT:
+            from gevent.lock import Semaphore
+
+            lock = Semaphore()
+
+        if self.__config.MULTIPROCESSING:
+            from multiprocessing import Lock
+
+            lock = Lock()
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.final()
+
+        for listener in self.__listeners:
+            listener.on_close()
+
+        if self.__xunit_stream:
+            self.__xunit_stream.close(self)
+        elif self.__config.XUNIT_REPORT:
+            self.create_report(self.__config.XUNIT_REPORT)
+
+    def __repr__(self):
+        state = self.get_state()
+        return '<Result(tests={}, failures={}, errors={}, skipped={} success={})>'.format(
+            state.tests,
+            state.failures,
+            state.errors,
+            state.skipped,
+            state.successes,
+        )
 
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def config(self):
+        return self.__config
+
+    @property
+    def capture(self):
+        return self.__capture
+
+    @property
+    def console(self):
+        return self.__console
+
+    @property
+    def runtime(self):
+        return self.__runtime
+
+    @runtime.setter
+    def runtime(self, value):
+        self.__runtime = value
+
+    @property
+    def listeners(self):
+        return self.__listeners
+
+    @property
+    def current_state(self):
+        return self.__current_state
+
+    def add_listener(self, listener):
+        assert isinstance(listener, ResultListener), \
+            'listener should be instance of "ResultListener"'
+
+        self.__listeners.append(listener)
+
+    def support_mp(self):
+        self.__current_state.support_mp()
+
+    def set_timer(self, timer):
+        self.__timer = timer
+
+    def stop_timer(self):
+        if self.__timer:
+            self.__runtime = self.__timer()
+
+    def create_proxy(self, **kwargs):
+        logger.debug('Create proxy to result')
+
+        return self.__proxy_class__(self, **kwargs)
+
+    def create_report(self, file_path):
+        xunit.write_xml_document(self, file_path)
+
+    def begin(self):
         if self.__capture:
             self.__capture.make()
 
+        if self.__config.XUNIT_REPORT:
+            self.__xunit_stream = xunit.XUnitStream(
+                self.__config.XUNIT_REPORT, name=self.__name,
+            )
+            self.add_listener(XUnitListener(self.__xunit_stream))
+
+        if self.__config.JSONL_REPORT or self.__config.BINARY_REPORT:
+            from . import events
+
+            for listener in events.create_listeners(self.__config):
+                self.add_listener(listener)
+
         self.__console.writeln(u'{}:'.format(START_MESSAGE))
         self.__console.line_break()
         self.console.flush()
 
     def final(self):
-        if self.__is_proxy:
-            raise RuntimeError(
-                'Proxy result can not be independent',
-            )
-
         if not self.__config.VERBOSE:
             self.__console.line_break()
 
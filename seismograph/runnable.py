@@ -6,7 +6,6 @@ from collections import OrderedDict
 from contextlib import contextmanager
 
 from .utils import pyv
-from .utils.mp import MPSupportedValue
 
 
 def run(runnable, *args, **kwargs):
@@ -97,9 +96,7 @@ class RunnableObject(object):
 
     def __init__(self):
         self.__id = id(self)
-        self.__stopped_on = MPSupportedValue(
-            method_name(self),
-        )
+        self.__stopped_on = method_name(self)
         self.__reason_storage = OrderedDict()
 
     def __call__(self, *args, **kwargs):
@@ -119,11 +116,11 @@ class RunnableObject(object):
 
     @property
     def _stopped_on(self):
-        return self.__stopped_on.value
+        return self.__stopped_on
 
     @_stopped_on.setter
     def _stopped_on(self, value):
-        self.__stopped_on.value = value
+        self.__stopped_on = value
 
     @property
     def reason_storage(self):
@@ -159,11 +156,6 @@ class RunnableObject(object):
             ),
         )
 
-    def support_mp(self, manager):
-        self.__stopped_on.set(
-            manager.Value('s', self._stopped_on),
-        )
-
 
 class BuildObjectMixin(object):
 
@@ -6,6 +6,7 @@ from functools import wraps
 
 from . import loader
 from . import runnable
+from .utils import aio
 from .utils import pyv
 
 
@@ -137,9 +138,9 @@ def _run_step(case, method, flow=None):
 
     try:
         if flow is not None:
-            method(case, flow)
+            aio.resolve(method(case, flow))
         else:
-            method(case)
+            aio.resolve(method(case))
     except BaseException:
         runnable.stopped_on(case, pyv.get_func_name(method))
         raise
@@ -162,8 +163,8 @@ def _call_to_begin_method_if_exist(case, flow=None):
             'begin',
         )
         if flow is not None:
-            return _call_to_method(None, case.begin, flow)
-        return case.begin()
+            return aio.resolve(_call_to_method(None, case.begin, flow))
+        return aio.resolve(case.begin())
 
 
 def _call_to_finish_method_if_exist(case, flow=None):
@@ -174,8 +175,8 @@ def _call_to_finish_method_if_exist(case, flow=None):
             'finish',
         )
         if flow is not None:
-            return _call_to_method(None, case.finish, flow)
-        return case.finish()
+            return aio.resolve(_call_to_method(None, case.finish, flow))
+        return aio.resolve(case.finish())
 
 
 def _make_run_test():
@@ -8,6 +8,7 @@ from . import case
 from . import reason
 from . import loader
 from . import runnable
+from . import resources
 from .utils import pyv
 from . import extensions
 from .utils.common import measure_time
@@ -248,6 +249,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
 
     __layers__ = None
     __require__ = None
+    __resources__ = None
     __create_reason__ = True
     __case_class__ = case.Case
     __case_group_class__ = None
@@ -321,10 +323,11 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
     # Self code is starting here
     #
 
-    def __init__(self, name, require=None, layers=None):
+    def __init__(self, name, require=None, layers=None, resources=None):
         super(Suite, self).__init__()
 
         self.__name = name
+        self.__resources = resources
 
         self.__is_run = False
         self.__is_build = False
@@ -411,14 +414,33 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
     def context(self):
         return self.__context
 
-    def _make_group(self):
+    @property
+    def resources(self):
+        """
+        Resources which are required for each case of suite
+        """
+        return resources.merge(self.__resources__, self.__resources)
+
+    def keep_cases(self, predicate):
+        """
+        Keep cases which are matched by predicate only.
+        Is used for sharding of built suite.
+        """
+        self.__case_instances[:] = [
+            case for case in self.__case_instances if predicate(case)
+        ]
+
+    def _make_group(self, cases=None):
+        if cases is None:
+            cases = self.__case_instances
+
         if self.__case_group_class__:
             logger.debug(
                 'Use "__case_group_class__" to making case group',
             )
 
             return self.__case_group_class__(
-                self.__case_instances, self.config,
+                cases, self.config,
             )
 
         if self.config.GEVENT:
@@ -429,7 +451,18 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
             from .groups.gevent import GeventCaseGroup
 
             return GeventCaseGroup(
-                self.__case_instances, self.config,
+                cases, self.config,
+            )
+
+        if self.config.ASYNCIO:
+            logger.debug(
+                'Use "AsyncioCaseGroup" to making case group',
+            )
+
+            from .groups.asyncio import AsyncioCaseGroup
+
+            return AsyncioCaseGroup(
+                cases, self.config,
             )
 
         if self.config.THREADING or self.config.MULTIPROCESSING:
@@ -440,7 +473,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
             from .groups.threading import ThreadingCaseGroup
 
             return ThreadingCaseGroup(
-                self.__case_instances, self.config,
+                cases, self.config,
             )
 
         logger.debug(
@@ -448,7 +481,7 @@ class Suite(runnable.RunnableObject, runnable.MountObjectMixin, runnable.BuildOb
         )
 
         return DefaultCaseGroup(
-            self.__case_instances, self.config,
+            cases, self.config,
         )
 
     def setup(self, *args, **kwargs):
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+
+"""
+Support of coroutines. Runnable objects are calling to user code
+synchronously, so coroutine which was returned from test method,
+step, setup, teardown or layer is run to completion here.
+"""
+
+import sys
+import inspect
+import threading
+from contextlib import contextmanager
+
+
+# waiting for result of coroutine is sliced,
+# so exception of watchdog can be raised in thread
+WAIT_INTERVAL = 0.1
+
+
+_lock = threading.Lock()
+_shared_loop = None
+
+
+def is_coroutine(obj):
+    # python 2 has not got native coroutines
+    iscoroutine = getattr(inspect, 'iscoroutine', None)
+    return iscoroutine is not None and iscoroutine(obj)
+
+
+def is_coroutine_function(func):
+    iscoroutinefunction = getattr(inspect, 'iscoroutinefunction', None)
+    return iscoroutinefunction is not None and iscoroutinefunction(func)
+
+
+def get_shared_loop():
+    return _shared_loop
+
+
+@contextmanager
+def shared_loop():
+    """
+    Install event loop which is running in separate thread.
+    Coroutines from all threads are run on it.
+    """
+    global _shared_loop
+
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.daemon = True
+
+    with _lock:
+        assert _shared_loop is None, 'shared event loop was installed already'
+        _shared_loop = loop
+
+    is_running = threading.Event()
+    loop.call_soon(is_running.set)
+
+    thread.start()
+    is_running.wait()
+
+    try:
+        yield loop
+    finally:
+        with _lock:
+            _shared_loop = None
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def resolve(value):
+    """
+    Run value to completion if it is coroutine and return result of it.
+    Shared event loop is used if it was installed, new event loop otherwise.
+    """
+    if not is_coroutine(value):
+        return value
+
+    import asyncio
+
+    loop = _shared_loop
+
+    if loop is not None and loop.is_running():
+        return wait(asyncio.run_coroutine_threadsafe(value, loop))
+
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(value)
+    finally:
+        loop.close()
+
+
+def wait(future):
+    """
+    Wait for result of concurrent future. Future is cancelled
+    if waiting was interrupted.
+    """
+    from concurrent.futures import TimeoutError
+
+    try:
+        while True:
+            try:
+                return future.result(timeout=WAIT_INTERVAL)
+            except TimeoutError:
+                if future.done():
+                    raise
+    except BaseException:
+        future.cancel()
+        raise
+
+
+class Trampoline(object):
+    """
+    Generator which is running generators yielded
+    by it as nested ones, like "yield from" does.
+    """
+
+    def __init__(self, generator):
+        self.__stack = [generator]
+
+    def send(self, value):
+        return self.__resume(value, None)
+
+    def throw(self, *error):
+        return self.__resume(None, error)
+
+    def __resume(self, value, error):
+        while True:
+            generator = self.__stack[-1]
+
+            try:
+                if error is None:
+                    yielded = generator.send(value)
+                else:
+                    yielded = generator.throw(*error)
+            except StopIteration:
+                self.__stack.pop()
+
+                if not self.__stack:
+                    raise
+
+                value, error = None, None
+                continue
+            except BaseException:
+                self.__stack.pop()
+
+                if not self.__stack:
+                    raise
+
+                value, error = None, sys.exc_info()
+                continue
+
+            if inspect.isgenerator(yielded):
+                self.__stack.append(yielded)
+                value, error = None, None
+                continue
+
+            return yielded
+
+
+def advance(generator, value=None, error=None):
+    """
+    Run generator up to coroutine which was yielded by it.
+    Values which are not coroutines are sent back at once.
+    Returns coroutine or None if generator was finished.
+    """
+    while True:
+        try:
+            if error is None:
+                yielded = generator.send(value)
+            else:
+                yielded = generator.throw(*error)
+        except StopIteration:
+            return None
+
+        if is_coroutine(yielded):
+            return yielded
+
+        value, error = yielded, None
+
+
+def drive(generator):
+    """
+    Run generator which is yielding coroutines to completion.
+    Result or exception of coroutine is sent back to generator.
+    """
+    generator = Trampoline(generator)
+    value, error = None, None
+
+    while True:
+        coroutine = advance(generator, value, error)
+
+        if coroutine is None:
+            return
+
+        value, error = None, None
+
+        try:
+            value = resolve(coroutine)
+        except BaseException:
+            error = sys.exc_info()
+
+
+def chain(source, destination):
+    if destination.done():
+        return
+
+    if source.cancelled():
+        destination.cancel()
+    elif source.exception() is not None:
+        destination.set_exception(source.exception())
+    else:
+        destination.set_result(source.result())
+
+
+def drive_in_loop(generator, executor, get_deadline=None, timeout_error=None):
+    """
+    Run generator on event loop of current thread. Synchronous parts
+    of it are run in executor, coroutines are awaited by the loop,
+    so waiting for them does not take thread. Waiting is limited
+    by time from "get_deadline", "timeout_error" is thrown
+    to generator instead of "asyncio.TimeoutError" after it.
+    Returns future of the loop.
+    """
+    import time
+    import asyncio
+
+    generator = Trampoline(generator)
+    loop = asyncio.get_event_loop()
+    done = loop.create_future()
+    awaiting = []
+
+    def step(value=None, error=None):
+        future = loop.run_in_executor(executor, advance, generator, value, error)
+        future.add_done_callback(on_advance)
+
+    def throw(error_class):
+        try:
+            raise error_class()
+        except BaseException:
+            step(error=sys.exc_info())
+
+    def on_advance(future):
+        if future.cancelled() or future.exception() is not None:
+            chain(future, done)
+            return
+
+        coroutine = future.result()
+
+        if coroutine is None:
+            chain(future, done)
+            return
+
+        if done.cancelled():
+            # generator is finished by exception,
+            # so exit of contexts is done by it
+            coroutine.close()
+            throw(asyncio.CancelledError)
+            return
+
+        deadline = get_deadline() if get_deadline else None
+
+        if deadline is not None:
+            coroutine = asyncio.wait_for(coroutine, max(deadline - time.time(), 0))
+
+        task = asyncio.ensure_future(coroutine)
+        task.add_done_callback(lambda t: on_await(t, deadline))
+        awaiting[:] = [task]
+
+    def on_await(task, deadline):
+        del awaiting[:]
+
+        try:
+            value = task.result()
+        except asyncio.TimeoutError:
+            if deadline is not None and time.time() >= deadline and timeout_error:
+                throw(timeout_error)
+            else:
+                step(error=sys.exc_info())
+        except BaseException:
+            step(error=sys.exc_info())
+        else:
+            step(value)
+
+    def on_done(future):
+        if future.cancelled():
+            for task in awaiting:
+                task.cancel()
+
+    done.add_done_callback(on_done)
+    step()
+
+    return done
+
+
+def call_in_loop(loop, func, *args):
+    """
+    Call function which returns future of loop in thread of loop.
+    Returns concurrent future with result of it, cancel
+    of concurrent future is cancelling future of loop.
+    """
+    from concurrent.futures import Future
+
+    result = Future()
+
+    def callback():
+        try:
+            future = func(*args)
+        except BaseException as error:
+            result.set_exception(error)
+            return
+
+        future.add_done_callback(lambda f: chain(f, result))
+        result.add_done_callback(
+            lambda f: f.cancelled() and loop.call_soon_threadsafe(future.cancel),
+        )
+
+    loop.call_soon_threadsafe(callback)
+
+    return result
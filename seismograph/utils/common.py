@@ -2,12 +2,25 @@
 
 import sys
 import time
+from . import aio
 from . import pyv
+from . import polling
 
 from ..exceptions import TimeoutException
 
 
-def waiting_for(func, timeout=None, exc_cls=None, message=None, delay=None, args=None, kwargs=None):
+def waiting_for(func,
+                timeout=None,
+                exc_cls=None,
+                message=None,
+                delay=None,
+                args=None,
+                kwargs=None,
+                event=None):
+    """
+    Call func until it returns true value. Intervals between
+    calls are growing up to delay, event wakes up waiting.
+    """
     args = args or tuple()
     kwargs = kwargs or dict()
 
@@ -15,20 +28,15 @@ def waiting_for(func, timeout=None, exc_cls=None, message=None, delay=None, args
     message = message or 'Timeout "{}" exceeded'.format(timeout)
 
     if timeout:
-        t_start = time.time()
-
-        while time.time() <= t_start + timeout:
+        for _ in polling.Poller(timeout, max_delay=delay, event=event):
             result = func(*args, **kwargs)
 
             if result:
                 return result
 
-            if delay:
-                time.sleep(delay)
-        else:
-            if exc_cls:
-                raise exc_cls(message)
-            raise TimeoutException(message)
+        if exc_cls:
+            raise exc_cls(message)
+        raise TimeoutException(message)
 
     result = func(*args, **kwargs)
 
@@ -42,9 +50,9 @@ def waiting_for(func, timeout=None, exc_cls=None, message=None, delay=None, args
 def call_to_chain(chain, method_name, *args, **kwargs):
     for obj in chain:
         if method_name:
-            getattr(obj, method_name)(*args, **kwargs)
+            aio.resolve(getattr(obj, method_name)(*args, **kwargs))
         else:
-            obj(*args, **kwargs)
+            aio.resolve(obj(*args, **kwargs))
 
 
 def measure_time():
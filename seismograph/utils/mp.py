@@ -27,3 +27,27 @@ class MPSupportedValue(object):
 
     def set(self, value):
         self._value = value
+
+
+def wait(objects, timeout=None):
+    """
+    Block until one of objects will be ready and return list of them.
+    Objects are connections or sentinels of processes. Process is
+    not spending cpu while waiting.
+    """
+    try:
+        from multiprocessing.connection import wait as mp_wait
+    except ImportError:  # python 2 has not got it
+        import errno
+        import select
+
+        try:
+            ready, _, _ = select.select(objects, [], [], timeout)
+        except select.error as error:
+            if error.args[0] == errno.EINTR:
+                return []
+            raise
+
+        return ready
+
+    return mp_wait(objects, timeout=timeout)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""
+Network utils. Messages are sent over plain TCP
+as marshalled data with length of it in header.
+Marshal is not safe for data of untrusted peers,
+so peer is sending token as raw bytes before any message.
+"""
+
+import hmac
+import errno
+import struct
+import select
+import socket
+import marshal
+
+from .polling import Poller
+from ..exceptions import ConfigError
+
+
+HEADER = struct.Struct('!I')
+
+TOKEN_PREFIX = b'seismograph:'
+MAX_TOKEN_SIZE = 1024
+
+CONNECT_INTERVAL = 0.5
+
+
+def parse_address(value):
+    """
+    Get host and port from "HOST:PORT"
+    """
+    host, _, port = value.rpartition(':')
+
+    try:
+        return host or '127.0.0.1', int(port)
+    except ValueError:
+        raise ConfigError(
+            'Incorrect address "{}", should be like "HOST:PORT"'.format(value),
+        )
+
+
+def listen(address):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(address)
+    sock.listen(socket.SOMAXCONN)
+    return sock
+
+
+def set_no_delay(sock):
+    # messages are small, they should not wait for each other
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def accept(listener):
+    sock, address = listener.accept()
+    return Channel(set_no_delay(sock)), address
+
+
+def connect(address, timeout=None):
+    """
+    Connect to address. Attempts are repeated while
+    timeout was not exceeded, so agent can be started
+    before coordinator.
+    """
+    error = None
+
+    for _ in Poller(timeout or 0, max_delay=CONNECT_INTERVAL):
+        try:
+            sock = socket.create_connection(address)
+        except socket.error as e:
+            error = e
+        else:
+            return Channel(set_no_delay(sock))
+
+    raise error
+
+
+def is_ready(sock, timeout=0.0):
+    try:
+        ready, _, _ = select.select([sock], [], [], timeout)
+    except select.error as error:
+        if error.args[0] == errno.EINTR:
+            return False
+        raise
+
+    return bool(ready)
+
+
+def send_token(channel, token):
+    channel.send_bytes(TOKEN_PREFIX + to_bytes(token or ''))
+
+
+def check_token(channel, token):
+    """
+    Check token which was sent by peer. Nothing
+    from peer is unmarshalled before this check.
+    """
+    expected = TOKEN_PREFIX + to_bytes(token or '')
+    return hmac.compare_digest(channel.recv_bytes(MAX_TOKEN_SIZE), expected)
+
+
+def to_bytes(value):
+    if isinstance(value, bytes):
+        return value
+    return value.encode('utf-8')
+
+
+class Channel(object):
+    """
+    Connection with the same interface as pipe of multiprocessing has
+    """
+
+    def __init__(self, sock):
+        self.__socket = sock
+
+    def fileno(self):
+        return self.__socket.fileno()
+
+    def settimeout(self, timeout):
+        self.__socket.settimeout(timeout)
+
+    def __read(self, size):
+        chunks = []
+
+        while size:
+            chunk = self.__socket.recv(size)
+
+            if not chunk:
+                raise EOFError('Connection was closed')
+
+            chunks.append(chunk)
+            size -= len(chunk)
+
+        return b''.join(chunks)
+
+    def send_bytes(self, data):
+        self.__socket.sendall(HEADER.pack(len(data)) + data)
+
+    def recv_bytes(self, maxlength=None):
+        size, = HEADER.unpack(self.__read(HEADER.size))
+
+        if maxlength is not None and size > maxlength:
+            raise IOError('Message is too long')
+
+        return self.__read(size)
+
+    def send(self, message):
+        self.send_bytes(marshal.dumps(message))
+
+    def recv(self):
+        return marshal.loads(self.recv_bytes())
+
+    def poll(self, timeout=0.0):
+        return is_ready(self.__socket, timeout)
+
+    def close(self):
+        try:
+            self.__socket.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+
+        self.__socket.close()
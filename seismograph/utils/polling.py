@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""
+Polling engine. Intervals between attempts are growing
+exponentially up to max delay, so fast conditions are checked
+often and slow conditions do not burn cpu or remote side.
+Jitter spreads attempts of concurrent pollers.
+"""
+
+import time
+import random
+
+
+DEFAULT_DELAY = 0.01
+DEFAULT_MAX_DELAY = 0.5
+DEFAULT_FACTOR = 2.0
+DEFAULT_JITTER = 0.1
+
+
+def backoff(delay=DEFAULT_DELAY,
+            max_delay=DEFAULT_MAX_DELAY,
+            factor=DEFAULT_FACTOR,
+            jitter=DEFAULT_JITTER):
+    """
+    Generate intervals between attempts. Jitter is fraction of interval.
+    """
+    delay = min(delay, max_delay)
+
+    while True:
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay * factor, max_delay)
+
+
+class Poller(object):
+    """
+    Iterate over attempts while timeout was not exceeded.
+    The last attempt is done at the moment of timeout.
+    Waiting is interrupted if event was set, event is cleared after that.
+
+    Example:
+
+        for _ in Poller(timeout=10):
+            if is_ready():
+                break
+        else:
+            raise TimeoutException()
+    """
+
+    def __init__(self,
+                 timeout,
+                 delay=DEFAULT_DELAY,
+                 max_delay=None,
+                 factor=DEFAULT_FACTOR,
+                 jitter=DEFAULT_JITTER,
+                 event=None):
+        self.__timeout = timeout
+        self.__event = event
+        self.__intervals = backoff(
+            delay=delay,
+            max_delay=max_delay or DEFAULT_MAX_DELAY,
+            factor=factor,
+            jitter=jitter,
+        )
+
+    def wait(self, interval):
+        if self.__event is None:
+            time.sleep(interval)
+        elif self.__event.wait(interval):
+            self.__event.clear()
+
+    def __iter__(self):
+        deadline = time.time() + self.__timeout
+
+        while True:
+            yield
+
+            remaining = deadline - time.time()
+
+            if remaining <= 0:
+                return
+
+            self.wait(min(next(self.__intervals), remaining))
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+"""
+Watchdog interrupts cases which are running longer than timeout.
+Case is interrupted by exception which is raised in thread of it,
+so traceback of error shows the stack at the moment of timeout.
+"""
+
+import os
+import sys
+import time
+import heapq
+import signal
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+
+from .exceptions import CaseTimeout
+
+
+logger = logging.getLogger(__name__)
+
+
+_lock = threading.Lock()
+_watchdog = None
+_kill_timeout = None
+
+# parent does not report crash of worker which
+# was killed, because case was recorded before kill
+KILL_EXIT_CODE = 3
+
+
+def kill_process_on_hang(timeout):
+    """
+    Process will be killed if case was not interrupted
+    for timeout after exception has been raised.
+    Is used for worker processes only.
+    """
+    global _kill_timeout
+    _kill_timeout = timeout
+
+
+def get_case_timeout(case):
+    if case.__timeout__ is not None:
+        return case.__timeout__
+    return case.config.CASE_TIMEOUT
+
+
+def get_stack(thread_id):
+    frame = sys._current_frames().get(thread_id)
+
+    if frame is None:
+        return ''
+
+    return ''.join(traceback.format_stack(frame))
+
+
+def async_raise(thread_id, exc_class):
+    import ctypes
+
+    if sys.version_info >= (3, 7):
+        thread_id = ctypes.c_ulong(thread_id)
+    else:
+        thread_id = ctypes.c_long(thread_id)
+
+    # pending exception is cleared by NULL
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        thread_id, ctypes.py_object(exc_class) if exc_class is not None else None,
+    )
+
+
+def is_main_thread():
+    return isinstance(threading.current_thread(), threading._MainThread)
+
+
+def get_watchdog():
+    global _watchdog
+
+    with _lock:
+        if _watchdog is None or not _watchdog.is_owned:
+            _watchdog = Watchdog()
+            _watchdog.start()
+
+    return _watchdog
+
+
+class Watch(object):
+
+    def __init__(self, thread_id, deadline, on_kill=None):
+        self.deadline = deadline
+        self.thread_id = thread_id
+
+        self.on_kill = on_kill
+        self.is_active = True
+        self.was_interrupted = False
+
+    def __lt__(self, other):
+        return self.deadline < other.deadline
+
+
+class Watchdog(object):
+    """
+    Thread which is waiting for the nearest deadline of cases.
+    One watchdog is working for all threads of process.
+    """
+
+    def __init__(self):
+        self.__watches = []
+        self.__pid = os.getpid()
+        self.__condition = threading.Condition()
+
+        self.__thread = threading.Thread(target=self.__work)
+        self.__thread.daemon = True
+
+    @property
+    def is_owned(self):
+        # thread is not inherited by forked process
+        return self.__pid == os.getpid()
+
+    def start(self):
+        self.__thread.start()
+
+    def watch(self, timeout, on_kill=None):
+        watch = Watch(
+            threading.current_thread().ident,
+            time.time() + timeout,
+            on_kill=on_kill,
+        )
+
+        with self.__condition:
+            heapq.heappush(self.__watches, watch)
+            self.__condition.notify()
+
+        return watch
+
+    def cancel(self, watch):
+        with self.__condition:
+            watch.is_active = False
+            self.__condition.notify()
+
+    def disarm(self, thread_id):
+        """
+        Case was interrupted, so it is not killed
+        while teardown of it is running
+        """
+        with self.__condition:
+            for watch in self.__watches:
+                if watch.thread_id == thread_id and watch.was_interrupted:
+                    watch.is_active = False
+
+            self.__condition.notify()
+
+    def __interrupt(self, watch):
+        logger.debug(
+            'Interrupt case in thread "{}" by timeout'.format(watch.thread_id),
+        )
+
+        watch.was_interrupted = True
+        async_raise(watch.thread_id, CaseTimeout)
+
+        if _kill_timeout is not None and watch.on_kill is not None:
+            watch.deadline = time.time() + _kill_timeout
+            heapq.heappush(self.__watches, watch)
+
+    def __kill(self, watch):
+        logger.error(
+            'Case in thread "{}" was not interrupted by timeout, '
+            'process will be killed'.format(watch.thread_id),
+        )
+
+        try:
+            watch.on_kill(get_stack(watch.thread_id))
+        finally:
+            os._exit(KILL_EXIT_CODE)
+
+    def __work(self):
+        while True:
+            with self.__condition:
+                while self.__watches and not self.__watches[0].is_active:
+                    heapq.heappop(self.__watches)
+
+                if not self.__watches:
+                    self.__condition.wait()
+                    continue
+
+                timeout = self.__watches[0].deadline - time.time()
+
+                if timeout > 0:
+                    self.__condition.wait(timeout)
+                    continue
+
+                watch = heapq.heappop(self.__watches)
+
+                if watch.was_interrupted:
+                    self.__kill(watch)
+                else:
+                    self.__interrupt(watch)
+
+
+@contextmanager
+def signal_limit(timeout):
+    def handler(signum, frame):
+        raise CaseTimeout()
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+@contextmanager
+def gevent_limit(timeout):
+    from gevent import Timeout
+
+    with Timeout(timeout, CaseTimeout):
+        yield
+
+
+@contextmanager
+def thread_limit(timeout, on_kill=None):
+    watchdog = get_watchdog()
+    watch = watchdog.watch(timeout, on_kill=on_kill)
+
+    try:
+        yield
+    finally:
+        watchdog.cancel(watch)
+
+        # block was finished before exception was raised
+        if watch.was_interrupted:
+            async_raise(watch.thread_id, None)
+
+
+def disarm(error):
+    """
+    Timeout was caught by case, so thread is not hanging
+    """
+    if isinstance(error, CaseTimeout) and _watchdog is not None and _watchdog.is_owned:
+        _watchdog.disarm(threading.current_thread().ident)
+
+
+@contextmanager
+def limit(case, on_kill=None):
+    """
+    Limit running of case by timeout from "__timeout__"
+    attribute of case or from "--case-timeout" option.
+    Callback "on_kill" gets the stack of case before killing
+    of worker process if case was not interrupted.
+    """
+    timeout = get_case_timeout(case)
+
+    if not timeout:
+        yield
+    elif case.config.GEVENT:
+        with gevent_limit(timeout):
+            yield
+    elif is_main_thread() and hasattr(signal, 'setitimer'):
+        # signal is interrupting blocking calls in main thread
+        with signal_limit(timeout):
+            yield
+    else:
+        with thread_limit(timeout, on_kill=on_kill):
+            yield
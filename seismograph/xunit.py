@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import io
+import os
 import json
 import pickle
 import marshal
+from threading import Lock
+from xml.etree import ElementTree
 
 from .utils import pyv
+from .exceptions import ConfigError
 
 
 XML_VERSION = '1.0'
@@ -12,6 +17,10 @@ XML_ENCODING = 'UTF-8'
 
 ROUND_RUNTIME = 3
 
+TMP_SUFFIX = '.tmp'
+STREAM_HEADER_LINES = 3
+TESTCASE_ENDINGS = (b'</testcase>', b'/>')
+
 
 class XUnitData(object):
 
@@ -123,6 +132,7 @@ def dict_to_tag_attributes(dct):
 
 
 def screening_line(string):
+    string = string.replace('&', '&amp;')
     string = string.replace('<', '&lt;')
     string = string.replace('>', '&gt;')
     string = string.replace('"', '&quot;')
@@ -143,93 +153,234 @@ def to_xml_tag(tag_name, contains, **attributes):
         tag_name, dict_to_tag_attributes(attributes))
 
 
-def create_xml_document(result):
-    def render_result_proxy(result_proxy):
-        cases_report = []
-
-        for _, xunit_data in result_proxy.successes:
-            cases_report.append(
-                to_xml_tag('testcase', None,
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
-
-        for _, xunit_data in result_proxy.skipped:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('skipped',
-                                      cdata(xunit_data.reason),
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
-
-        for _, xunit_data in result_proxy.failures:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('failure',
-                                      cdata(xunit_data.reason),
-                                      type=xunit_data.exc_type,
-                                      message=xunit_data.exc_message,
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
-
-        for _, xunit_data in result_proxy.errors:
-            cases_report.append(
-                to_xml_tag('testcase',
-                           to_xml_tag('error',
-                                      cdata(xunit_data.reason),
-                                      type=xunit_data.exc_type,
-                                      message=xunit_data.exc_message,
-                                      ),
-                           time=xunit_data.runtime,
-                           name=xunit_data.method_name,
-                           classname=xunit_data.class_name,
-                           ),
-            )
-
-        state = result_proxy.get_state()
-
-        return to_xml_tag('testsuite',
-                          u''.join(cases_report),
-                          name=result_proxy.name,
-                          tests=state.tests,
-                          time=state.runtime,
-                          skip=state.skipped,
-                          errors=state.errors,
-                          failures=state.failures,
-                          )
-
-    data = u''.join(
-        (
-            u'<?xml version="{version}" encoding="{encoding}"?>'.format(
-                version=XML_VERSION,
-                encoding=XML_ENCODING,
-            ),
-            to_xml_tag('testsuites',
-                       u''.join(
-                           map(render_result_proxy, result.proxies),
-                       )
-                       if result.proxies else render_result_proxy(result),
+def open_xml_tag(tag_name, **attributes):
+    return u'<{}{}>'.format(tag_name, dict_to_tag_attributes(attributes))
+
+
+def close_xml_tag(tag_name):
+    return u'</{}>'.format(tag_name)
+
+
+def render_testcase(xunit_data, tag_name=None):
+    """
+    Tag name is "skipped", "failure", "error" or None for success
+    """
+    if tag_name is None:
+        contains = None
+    elif tag_name == 'skipped':
+        contains = to_xml_tag(tag_name, cdata(xunit_data.reason))
+    else:
+        contains = to_xml_tag(tag_name,
+                              cdata(xunit_data.reason),
+                              type=xunit_data.exc_type,
+                              message=xunit_data.exc_message,
+                              )
+
+    return to_xml_tag('testcase', contains,
+                      time=xunit_data.runtime,
+                      name=xunit_data.method_name,
+                      classname=xunit_data.class_name,
+                      )
+
+
+def render_xml_header():
+    return u'<?xml version="{version}" encoding="{encoding}"?>'.format(
+        version=XML_VERSION,
+        encoding=XML_ENCODING,
+    )
+
+
+def iter_result_proxy(result_proxy):
+    state = result_proxy.get_state()
+    attributes = dict(
+        name=result_proxy.name,
+        tests=state.tests,
+        time=state.runtime,
+        skip=state.skipped,
+        errors=state.errors,
+        failures=state.failures,
+    )
+
+    if not state.tests:
+        yield to_xml_tag('testsuite', None, **attributes)
+        return
+
+    yield open_xml_tag('testsuite', **attributes)
+
+    for tag_name, storage in ((None, result_proxy.successes),
+                              ('skipped', result_proxy.skipped),
+                              ('failure', result_proxy.failures),
+                              ('error', result_proxy.errors)):
+        for _, xunit_data in storage:
+            yield render_testcase(xunit_data, tag_name)
+
+    yield close_xml_tag('testsuite')
+
+
+def iter_xml_document(result):
+    """
+    Chunks of document, so it can be written
+    to file without building the whole string.
+    """
+    yield render_xml_header()
+    yield open_xml_tag('testsuites',
                        name=result.name,
                        tests=result.current_state.tests,
                        time=result.current_state.runtime,
                        skip=result.current_state.skipped,
                        errors=result.current_state.errors,
                        failures=result.current_state.failures,
-                       ),
-        ),
-    )
+                       )
+
+    for result_proxy in result.proxies or [result]:
+        for chunk in iter_result_proxy(result_proxy):
+            yield chunk
+
+    yield close_xml_tag('testsuites')
+
+
+def create_xml_document(result):
+    data = u''.join(iter_xml_document(result))
 
     if pyv.IS_PYTHON_2:
         return data.encode('utf-8')
 
     return data
+
+
+def replace_file(source, destination):
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    else:
+        if os.name == 'nt' and os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
+
+
+def write_xml_document(result, file_path):
+    """
+    Document is written to temporary file which replaces
+    file of report, so report is not broken by crash while writing.
+    """
+    tmp_path = file_path + TMP_SUFFIX
+
+    with io.open(tmp_path, 'w', encoding=XML_ENCODING) as fp:
+        for chunk in iter_xml_document(result):
+            fp.write(chunk)
+
+    replace_file(tmp_path, file_path)
+
+
+def is_complete_xml_document(data):
+    try:
+        ElementTree.fromstring(data)
+    except ElementTree.ParseError:
+        return False
+    return True
+
+
+def repair_xml_document(file_path):
+    """
+    Close document which was written by stream and was truncated
+    by crash of run. Test case which was written partially is dropped.
+    Returns False if document is complete already.
+    """
+    try:
+        with open(file_path, 'rb') as fp:
+            data = fp.read()
+    except (IOError, OSError) as error:
+        raise ConfigError(
+            'Can not read xunit report "{}": {}'.format(file_path, error),
+        )
+
+    if is_complete_xml_document(data):
+        return False
+
+    closing = u'\n'.join(
+        (close_xml_tag('testsuite'), close_xml_tag('testsuites'), u''),
+    ).encode(XML_ENCODING)
+    lines = data.split(b'\n')
+
+    # header of stream is the first lines: xml declaration,
+    # opening "testsuites" and opening "testsuite"
+    for size in range(len(lines) - 1, STREAM_HEADER_LINES - 1, -1):
+        if size > STREAM_HEADER_LINES and not lines[size - 1].endswith(TESTCASE_ENDINGS):
+            continue
+
+        repaired = b'\n'.join(lines[:size] + [closing])
+
+        if is_complete_xml_document(repaired):
+            break
+    else:
+        repaired = u''.join(
+            (render_xml_header(), to_xml_tag('testsuites', None)),
+        ).encode(XML_ENCODING)
+
+    tmp_path = file_path + TMP_SUFFIX
+
+    with open(tmp_path, 'wb') as fp:
+        fp.write(repaired)
+
+    replace_file(tmp_path, file_path)
+
+    return True
+
+
+class XUnitStream(object):
+    """
+    Report which is written while run is going. Each test case
+    is appended to file at the moment when it was added to result,
+    so report of run which was killed can be restored
+    by "repair_xml_document". Complete document replaces
+    stream on close, so test cases are grouped by suites.
+    """
+
+    def __init__(self, file_path, name=None):
+        self.__lock = Lock()
+        self.__file_path = file_path
+        self.__fp = io.open(file_path, 'w', encoding=XML_ENCODING)
+
+        self.__write(
+            render_xml_header(),
+            open_xml_tag('testsuites', name=name),
+            open_xml_tag('testsuite', name=name),
+        )
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    @property
+    def closed(self):
+        return self.__fp.closed
+
+    def __write(self, *chunks):
+        for chunk in chunks:
+            self.__fp.write(chunk)
+            self.__fp.write(u'\n')
+
+        self.__fp.flush()
+
+    def write(self, xunit_data, tag_name=None):
+        with self.__lock:
+            if not self.closed:
+                self.__write(render_testcase(xunit_data, tag_name))
+
+    def close(self, result=None):
+        """
+        Write complete document of result or close stream as is
+        """
+        with self.__lock:
+            if self.closed:
+                return
+
+            if result is None:
+                self.__write(
+                    close_xml_tag('testsuite'),
+                    close_xml_tag('testsuites'),
+                )
+
+            self.__fp.close()
+
+        if result is not None:
+            write_xml_document(result, self.__file_path)
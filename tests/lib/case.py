@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import os
+import re
+import sys
+import shutil
+import tempfile
 import unittest
+import subprocess
 
 try:
     from StringIO import StringIO
@@ -18,6 +24,67 @@ class BaseTestCase(unittest.TestCase):
     maxDiff = None
 
 
+class ProgramTestCase(BaseTestCase):
+    """
+    Program is run in subprocess, so workers of it can be killed
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_program(self, source, *argv, **kwargs):
+        config_source = kwargs.pop('config', None)
+        timeout = kwargs.pop('timeout', None)
+
+        with open(os.path.join(self.tmp_dir, 'mp_suites.py'), 'w') as fp:
+            fp.write(source)
+
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))] +
+            [p for p in [env.get('PYTHONPATH')] if p]
+        )
+        env.pop('SEISMOGRAPH_CONF', None)
+
+        if config_source is not None:
+            config_path = os.path.join(self.tmp_dir, 'mp_config.py')
+
+            with open(config_path, 'w') as fp:
+                fp.write(config_source)
+
+            env['SEISMOGRAPH_CONF'] = config_path
+
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'seismograph', self.tmp_dir] + list(argv),
+            cwd=self.tmp_dir,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+        if timeout is None:
+            output = process.communicate()[0]
+        else:  # python 3 only
+            try:
+                output = process.communicate(timeout=timeout)[0]
+            except subprocess.TimeoutExpired:
+                process.kill()
+                output = process.communicate()[0]
+                self.fail('program is hanging:\n{}'.format(output.decode('utf-8')))
+
+        output = output.decode('utf-8')
+
+        match = re.search(
+            r'tests=(\d+) failures=(\d+) errors=(\d+)', output,
+        )
+        self.assertIsNotNone(match, output)
+
+        return process.returncode, tuple(int(i) for i in match.groups()), output
+
+
 class ConfigTestCaseMixin(object):
 
     __config_options__ = {}
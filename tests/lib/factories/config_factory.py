@@ -7,6 +7,9 @@ class FakeConfig(object):
 
     def __init__(self):
         self.XUNIT_REPORT = None
+        self.REPAIR_XUNIT_REPORT = None
+        self.JSONL_REPORT = None
+        self.BINARY_REPORT = None
         self.VERBOSE = False
         self.OUTPUT = None
         self.NO_CAPTURE = False
@@ -23,16 +26,39 @@ class FakeConfig(object):
         self.REPEAT = 0
         self.RANDOM = False
         self.RANDOM_SEED = time.time()
+        self.SCHEDULE = 'default'
+        self.SHARD = None
+        self.SHARD_BY_RUNTIME = False
+        self.LAZY_BUILD = False
+        self.PREFETCH = False
+        self.LAST_FAILED = False
+        self.FAILED_FIRST = False
+        self.HISTORY_PATH = None
+        self.DEFAULT_RUNTIME = 1.0
         self.NO_SCRIPTS = False
         self.ASYNC_SUITES = 0
         self.ASYNC_TESTS = 0
+        self.WORKERS = None
+        self.MAX_THREADS = 0
         self.MULTIPROCESSING_TIMEOUT = 1800.0
+        self.GRACE_TIMEOUT = 10.0
+        self.CASE_TIMEOUT = 0.0
         self.GEVENT = False
         self.THREADING = False
+        self.ASYNCIO = False
         self.MULTIPROCESSING = False
         self.PDB = False
+        self.PRELOAD = []
+        self.COORDINATOR = None
+        self.AGENT = None
+        self.AGENT_TOKEN = None
+        self.SERVE = False
+        self.CLIENT = False
+        self.WATCH = False
+        self.DAEMON_SOCKET = '.seismograph.sock'
         self.FIRST_FLOW_ONLY = False
         self.SPLIT_FLOWS = False
+        self.SPLIT_SUITES = False
 
     def __getitem__(self, item):
         try:
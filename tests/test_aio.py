@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import unittest
+
+from seismograph.utils import aio
+from seismograph.utils import pyv
+
+from .lib.case import BaseTestCase
+from .lib.case import ProgramTestCase
+
+
+def make_coroutine(value):
+    # native coroutine can not be declared in code which is valid for python 2
+    namespace = {}
+    exec('async def coroutine():\n    return {!r}'.format(value), namespace)
+    return namespace['coroutine']()
+
+
+@unittest.skipIf(pyv.IS_PYTHON_2, 'asyncio is not supported on python 2')
+class TestResolve(BaseTestCase):
+
+    def test_not_coroutine(self):
+        self.assertEqual(aio.resolve(5), 5)
+
+    def test_coroutine(self):
+        self.assertEqual(aio.resolve(make_coroutine(5)), 5)
+
+    def test_shared_loop(self):
+        results = []
+
+        def run_in_thread():
+            results.append(aio.resolve(make_coroutine(5)))
+
+        with aio.shared_loop() as loop:
+            self.assertIs(aio.get_shared_loop(), loop)
+
+            self.assertTrue(loop.is_running())
+
+            thread = threading.Thread(target=run_in_thread)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(results, [5])
+        self.assertIsNone(aio.get_shared_loop())
+
+
+def nested(log, value):
+    result = yield value
+    log.append(result)
+    raise ValueError(value)
+
+
+def outer(log):
+    log.append((yield 1))
+
+    try:
+        yield nested(log, 2)
+    except ValueError as error:
+        log.append(str(error))
+
+    log.append((yield 3))
+
+
+class TestDrive(BaseTestCase):
+
+    def test_values_are_sent_back(self):
+        log = []
+
+        aio.drive(outer(log))
+
+        self.assertEqual(log, [1, 2, '2', 3])
+
+    def test_error_is_raised(self):
+        def generator():
+            yield nested([], 1)
+
+        with self.assertRaises(ValueError):
+            aio.drive(generator())
+
+
+@unittest.skipIf(pyv.IS_PYTHON_2, 'asyncio is not supported on python 2')
+class TestDriveInLoop(BaseTestCase):
+
+    def run_in_loop(self, generator, **kwargs):
+        from functools import partial
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(1)
+
+        try:
+            with aio.shared_loop() as loop:
+                future = aio.call_in_loop(
+                    loop, partial(aio.drive_in_loop, **kwargs), generator, executor,
+                )
+                return aio.wait(future)
+        finally:
+            executor.shutdown()
+
+    def test_coroutine_is_awaited(self):
+        log = []
+
+        def generator():
+            log.append((yield make_coroutine(5)))
+            log.append((yield 6))
+
+        self.run_in_loop(generator())
+
+        self.assertEqual(log, [5, 6])
+
+    def test_timeout_error_is_thrown(self):
+        import time
+        import asyncio
+
+        log = []
+
+        def generator():
+            try:
+                yield asyncio.sleep(5)
+            except RuntimeError:
+                log.append('timeout')
+
+        deadline = time.time() + 0.1
+        self.run_in_loop(
+            generator(), get_deadline=lambda: deadline, timeout_error=RuntimeError,
+        )
+
+        self.assertEqual(log, ['timeout'])
+
+
+RESOURCE_BOUND_SOURCE = """
+import asyncio
+import seismograph
+
+suite = seismograph.Suite(__name__)
+
+
+async def test(self):
+    await asyncio.sleep(0.01)
+
+
+for index in range(8):
+    name = 'Case{}'.format(index)
+    globals()[name] = suite.register(
+        type(name, (seismograph.Case,), {'__resources__': {'db': 1}, 'test': test}),
+    )
+"""
+
+
+@unittest.skipIf(pyv.IS_PYTHON_2, 'asyncio is not supported on python 2')
+class TestAsyncioResources(ProgramTestCase):
+
+    def test_more_resource_bound_cases_than_threads(self):
+        # cases which are waiting for resources must not take threads
+        code, counts, output = self.run_program(
+            RESOURCE_BOUND_SOURCE,
+            '--asyncio', '--async-tests', '4', '--max-threads', '2',
+            config='RESOURCES = {"db": 1}\n',
+            timeout=30,
+        )
+
+        self.assertEqual(code, 0, output)
+        self.assertEqual(counts, (8, 0, 0), output)
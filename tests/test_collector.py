@@ -10,6 +10,7 @@ from lib.factories import suite_factory
 from seismograph import collector
 from seismograph import exceptions
 from seismograph import loader
+from seismograph import runnable
 from seismograph import suite
 
 
@@ -187,6 +188,56 @@ class TestBaseGenerator(unittest.TestCase):
         clear.assert_called_once()
 
 
+class LazyBuildTestCase(unittest.TestCase):
+
+    def setUp(self):
+        fake_config = config_factory.create()
+        self.fake_suites = [suite_factory.create(config=fake_config) for _ in range(3)]
+
+    def test_is_lazy_build(self):
+        self.assertFalse(collector.is_lazy_build(None, None))
+        self.assertFalse(collector.is_lazy_build(config_factory.create(), None))
+
+        fake_config = config_factory.create(LAZY_BUILD=True)
+        self.assertTrue(collector.is_lazy_build(fake_config, None))
+        self.assertFalse(collector.is_lazy_build(fake_config, (1, 2)))
+
+        fake_config.SCHEDULE = 'duration'
+        self.assertFalse(collector.is_lazy_build(fake_config, None))
+
+    @patch.object(collector.extensions, 'clear')
+    def test_suites_are_built_before_run(self, clear):
+        generator = collector.lazy_generator(self.fake_suites)
+
+        self.assertIs(next(generator), self.fake_suites[0])
+        self.assertTrue(runnable.is_build(self.fake_suites[0]))
+        self.assertFalse(runnable.is_build(self.fake_suites[1]))
+
+        self.assertEqual(list(generator), self.fake_suites[1:])
+        clear.assert_called_once()
+
+    @patch.object(collector.extensions, 'clear')
+    def test_next_suite_is_prefetched(self, clear):
+        generator = collector.lazy_generator(self.fake_suites, prefetch=True)
+
+        next(generator)
+        self.assertIs(next(generator), self.fake_suites[1])
+
+        self.assertEqual(list(generator), self.fake_suites[2:])
+        self.assertTrue(all(runnable.is_build(s) for s in self.fake_suites))
+
+    def test_error_of_prefetch_is_raised(self):
+        build = collector.SuiteBuild(self.fake_suites[0])
+        build.start()
+        build.get()
+
+        build = collector.SuiteBuild(self.fake_suites[0])
+        build.start()
+
+        with self.assertRaises(RuntimeError):
+            build.get()
+
+
 class GetGeneratorByCommandsTestCase(unittest.TestCase):
     generator_by_commands_patch = compose_decorators(
         patch.object(collector, 'call_to_chain'),
@@ -283,3 +334,80 @@ class CreateGeneratorTestCase(unittest.TestCase):
     def test_create_generator_empty_config(self):
         with self.assertRaises(AttributeError):
             collector.create_generator([], [])
+
+
+class FakeSchedule(object):
+
+    def __init__(self, runtimes):
+        self.runtimes = runtimes
+
+    def estimate(self, obj):
+        return self.runtimes[obj]
+
+
+class ShardTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.units = [
+            ('suite:Case.test_{}'.format(i), 'case_{}'.format(i))
+            for i in range(20)
+        ]
+
+    def test_get_shard(self):
+        self.assertEqual(
+            collector.get_shard(config_factory.create(SHARD='2/4')), (2, 4),
+        )
+        self.assertIsNone(collector.get_shard(config_factory.create()))
+
+    def test_split_by_hash_is_stable(self):
+        shards = collector.split_by_hash(self.units, 3)
+
+        self.assertEqual(shards, collector.split_by_hash(self.units[::-1], 3))
+        self.assertEqual(set(shards), set(name for name, _ in self.units))
+        self.assertTrue(all(0 <= s < 3 for s in shards.values()))
+
+    def test_split_by_runtime(self):
+        units = [('a', 'a'), ('b', 'b'), ('c', 'c'), ('d', 'd')]
+        schedule = FakeSchedule({'a': 4.0, 'b': 3.0, 'c': 2.0, 'd': 1.0})
+
+        shards = collector.split_by_runtime(units, 2, schedule)
+
+        self.assertEqual(shards, {'a': 0, 'b': 1, 'c': 1, 'd': 0})
+
+
+class LastFailedTestCase(unittest.TestCase):
+
+    def test_is_selected(self):
+        self.assertTrue(collector.is_selected('s:Case.test', 's'))
+        self.assertTrue(collector.is_selected('s:Case.test', 's:Case'))
+        self.assertTrue(collector.is_selected('s:Case.test', 's:Case.test'))
+        self.assertFalse(collector.is_selected('s:Case.test', 's:Cas'))
+        self.assertFalse(collector.is_selected('s2:Case.test', 's'))
+
+    @patch.object(collector.history, 'load')
+    def test_get_last_failed(self, load):
+        fake_suite = suite_factory.create()
+
+        @fake_suite.register
+        class Case(suite.case.Case):
+
+            def test(self):
+                pass
+
+        load.return_value = collector.history.History(
+            failed=[
+                '{}:Case.test'.format(fake_suite.name),
+                '{}:Removed.test'.format(fake_suite.name),
+                '{}:Case.test_gone'.format(fake_suite.name),
+                'removed_suite',
+            ],
+        )
+        fake_config = config_factory.create(LAST_FAILED=True, HISTORY_PATH='path')
+
+        self.assertEqual(
+            collector.get_last_failed([fake_suite], fake_config),
+            ['{}:Case.test'.format(fake_suite.name)],
+        )
+
+        fake_config.TESTS = ['other_suite']
+        self.assertEqual(collector.get_last_failed([fake_suite], fake_config), [])
@@ -173,6 +173,16 @@ class TestConfigPrepareConfig(unittest.TestCase):
         config.prepare_config(conf_obj)
         self.assertTrue(conf_obj.get(self.MULTIPROCESSING_KEY))
 
+    # asyncio нельзя использовать на python 2
+    def test_asyncio_on_python_2(self):
+        conf_obj = config_factory.create(ASYNCIO=True)
+
+        with patch('seismograph.config.sys') as mock_sys:
+            mock_sys.version_info = (2, 7, 18)
+
+            with self.assertRaises(ConfigError):
+                config.prepare_config(conf_obj)
+
     # Изменение *_LOG влияет на VERBOSE
     def test_verbose_log(self):
         conf = {
@@ -221,6 +231,90 @@ class TestConfigPrepareConfig(unittest.TestCase):
         self.assertTrue(conf_obj.get(self.VERBOSE_KEY))
 
 
+class TestConfigWorkers(unittest.TestCase):
+
+    # Можем разобрать топологию "P:T"
+    def test_parse_workers(self):
+        self.assertEqual(config.parse_workers('4:8'), (4, 8))
+
+    # Некорректная топология приводит к ConfigError
+    def test_parse_workers_incorrect(self):
+        for value in ('4', '4:a', '4:8:1', '0:8', '4:0'):
+            with self.assertRaises(ConfigError):
+                config.parse_workers(value)
+
+    # WORKERS задает ASYNC_* и включает MULTIPROCESSING
+    def test_prepare_config(self):
+        conf_obj = config_factory.create(WORKERS='2:16')
+        config.prepare_config(conf_obj)
+
+        self.assertTrue(conf_obj.MULTIPROCESSING)
+        self.assertEqual(conf_obj.ASYNC_SUITES, 2)
+        self.assertEqual(conf_obj.ASYNC_TESTS, 16)
+
+    # WORKERS нельзя использовать вместе с THREADING
+    def test_prepare_config_threading(self):
+        conf_obj = config_factory.create(WORKERS='2:16', THREADING=True)
+
+        with self.assertRaises(ConfigError):
+            config.prepare_config(conf_obj)
+
+
+class TestConfigShard(unittest.TestCase):
+
+    # Можем разобрать шард "INDEX/TOTAL"
+    def test_parse_shard(self):
+        self.assertEqual(config.parse_shard('2/4'), (2, 4))
+
+    # Индекс шарда должен быть от 1 до TOTAL
+    def test_parse_shard_incorrect(self):
+        for value in ('2', '0/4', '5/4', 'a/4', '1/0'):
+            with self.assertRaises(ConfigError):
+                config.parse_shard(value)
+
+    # Шарды делятся по времени только с явно заданной историей
+    def test_shard_by_runtime(self):
+        conf_obj = config_factory.create(SHARD='1/2', HISTORY_PATH='history')
+        config.prepare_config(conf_obj)
+        self.assertTrue(conf_obj.SHARD_BY_RUNTIME)
+
+    # История по умолчанию на разных машинах разная
+    def test_shard_by_hash_with_default_history(self):
+        conf_obj = config_factory.create(SHARD='1/2', SCHEDULE='duration')
+        config.prepare_config(conf_obj)
+        self.assertFalse(conf_obj.SHARD_BY_RUNTIME)
+        self.assertIsNotNone(conf_obj.HISTORY_PATH)
+
+
+class TestConfigDistributed(unittest.TestCase):
+
+    # Нельзя быть координатором и агентом одновременно
+    def test_prepare_config_coordinator_and_agent(self):
+        conf_obj = config_factory.create(
+            COORDINATOR='127.0.0.1:5000', AGENT='127.0.0.1:5000',
+        )
+
+        with self.assertRaises(ConfigError):
+            config.prepare_config(conf_obj)
+
+
+class TestConfigDaemon(unittest.TestCase):
+
+    # Нельзя быть демоном и клиентом одновременно
+    def test_prepare_config_serve_and_client(self):
+        conf_obj = config_factory.create(SERVE=True, CLIENT=True)
+
+        with self.assertRaises(ConfigError):
+            config.prepare_config(conf_obj)
+
+    # Режим наблюдения не совместим с демоном
+    def test_prepare_config_watch_and_serve(self):
+        conf_obj = config_factory.create(SERVE=True, WATCH=True)
+
+        with self.assertRaises(ConfigError):
+            config.prepare_config(conf_obj)
+
+
 class TestConfigGetConfigPathByEnv(unittest.TestCase):
     KEY = "ENV_VAR_KEY"
     BASE_PATH = "BASE_PATH"
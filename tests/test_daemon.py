@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+
+from seismograph import loader
+from seismograph import daemon
+
+from .lib.case import BaseTestCase
+from .lib.factories import config_factory
+from .lib.factories import program_factory
+
+
+class TestStripDaemonOptions(BaseTestCase):
+
+    def runTest(self):
+        argv = [
+            '--client', '-t', 's1', '--daemon-socket', '/tmp/s.sock',
+            '--daemon-socket=/tmp/s.sock', '-v', '--serve',
+        ]
+        self.assertEqual(
+            daemon.strip_daemon_options(argv), ['-t', 's1', '-v'],
+        )
+
+
+class TestPreloadModules(BaseTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        sys.path.append(self.tmp_dir)
+
+        self.write('daemon_suite_a', 'VALUE = 1\n')
+        self.write('daemon_suite_b', 'VALUE = 1\n')
+
+    def tearDown(self):
+        sys.path.remove(self.tmp_dir)
+        shutil.rmtree(self.tmp_dir)
+
+        for module_name in ('daemon_suite_a', 'daemon_suite_b'):
+            loader._preloaded.pop(module_name, None)
+
+    def write(self, module_name, source, mtime=None):
+        path = os.path.join(self.tmp_dir, module_name + '.py')
+
+        with open(path, 'w') as fp:
+            fp.write(source)
+
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+        return path
+
+    def test_modules_are_imported_once(self):
+        self.assertEqual(
+            sorted(loader.preload_modules(self.tmp_dir)),
+            ['daemon_suite_a', 'daemon_suite_b'],
+        )
+
+        module = loader.load_module('daemon_suite_a')
+
+        self.assertEqual(loader.preload_modules(self.tmp_dir), [])
+        self.assertIs(loader.load_module('daemon_suite_a'), module)
+
+    def test_changed_module_is_reloaded(self):
+        loader.preload_modules(self.tmp_dir)
+
+        self.write('daemon_suite_a', 'VALUE = 2\n', mtime=1)
+
+        self.assertEqual(loader.preload_modules(self.tmp_dir), ['daemon_suite_a'])
+        self.assertEqual(loader.load_module('daemon_suite_a').VALUE, 2)
+        self.assertEqual(loader.load_module('daemon_suite_b').VALUE, 1)
+
+    def test_broken_and_removed_modules_are_dropped(self):
+        loader.preload_modules(self.tmp_dir)
+
+        self.write('daemon_suite_a', 'VALUE = (\n', mtime=1)
+        os.remove(os.path.join(self.tmp_dir, 'daemon_suite_b.py'))
+
+        self.assertEqual(loader.preload_modules(self.tmp_dir), [])
+        self.assertNotIn('daemon_suite_a', loader._preloaded)
+        self.assertNotIn('daemon_suite_b', loader._preloaded)
+
+
+class TestWatcher(BaseTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+        for module_name, suite_name in (('watch_a', 'wa'), ('watch_b', 'wb')):
+            with open(os.path.join(self.tmp_dir, module_name + '.py'), 'w') as fp:
+                fp.write(
+                    'import seismograph\n'
+                    'suite = seismograph.Suite({!r})\n'.format(suite_name),
+                )
+
+        program = program_factory.create(config_factory.create())
+        program.suites_path = self.tmp_dir
+
+        self.watcher = daemon.Watcher(program, None)
+
+    def tearDown(self):
+        sys.path.remove(self.tmp_dir)
+        shutil.rmtree(self.tmp_dir)
+
+        for module_name in ('watch_a', 'watch_b'):
+            loader._preloaded.pop(module_name, None)
+
+    def test_suites_of_changed_modules(self):
+        self.watcher.preload()
+
+        self.assertEqual(self.watcher.get_suites(['watch_b']), ['wb'])
+        self.assertEqual(self.watcher.get_suites(['watch_b', 'watch_a']), ['wa', 'wb'])
+        self.assertEqual(self.watcher.get_suites(['missing']), [])
+
+    def test_changes_are_found(self):
+        self.watcher.preload()
+        snapshot = self.watcher.snapshot()
+
+        os.utime(os.path.join(self.tmp_dir, 'watch_a.py'), (1, 1))
+
+        snapshot, changed = self.watcher.wait_changes(snapshot)
+
+        self.assertEqual(changed, ['watch_a'])
+        self.assertEqual(snapshot['watch_a'], 1)
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import json
+import sys
+import shutil
+import socket
+import tempfile
+import subprocess
+
+from seismograph.utils import net
+from seismograph.exceptions import ConfigError
+from seismograph.groups.distributed import Coordinator
+from seismograph.groups.distributed import MESSAGE_HELLO
+from seismograph.groups.distributed import get_layout
+
+from .lib.case import BaseTestCase
+from .lib.factories import config_factory
+from .lib.factories import result_factory
+
+
+class TestChannel(BaseTestCase):
+
+    def setUp(self):
+        left, right = socket.socketpair()
+        self.left = net.Channel(left)
+        self.right = net.Channel(right)
+
+    def tearDown(self):
+        self.left.close()
+        self.right.close()
+
+    def test_send_and_recv(self):
+        message = ('run_cases', 1, [0, 2])
+        self.left.send(message)
+
+        self.assertTrue(self.right.poll(1))
+        self.assertEqual(self.right.recv(), message)
+        self.assertFalse(self.right.poll())
+
+    def test_long_bytes(self):
+        self.left.send_bytes(b'x' * 10)
+
+        with self.assertRaises(IOError):
+            self.right.recv_bytes(5)
+
+    def test_eof(self):
+        self.left.close()
+
+        with self.assertRaises(EOFError):
+            self.right.recv()
+
+    def test_parse_address(self):
+        self.assertEqual(net.parse_address('localhost:5000'), ('localhost', 5000))
+        self.assertEqual(net.parse_address(':5000'), ('127.0.0.1', 5000))
+
+        with self.assertRaises(ConfigError):
+            net.parse_address('localhost')
+
+
+class TestHandshake(BaseTestCase):
+
+    def setUp(self):
+        config = config_factory.create(COORDINATOR='127.0.0.1:0', AGENT_TOKEN='secret')
+
+        self.coordinator = Coordinator(result_factory.create(config), config)
+        self.address = self.coordinator.listener.getsockname()
+        self.channels = []
+
+    def tearDown(self):
+        self.coordinator.terminate_all()
+
+        for channel in self.channels:
+            channel.close()
+
+    def connect(self):
+        channel = net.connect(self.address)
+        self.channels.append(channel)
+        return channel
+
+    def say_hello(self, token):
+        agent = self.connect()
+        net.send_token(agent, token)
+        agent.send((MESSAGE_HELLO, None, get_layout([])))
+        return agent
+
+    def is_accepted(self):
+        self.coordinator.try_release()
+        return bool(self.coordinator.workers)
+
+    def is_handled(self):
+        self.coordinator.try_release()
+        return not self.coordinator.pending
+
+    def test_silent_agent_does_not_block(self):
+        self.connect()
+        self.say_hello('secret')
+
+        # waiting is raising timeout error if agent was not accepted
+        self.coordinator.wait_for(self.is_accepted, timeout=2)
+
+        self.assertEqual(len(self.coordinator.workers), 1)
+        self.assertEqual(len(self.coordinator.pending), 1)
+
+    def test_incorrect_token(self):
+        agent = self.say_hello('wrong')
+
+        self.coordinator.wait_for(self.is_handled, timeout=2)
+
+        self.assertEqual(self.coordinator.workers, [])
+
+        with self.assertRaises(EOFError):
+            agent.recv()
+
+
+SUITES_SOURCE = """
+import time
+import seismograph
+
+suite_a = seismograph.Suite('dist_a')
+suite_b = seismograph.Suite('dist_b')
+
+
+@suite_a.register
+def test_a(case):
+    time.sleep(0.2)
+
+
+@suite_a.register
+def test_fail(case):
+    time.sleep(0.2)
+    case.assertion.true(False)
+
+
+@suite_b.register
+def test_b(case):
+    time.sleep(0.2)
+
+
+@suite_b.register
+def test_c(case):
+    time.sleep(0.2)
+"""
+
+
+def get_free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def get_summary(output):
+    match = re.search(
+        r'tests=(\d+) failures=(\d+) errors=(\d+)', output.decode('utf-8'),
+    )
+    return tuple(int(i) for i in match.groups())
+
+
+class TestCoordinatorWithAgents(BaseTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+        with open(os.path.join(self.tmp_dir, 'dist_suites.py'), 'w') as fp:
+            fp.write(SUITES_SOURCE)
+
+        self.report_path = os.path.join(self.tmp_dir, 'report.xml')
+        self.history_path = os.path.join(self.tmp_dir, 'history')
+        self.jsonl_path = os.path.join(self.tmp_dir, 'events.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def start(self, *argv):
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))] +
+            [p for p in [env.get('PYTHONPATH')] if p]
+        )
+
+        return subprocess.Popen(
+            [
+                sys.executable, '-m', 'seismograph', self.tmp_dir,
+                '--xunit-report', self.report_path,
+                '--history', self.history_path,
+                '--jsonl-report', self.jsonl_path,
+            ] + list(argv),
+            cwd=self.tmp_dir,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+    def runTest(self):
+        address = '127.0.0.1:{}'.format(get_free_port())
+
+        coordinator = self.start('--coordinator', address)
+        agents = [self.start('--agent', address) for _ in range(2)]
+
+        coordinator_output, _ = coordinator.communicate()
+        agents_output = [agent.communicate()[0] for agent in agents]
+
+        self.assertEqual(coordinator.returncode, 1, coordinator_output)
+        self.assertEqual(get_summary(coordinator_output), (4, 1, 0))
+
+        agents_summary = [get_summary(output) for output in agents_output]
+
+        self.assertEqual(sum(s[0] for s in agents_summary), 4, agents_output)
+        self.assertEqual(sum(s[1] for s in agents_summary), 1, agents_output)
+        self.assertEqual(
+            [agent.returncode for agent in agents],
+            [int(bool(s[1])) for s in agents_summary],
+        )
+
+        with open(self.report_path) as fp:
+            report = fp.read()
+
+        self.assertIn('tests="4"', report)
+        self.assertTrue(os.path.exists(self.history_path))
+
+        # records of agents are written to stream by coordinator
+        with open(self.jsonl_path) as fp:
+            events = [json.loads(line) for line in fp]
+
+        self.assertEqual(
+            sorted(e['status'] for e in events if e['event'] == 'finish'),
+            ['fail', 'success', 'success', 'success'],
+        )
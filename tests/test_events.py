@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from seismograph import events
+from seismograph import result as _result
+from seismograph.xunit import XUnitData
+
+from .lib.case import BaseTestCase
+from .lib.factories import case_factory
+from .lib.factories import config_factory
+from .lib.factories import result_factory
+
+
+class EventsTestCase(BaseTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.jsonl_path = os.path.join(self.tmp_dir, 'events.jsonl')
+        self.binary_path = os.path.join(self.tmp_dir, 'events.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+
+class TestEventStream(EventsTestCase):
+
+    def test_events_are_buffered(self):
+        stream = events.EventStream(self.jsonl_path, events.dump_json, buffer_size=100)
+        stream.write({'event': 'start'})
+
+        self.assertEqual(list(events.read_json(self.jsonl_path)), [])
+
+        stream.write({'event': 'finish', 'reason': 'x' * 100})
+
+        self.assertEqual(len(list(events.read_json(self.jsonl_path))), 2)
+
+    def test_binary_stream(self):
+        stream = events.EventStream(self.binary_path, events.dump_binary)
+        stream.write({'event': 'start', 'time': 1.5})
+        stream.write({'event': 'finish', 'reason': None})
+        stream.close()
+
+        with open(self.binary_path, 'ab') as fp:
+            fp.write(events.dump_binary({'event': 'start'})[:-1])
+
+        self.assertEqual(
+            list(events.read_binary(self.binary_path)),
+            [{'event': 'start', 'time': 1.5}, {'event': 'finish', 'reason': None}],
+        )
+
+    def test_write_after_close(self):
+        stream = events.EventStream(self.jsonl_path, events.dump_json)
+        stream.close()
+        stream.write({'event': 'start'})
+
+        self.assertTrue(stream.closed)
+        self.assertEqual(list(events.read_json(self.jsonl_path)), [])
+
+
+class TestStreamListener(EventsTestCase):
+
+    def setUp(self):
+        super(TestStreamListener, self).setUp()
+
+        config = config_factory.create()
+        config.JSONL_REPORT = self.jsonl_path
+        config.BINARY_REPORT = self.binary_path
+
+        self.case = case_factory.create()
+        self.result = result_factory.create(config)
+
+    def test_start_and_finish_of_case(self):
+        with self.result:
+            with self.result.proxy() as result_proxy:
+                result_proxy.start(self.case)
+                result_proxy.add_success(self.case, 0.1)
+
+        for stream_events in (events.read_json(self.jsonl_path),
+                              events.read_binary(self.binary_path)):
+            start, finish = stream_events
+
+            self.assertEqual(start['event'], events.EVENT_START)
+            self.assertEqual(finish['event'], events.EVENT_FINISH)
+            self.assertEqual(finish['status'], _result.STATUS_SUCCESS)
+            self.assertEqual(finish['runtime'], 0.1)
+            self.assertEqual(finish['worker'], events.get_worker_id())
+            self.assertEqual(start['method_name'], finish['method_name'])
+            self.assertLessEqual(start['time'], finish['time'])
+
+    def test_synced_records_are_skipped(self):
+        with self.result:
+            self.result.add_result(
+                _result.STATUS_SUCCESS, self.case, XUnitData(runtime=0.1),
+            )
+
+        self.assertEqual(len(self.result.successes), 1)
+        self.assertEqual(list(events.read_json(self.jsonl_path)), [])
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from seismograph import history
+from seismograph import case as _case
+from seismograph.case import CaseBox
+
+from .lib.case import BaseTestCase
+from .lib.factories import case_factory
+from .lib.factories import config_factory
+from .lib.factories import suite_factory
+from .lib.factories import result_factory
+
+
+class TestGetCaseId(BaseTestCase):
+
+    def runTest(self):
+        case = case_factory.create()
+        self.assertEqual(
+            history.get_case_id(case),
+            '{}:FakeCase.test'.format(case_factory.__name__),
+        )
+
+
+class TestLoadAndSave(BaseTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'history')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_not_exist(self):
+        h = history.load(self.path)
+        self.assertEqual(h.suites, {})
+        self.assertEqual(h.cases, {})
+
+    def test_load_broken(self):
+        with open(self.path, 'w') as fp:
+            fp.write('{')
+
+        h = history.load(self.path)
+        self.assertEqual(h.suites, {})
+        self.assertEqual(h.cases, {})
+
+    def test_save_and_load(self):
+        history.save(
+            self.path,
+            history.History(suites={'suite': 1.5}, cases={'suite:Case.test': 0.5}),
+        )
+
+        h = history.load(self.path)
+        self.assertEqual(h.suites, {'suite': 1.5})
+        self.assertEqual(h.cases, {'suite:Case.test': 0.5})
+
+    def test_update(self):
+        case = case_factory.create()
+        result = result_factory.create(config_factory.create())
+        result.add_success(case, 0.25)
+
+        history.update(self.path, result)
+
+        h = history.load(self.path)
+        self.assertEqual(h.cases, {history.get_case_id(case): 0.25})
+
+    def test_update_failed(self):
+        case = case_factory.create()
+        result = result_factory.create(config_factory.create())
+        result.add_fail(case, 'traceback', 0.25, AssertionError())
+
+        history.update(self.path, result)
+        self.assertEqual(
+            history.load(self.path).failed, [history.get_case_id(case)],
+        )
+
+        result = result_factory.create(config_factory.create())
+        result.add_success(case, 0.25)
+
+        history.update(self.path, result)
+        self.assertEqual(history.load(self.path).failed, [])
+
+    def test_update_keeps_not_run_failed(self):
+        history.save(self.path, history.History(failed=['suite:Case.test']))
+
+        result = result_factory.create(config_factory.create())
+        result.add_success(case_factory.create(), 0.25)
+
+        history.update(self.path, result)
+        self.assertEqual(history.load(self.path).failed, ['suite:Case.test'])
+
+
+    def test_update_drops_removed_failed(self):
+        suite = suite_factory.create()
+
+        @suite.register
+        class Case(_case.Case):
+
+            def test(self):
+                pass
+
+        history.save(
+            self.path,
+            history.History(
+                failed=[
+                    '{}:Case.test'.format(suite.name),
+                    '{}:Case.test_gone'.format(suite.name),
+                    'removed_suite',
+                ],
+            ),
+        )
+
+        result = result_factory.create(config_factory.create())
+        result.add_success(case_factory.create(), 0.25)
+
+        history.update(self.path, result, suites=[suite])
+        self.assertEqual(
+            history.load(self.path).failed, ['{}:Case.test'.format(suite.name)],
+        )
+
+    def test_known_ids(self):
+        suite = suite_factory.create()
+
+        @suite.register
+        class Case(_case.Case):
+
+            def test(self):
+                pass
+
+        self.assertEqual(
+            history.get_known_ids([suite]),
+            set([
+                suite.name,
+                '{}:Case'.format(suite.name),
+                '{}:Case.test'.format(suite.name),
+            ]),
+        )
+
+
+class LongCase(case_factory.FakeCase):
+    pass
+
+
+class TestSchedule(BaseTestCase):
+
+    def test_estimate(self):
+        case = case_factory.create()
+        schedule = history.Schedule(
+            history.History(cases={history.get_case_id(case): 3.0}),
+            default_runtime=1.0,
+        )
+
+        self.assertEqual(schedule.estimate(case), 3.0)
+        self.assertEqual(schedule.estimate(CaseBox([case, case])), 6.0)
+
+    def test_estimate_unknown(self):
+        schedule = history.Schedule(history.History(), default_runtime=2.0)
+        self.assertEqual(schedule.estimate(case_factory.create()), 2.0)
+
+    def test_longest_first(self):
+        known = LongCase('test')
+        unknown = case_factory.create()
+
+        schedule = history.Schedule(
+            history.History(cases={history.get_case_id(known): 3.0}),
+            default_runtime=1.0,
+        )
+
+        short_box = CaseBox([unknown])
+        long_box = CaseBox([known])
+        boxes = [short_box, long_box]
+
+        schedule(boxes)
+        self.assertEqual(boxes, [long_box, short_box])
+
+
+class TestFailedFirst(BaseTestCase):
+
+    def runTest(self):
+        failed = LongCase('test')
+        passed = case_factory.create()
+
+        order = history.FailedFirst([history.get_case_id(failed)])
+
+        cases = [passed, failed]
+        order(cases)
+        self.assertEqual(cases, [failed, passed])
+
+        boxes = [CaseBox([passed]), CaseBox([failed])]
+        order(boxes)
+        self.assertEqual([list(b) for b in boxes], [[failed], [passed]])
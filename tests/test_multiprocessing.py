@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+
+import gc
+import os
+import sys
+import time
+
+from seismograph import result as _result
+from seismograph.xunit import XUnitData
+from seismograph.exceptions import ConfigError
+from seismograph.exceptions import TimeoutException
+from seismograph.groups.multiprocessing import MPResult
+from seismograph.groups.multiprocessing import BaseWorker
+from seismograph.groups.multiprocessing import Multiprocessing
+from seismograph.groups.multiprocessing import TASK_RUN_SUITE
+from seismograph.groups.multiprocessing import preload
+
+from .lib.case import BaseTestCase
+from .lib.case import ProgramTestCase
+from .lib.factories import case_factory
+from .lib.factories import config_factory
+from .lib.factories import result_factory
+
+
+class TestPositionalMatch(BaseTestCase):
+
+    def test_event_is_unpacked_by_position(self):
+        config = config_factory.create()
+        worker = MPResult(result_factory.create(config))
+        coordinator = MPResult(result_factory.create(config))
+
+        # the same case is built by agent and coordinator
+        worker_case = case_factory.create(config=config)
+        coordinator_case = case_factory.create(config=config)
+
+        worker.add_match((0, 0), worker_case)
+        coordinator.add_match((0, 0), coordinator_case)
+
+        xunit_data = XUnitData(runtime=0.1, class_name='Case', method_name='test')
+        event = worker.pack_event(_result.STATUS_SUCCESS, worker_case, xunit_data)
+
+        status, runnable_object, unpacked = coordinator.unpack_event(event)
+
+        self.assertEqual(status, _result.STATUS_SUCCESS)
+        self.assertIs(runnable_object, coordinator_case)
+        self.assertEqual(unpacked.runtime, 0.1)
+
+
+class TestWorkerResult(BaseTestCase):
+
+    def test_local_listeners_are_taken_by_worker(self):
+        local_listener = _result.ResultListener()
+        local_listener.is_local = True
+
+        result = result_factory.create(config_factory.create())
+        result.add_listener(_result.ResultListener())
+        result.add_listener(local_listener)
+
+        worker_listener = _result.ResultListener()
+        worker_result = MPResult(result).create_worker_result(worker_listener)
+
+        self.assertEqual(worker_result.listeners, [worker_listener, local_listener])
+
+
+class TestPreload(BaseTestCase):
+
+    def tearDown(self):
+        # objects of test process are frozen by preload
+        if hasattr(gc, 'unfreeze'):  # python 3.7+
+            gc.unfreeze()
+
+    def test_modules_are_imported(self):
+        sys.modules.pop('colorsys', None)
+
+        preload(config_factory.create(PRELOAD=['colorsys']))
+
+        self.assertIn('colorsys', sys.modules)
+
+    def test_missing_module(self):
+        config = config_factory.create(PRELOAD=['seismograph_missing_module'])
+
+        with self.assertRaises(ConfigError):
+            preload(config)
+
+
+class PipeWorker(BaseWorker):
+
+    def is_alive(self):
+        return True
+
+    def join(self, timeout=None):
+        pass
+
+    def terminate(self):
+        pass
+
+
+class TestWaitFor(BaseTestCase):
+
+    def setUp(self):
+        from multiprocessing import Pipe
+
+        self.connection, self.child_connection = Pipe()
+
+        self.worker = PipeWorker(self.connection)
+        self.worker.tasks.append((TASK_RUN_SUITE, 0, None))
+
+        config = config_factory.create()
+        self.multiprocessing = Multiprocessing(result_factory.create(config), config)
+        self.multiprocessing.workers.append(self.worker)
+
+    def tearDown(self):
+        self.connection.close()
+        self.child_connection.close()
+
+    def assert_deadline(self, timeout):
+        started = time.time()
+
+        with self.assertRaises(TimeoutException):
+            self.multiprocessing.wait_for(lambda: False, timeout=timeout)
+
+        self.assertLess(time.time() - started, timeout + 1)
+
+    def test_workers_are_silent(self):
+        self.assert_deadline(0.1)
+
+    def test_workers_are_ready(self):
+        # ready connection is not making waiting endless
+        self.child_connection.send('message')
+
+        self.assert_deadline(0.1)
+
+    def test_condition(self):
+        self.multiprocessing.wait_for(lambda: True, timeout=0)
+
+
+HANGING_SOURCE = """
+import time
+import seismograph
+
+suite = seismograph.Suite('mp_hang')
+
+
+@suite.register
+def test_one(case):
+    pass
+
+
+@suite.register
+def test_hang(case):
+    time.sleep(30)
+"""
+
+
+SLOW_TEARDOWN_SOURCE = """
+import time
+import seismograph
+
+suite = seismograph.Suite('mp_teardown')
+
+
+@suite.register
+class SlowTeardown(seismograph.Case):
+
+    def teardown(self):
+        time.sleep(1)
+
+    def test_busy(self):
+        while True:
+            pass
+
+
+@suite.register
+def test_one(case):
+    pass
+"""
+
+
+CRASHING_SOURCE = """
+import os
+import seismograph
+
+mp_crash = seismograph.Suite('mp_crash')
+
+
+@mp_crash.register
+def test_crash(case):
+    os._exit(1)
+
+
+# suites are found in globals of module by sorted names
+for name in ('mp_x', 'mp_y', 'mp_z'):
+    globals()[name] = seismograph.Suite(name)
+    globals()[name].register(lambda case: None)
+"""
+
+
+CRASHING_WITH_RESOURCES_SOURCE = """
+import os
+import seismograph
+
+mp_crash = seismograph.Suite('mp_crash')
+
+
+@mp_crash.register
+class Crash(seismograph.Case):
+    __resources__ = {'db': 1}
+
+    def test_crash(self):
+        os._exit(1)
+
+
+for name in ('mp_x', 'mp_y'):
+    globals()[name] = seismograph.Suite(name)
+    globals()[name].register(
+        type('Case', (seismograph.Case, ), {
+            '__resources__': {'db': 1},
+            'test': lambda self: None,
+        }),
+    )
+"""
+
+
+STOPPING_SOURCE = """
+import os
+import time
+import seismograph
+
+mp_fail = seismograph.Suite('mp_fail')
+
+
+@mp_fail.register
+def test_fail(case):
+    case.assertion.true(False)
+
+
+@mp_fail.register
+def test_slow(case):
+    time.sleep(0.5)
+
+
+@mp_fail.add_teardown
+def close():
+    open(os.path.join(os.getcwd(), 'closed'), 'a').write('.')
+
+
+for name in ('mp_x', 'mp_y', 'mp_z'):
+    globals()[name] = seismograph.Suite(name)
+    globals()[name].register(lambda case: time.sleep(0.5))
+"""
+
+
+SESSIONS_SOURCE = """
+import os
+import time
+import seismograph
+
+mp_split = seismograph.Suite('mp_split')
+
+
+def log(*args):
+    line = ' '.join([str(os.getpid())] + list(args))
+    open(os.path.join(os.getcwd(), 'calls'), 'a').write(line + '\\n')
+
+
+@mp_split.add_setup
+def setup():
+    log('setup')
+
+
+@mp_split.add_teardown
+def teardown():
+    log('teardown')
+
+
+class BaseCase(seismograph.Case):
+
+    @classmethod
+    def setup_class(cls):
+        log('setup_class', cls.__name__)
+
+    @classmethod
+    def teardown_class(cls):
+        log('teardown_class', cls.__name__)
+
+    def test_a(self):
+        log('test', self.__class__.__name__)
+        time.sleep(0.1)
+
+    def test_b(self):
+        log('test', self.__class__.__name__)
+        time.sleep(0.1)
+
+
+for name in ('CaseA', 'CaseB', 'CaseC', 'CaseD'):
+    mp_split.register(type(name, (BaseCase, ), {}))
+"""
+
+
+class TestCrashedWorker(ProgramTestCase):
+
+    def test_worker_is_replaced(self):
+        code, summary, output = self.run_program(
+            CRASHING_SOURCE, '--multiprocessing', '--async-suites', '1',
+        )
+
+        self.assertEqual(code, 1, output)
+        self.assertEqual(summary, (4, 0, 1), output)
+        self.assertIn(
+            'Worker process was exited with code 1 while suite "mp_crash" was running',
+            output,
+        )
+
+
+    def test_resources_of_worker_are_released(self):
+        started = time.time()
+        code, summary, output = self.run_program(
+            CRASHING_WITH_RESOURCES_SOURCE,
+            '--multiprocessing', '--async-suites', '2', '--mp-timeout', '20',
+            config='RESOURCES = {"db": 1}\n',
+        )
+
+        self.assertEqual(code, 1, output)
+        self.assertEqual(summary, (3, 0, 1), output)
+        self.assertLess(time.time() - started, 10, output)
+
+
+class TestStop(ProgramTestCase):
+
+    def test_queue_is_dropped(self):
+        for argv in ([], ['--split-suites']):
+            started = time.time()
+            code, summary, output = self.run_program(
+                STOPPING_SOURCE,
+                '--multiprocessing', '--async-suites', '1', '-x', *argv
+            )
+
+            # cases of other suites were not run
+            self.assertEqual(code, 1, output)
+            self.assertEqual(summary[1:], (1, 0), output)
+            self.assertLessEqual(summary[0], 2, output)
+            self.assertLess(time.time() - started, 10)
+
+            # suite which was opened on worker is closed
+            with open(os.path.join(self.tmp_dir, 'closed')) as fp:
+                self.assertEqual(fp.read(), '.')
+
+            os.remove(os.path.join(self.tmp_dir, 'closed'))
+
+
+class TestKilledWorker(ProgramTestCase):
+
+    def test_case_is_reported_once(self):
+        for argv in ([], ['--split-suites']):
+            code, summary, output = self.run_program(
+                HANGING_SOURCE,
+                '--multiprocessing', '--async-suites', '1', '--async-tests', '2',
+                '--case-timeout', '0.3', '--grace-timeout', '0.5', *argv
+            )
+
+            self.assertEqual(code, 1, output)
+            self.assertEqual(summary, (2, 0, 1), output)
+            self.assertIn('time.sleep(30)', output)
+
+    def test_interrupted_case_is_not_killed(self):
+        code, summary, output = self.run_program(
+            SLOW_TEARDOWN_SOURCE,
+            '--multiprocessing', '--async-suites', '1', '--async-tests', '2',
+            '--case-timeout', '0.3', '--grace-timeout', '0.5',
+        )
+
+        self.assertEqual(code, 1, output)
+        self.assertEqual(summary, (2, 0, 1), output)
+        self.assertIn('Timeout of case was exceeded', output)
+        self.assertNotIn('Worker process was exited', output)
+
+
+class TestSplitSuites(ProgramTestCase):
+
+    def test_contexts_are_run_once_per_worker(self):
+        code, summary, output = self.run_program(
+            SESSIONS_SOURCE,
+            '--multiprocessing', '--split-suites', '--async-suites', '2',
+        )
+
+        self.assertEqual(code, 0, output)
+        self.assertEqual(summary, (8, 0, 0), output)
+
+        with open(os.path.join(self.tmp_dir, 'calls')) as fp:
+            calls = [line.split() for line in fp.read().splitlines()]
+
+        workers = set(call[0] for call in calls if call[1] == 'test')
+        self.assertEqual(len(workers), 2, calls)
+
+        # suite is opened and closed once on each worker which got cases
+        for call_name in ('setup', 'teardown'):
+            self.assertEqual(
+                sorted(call[0] for call in calls if call[1] == call_name),
+                sorted(workers),
+            )
+
+        # cases of class are run by one worker between its setup and teardown
+        for class_name in ('CaseA', 'CaseB', 'CaseC', 'CaseD'):
+            class_calls = [call for call in calls if call[2:] == [class_name]]
+
+            self.assertEqual(
+                [call[1] for call in class_calls],
+                ['setup_class', 'test', 'test', 'teardown_class'],
+            )
+            self.assertEqual(len(set(call[0] for call in class_calls)), 1)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+from seismograph.utils import polling
+from seismograph.utils.common import waiting_for
+from seismograph.exceptions import TimeoutException
+
+from .lib.case import BaseTestCase
+
+
+class TestBackoff(BaseTestCase):
+
+    def test_growing_to_max_delay(self):
+        intervals = polling.backoff(delay=0.1, max_delay=0.5, factor=2, jitter=0)
+        self.assertEqual(
+            [next(intervals) for _ in range(5)], [0.1, 0.2, 0.4, 0.5, 0.5],
+        )
+
+    def test_jitter(self):
+        intervals = polling.backoff(delay=1.0, max_delay=1.0, jitter=0.1)
+
+        for _ in range(10):
+            self.assertTrue(0.9 <= next(intervals) <= 1.1)
+
+
+class TestPoller(BaseTestCase):
+
+    def test_last_attempt_on_timeout(self):
+        start = time.time()
+        attempts = len(list(polling.Poller(0.1, delay=0.02, max_delay=0.02)))
+
+        self.assertGreaterEqual(time.time() - start, 0.1)
+        self.assertTrue(2 <= attempts <= 10)
+
+    def test_zero_timeout(self):
+        self.assertEqual(len(list(polling.Poller(0))), 1)
+
+    def test_event_wakes_up(self):
+        event = threading.Event()
+        timer = threading.Timer(0.05, event.set)
+        timer.start()
+
+        start = time.time()
+        poller = iter(polling.Poller(5, delay=5, max_delay=5, event=event))
+
+        next(poller)
+        next(poller)
+
+        self.assertLess(time.time() - start, 1)
+        self.assertFalse(event.is_set())
+
+
+class TestWaitingFor(BaseTestCase):
+
+    def test_result(self):
+        calls = []
+
+        def func():
+            calls.append(None)
+            return len(calls) == 3 and 'ok'
+
+        self.assertEqual(waiting_for(func, timeout=5), 'ok')
+        self.assertEqual(len(calls), 3)
+
+    def test_timeout(self):
+        with self.assertRaises(TimeoutException):
+            waiting_for(lambda: False, timeout=0.05)
+
+    def test_exc_cls(self):
+        with self.assertRaises(AssertionError):
+            waiting_for(lambda: False, timeout=0.05, exc_cls=AssertionError)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+from seismograph import resources
+from seismograph.case import Case
+from seismograph.exceptions import ConfigError
+
+from .lib.case import BaseTestCase
+from .lib.factories import suite_factory
+from .lib.factories import config_factory
+
+
+def create_pool(**capacities):
+    return resources.ResourcePool(
+        capacities, threading.Lock, threading.BoundedSemaphore,
+    )
+
+
+class Counter(object):
+
+    def __init__(self, pool, required):
+        self.pool = pool
+        self.required = required
+        self.lock = threading.Lock()
+        self.current = 0
+        self.max = 0
+
+    def __call__(self):
+        with self.pool.hold(self.required):
+            with self.lock:
+                self.current += 1
+                self.max = max(self.max, self.current)
+
+            time.sleep(0.01)
+
+            with self.lock:
+                self.current -= 1
+
+    def run(self, count):
+        threads = [threading.Thread(target=self) for _ in range(count)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+
+class TestResourcePool(BaseTestCase):
+
+    def test_merge(self):
+        self.assertEqual(
+            resources.merge({'db': 1}, None, {'db': 2, 'browser': 1}),
+            {'db': 2, 'browser': 1},
+        )
+
+    def test_capacity_is_respected(self):
+        counter = Counter(create_pool(db=2), {'db': 1})
+        counter.run(6)
+
+        self.assertEqual(counter.max, 2)
+
+    def test_units(self):
+        counter = Counter(create_pool(db=3), {'db': 2})
+        counter.run(4)
+
+        self.assertEqual(counter.max, 1)
+
+    def test_not_configured_is_unlimited(self):
+        counter = Counter(create_pool(db=1), {'browser': 1})
+        counter.run(4)
+
+        self.assertGreater(counter.max, 1)
+
+    def test_units_are_released(self):
+        pool = create_pool(db=1)
+
+        with self.assertRaises(RuntimeError):
+            with pool.hold({'db': 1}):
+                raise RuntimeError()
+
+        with pool.hold({'db': 1}):
+            pass
+
+    def test_take_without_waiting(self):
+        pool = create_pool(db=1)
+
+        acquired = pool.take({'db': 1}, blocking=False)
+        self.assertIsNotNone(acquired)
+        self.assertIsNone(pool.take({'db': 1}, blocking=False))
+
+        pool.release(acquired)
+        self.assertIsNotNone(pool.take({'db': 1}, blocking=False))
+
+    def test_changes_are_tracked(self):
+        changes = []
+        pool = create_pool(db=2)
+        resources.track(lambda name, units: changes.append((name, units)))
+
+        try:
+            with pool.hold({'db': 2}):
+                # units which were not taken are not tracked
+                self.assertIsNone(pool.take({'db': 1}, blocking=False))
+        finally:
+            resources.track(None)
+
+        self.assertEqual(changes, [('db', 2), ('db', -2)])
+
+    def test_capacity_is_exceeded(self):
+        with self.assertRaises(ConfigError):
+            with create_pool(db=1).hold({'db': 2}):
+                pass
+
+    def test_pool_from_config(self):
+        config = config_factory.create(RESOURCES={'db': 1})
+        pool = resources.get_pool(config)
+
+        self.assertIn('db', pool)
+        self.assertIs(resources.get_pool(config), pool)
+
+
+class TestDeclaration(BaseTestCase):
+
+    def test_case_inherits_suite_resources(self):
+        suite = suite_factory.create(resources={'db': 1})
+
+        class ResourceCase(Case):
+            __resources__ = {'browser': 1}
+
+            def test(self):
+                pass
+
+        ResourceCase.mount_to(suite)
+
+        self.assertEqual(
+            ResourceCase('test').resources, {'db': 1, 'browser': 1},
+        )
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+from seismograph import result as _result
+from seismograph.xunit import XUnitData
+
+from .lib.case import BaseTestCase
+from .lib.factories import case_factory
+from .lib.factories import config_factory
+from .lib.factories import result_factory
+
+
+class FakeListener(_result.ResultListener):
+
+    def __init__(self):
+        self.records = []
+
+    def on_result(self, status, runnable_object, xunit_data):
+        self.records.append((status, runnable_object))
+
+
+class TestResultListener(BaseTestCase):
+
+    def setUp(self):
+        self.case = case_factory.create()
+        self.listener = FakeListener()
+        self.result = result_factory.create(config_factory.create())
+        self.result.add_listener(self.listener)
+
+    def test_notify_on_add(self):
+        self.result.add_success(self.case, 0.1)
+        self.result.add_skip(self.case, 'reason', 0.0)
+
+        self.assertEqual(
+            self.listener.records,
+            [
+                (_result.STATUS_SUCCESS, self.case),
+                (_result.STATUS_SKIP, self.case),
+            ],
+        )
+
+    def test_proxy_is_notified_once(self):
+        with self.result.proxy() as result_proxy:
+            result_proxy.add_success(self.case, 0.1)
+
+        self.assertEqual(len(self.result.successes), 1)
+        self.assertEqual(
+            self.listener.records, [(_result.STATUS_SUCCESS, self.case)],
+        )
+
+    def test_add_result(self):
+        xunit_data = XUnitData(runtime=0.1, class_name='Case', method_name='test')
+        self.result.add_result(_result.STATUS_FAIL, self.case, xunit_data)
+
+        self.assertEqual(self.result.failures, [(self.case, xunit_data)])
+        self.assertEqual(
+            self.listener.records, [(_result.STATUS_FAIL, self.case)],
+        )
+
+
+class TestStorage(BaseTestCase):
+
+    def setUp(self):
+        self.cases = [case_factory.create() for _ in range(3)]
+        self.storage = _result.Storage(
+            (case, XUnitData(runtime=i)) for i, case in enumerate(self.cases)
+        )
+
+    def test_get(self):
+        self.assertEqual(self.storage.get(self.cases[1]).runtime, 1)
+        self.assertIsNone(self.storage.get(case_factory.create()))
+
+    def test_reset_moves_record_to_the_end(self):
+        xunit_data = XUnitData(runtime=5)
+
+        self.assertTrue(self.storage.reset(self.cases[0], xunit_data))
+        self.assertFalse(self.storage.reset(case_factory.create(), xunit_data))
+
+        self.assertEqual(
+            [case for case, _ in self.storage],
+            [self.cases[1], self.cases[2], self.cases[0]],
+        )
+        self.assertIs(self.storage.get(self.cases[0]), xunit_data)
+        self.assertEqual(len(self.storage), 3)
+        self.assertIs(self.storage[-1][1], xunit_data)
+
+    def test_pop(self):
+        self.assertEqual(self.storage.pop(self.cases[2]).runtime, 2)
+        self.assertIsNone(self.storage.pop(self.cases[2]))
+
+        self.assertEqual(len(self.storage), 2)
+        self.assertEqual([case for case, _ in self.storage], self.cases[:2])
+
+    def test_runtime_is_kept_up_to_date(self):
+        self.assertEqual(self.storage.runtime, 3)
+
+        self.storage.reset(self.cases[0], XUnitData(runtime=5))
+        self.assertEqual(self.storage.runtime, 8)
+
+        self.storage.pop(self.cases[2])
+        self.assertEqual(self.storage.runtime, 6)
+
+        self.storage.extend(_result.Storage([(self.cases[2], XUnitData(runtime=0.5))]))
+        self.assertEqual(self.storage.runtime, 6.5)
+
+    def test_duplicates_are_found_in_order(self):
+        xunit_data = XUnitData(runtime=7)
+        self.storage.append((self.cases[0], xunit_data))
+
+        self.storage.pop(self.cases[0])
+
+        self.assertIs(self.storage.get(self.cases[0]), xunit_data)
+
+    def test_result_api(self):
+        result = result_factory.create(config_factory.create())
+        result.add_success(self.cases[0], 0.1)
+        xunit_data = XUnitData(runtime=0.2)
+
+        self.assertEqual(result.get_success_by(self.cases[0]).runtime, 0.1)
+        self.assertTrue(result.reset_success(self.cases[0], xunit_data))
+        self.assertIs(result.get_success_by(self.cases[0]), xunit_data)
+        self.assertIsNone(result.get_fail_by(self.cases[0]))
+        self.assertEqual(result.successes, [(self.cases[0], xunit_data)])
+
+    def test_state_of_proxies(self):
+        result = result_factory.create(config_factory.create())
+
+        with result.proxy() as result_proxy:
+            result_proxy.add_success(self.cases[0], 0.25)
+            result_proxy.add_skip(self.cases[1], 'reason', 0.5)
+
+        self.assertEqual(result_proxy.get_state().runtime, 0.75)
+
+        state = result.get_state()
+        self.assertEqual(state.runtime, 0.75)
+        self.assertEqual(state.tests, 2)
+        self.assertEqual(state.skipped, 1)
+        self.assertTrue(state.was_success)
+
+    def test_linked_storage(self):
+        storage = _result.Storage()
+        storage.append((self.cases[0], XUnitData(runtime=1)))
+        storage.extend(self.storage)
+
+        self.assertEqual(len(storage), 4)
+        self.assertEqual(storage.runtime, 4)
+        self.assertEqual(
+            [case for case, _ in storage], [self.cases[0]] + self.cases,
+        )
+        self.assertEqual(storage.get(self.cases[2]).runtime, 2)
+
+        # linked storage is not changed, record is added to storage of parent
+        self.storage.append((self.cases[0], XUnitData(runtime=1)))
+
+        self.assertEqual(len(self.storage), 3)
+        self.assertEqual(len(storage), 5)
+        self.assertEqual(storage.runtime, 5)
+        self.assertEqual(
+            [case for case, _ in storage], [self.cases[0]] + self.cases + [self.cases[0]],
+        )
+
+    def test_nested_proxies_are_linked(self):
+        result = result_factory.create(config_factory.create())
+
+        with result.proxy() as suite_proxy:
+            for case in self.cases:
+                with suite_proxy.proxy() as case_proxy:
+                    case_proxy.add_success(case, 0.5)
+
+        self.assertIs(suite_proxy._marker, result._marker)
+        self.assertIs(suite_proxy.parent, result)
+        self.assertEqual([case for case, _ in result.successes], self.cases)
+        self.assertEqual(result.get_state().tests, 3)
+        self.assertEqual(result.get_success_by(self.cases[1]).runtime, 0.5)
+
+    def test_late_record_of_proxy(self):
+        result = result_factory.create(config_factory.create())
+
+        with result.proxy() as suite_proxy:
+            with suite_proxy.proxy() as case_proxy:
+                pass
+
+        # case which was finished after exit of proxy is not lost
+        case_proxy.add_success(self.cases[0], 0.5)
+
+        self.assertEqual(result.get_state().tests, 1)
+        self.assertEqual(result.get_success_by(self.cases[0]).runtime, 0.5)
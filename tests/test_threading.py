@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+import threading
+
+from seismograph import resources
+from seismograph.case import Case
+from seismograph.utils import pyv
+from seismograph.groups import get_threads_pool_size
+from seismograph.groups import ASYNCIO_EXTRA_THREADS
+from seismograph.groups.threading import SharedExecutor
+
+from .lib.case import BaseTestCase
+from .lib.factories import suite_factory
+from .lib.factories import config_factory
+from .lib.factories import result_factory
+
+
+class Counter(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.max = 0
+        self.calls = 0
+
+    def __call__(self, result):
+        with self.lock:
+            self.calls += 1
+            self.current += 1
+            self.max = max(self.max, self.current)
+
+        time.sleep(0.01)
+
+        with self.lock:
+            self.current -= 1
+
+
+class Interrupt(object):
+
+    def __call__(self, result):
+        raise KeyboardInterrupt()
+
+
+class Stop(object):
+
+    def __call__(self, result):
+        result.current_state.should_stop = True
+
+
+class TestSharedExecutor(BaseTestCase):
+
+    def setUp(self):
+        self.result = result_factory.create(config_factory.create())
+
+    def test_run(self):
+        counter = Counter()
+        executor = SharedExecutor(4)
+
+        executor.run([counter] * 10, self.result, limit=2)
+
+        self.assertEqual(counter.calls, 10)
+        self.assertEqual(counter.max, 2)
+
+    def test_global_limit(self):
+        counter = Counter()
+        executor = SharedExecutor(3)
+
+        threads = [
+            threading.Thread(
+                target=executor.run, args=([counter] * 5, self.result), kwargs={'limit': 3},
+            )
+            for _ in range(3)
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counter.calls, 15)
+        self.assertLessEqual(counter.max, 3)
+
+    def test_threads_are_reused(self):
+        counter = Counter()
+        executor = SharedExecutor(2)
+
+        executor.run([counter] * 4, self.result, limit=2)
+        threads = set(threading.enumerate())
+        executor.run([counter] * 4, self.result, limit=2)
+
+        self.assertEqual(set(threading.enumerate()), threads)
+
+    def test_error_is_raised(self):
+        counter = Counter()
+        executor = SharedExecutor(1)
+
+        with self.assertRaises(KeyboardInterrupt):
+            executor.run([Interrupt()] + [counter] * 3, self.result, limit=1)
+
+        self.assertEqual(counter.calls, 0)
+
+    def test_cancel_on_stop(self):
+        counter = Counter()
+        executor = SharedExecutor(1)
+
+        executor.run([counter, Stop()] + [counter] * 3, self.result, limit=1)
+
+        self.assertEqual(counter.calls, 1)
+
+    def test_tasks_are_pulled_on_demand(self):
+        log = []
+        executor = SharedExecutor(1)
+
+        def generate():
+            for i in range(3):
+                log.append(('pull', i))
+                yield lambda result, i=i: log.append(('run', i))
+
+        try:
+            executor.run(generate(), self.result, limit=1)
+        finally:
+            executor.shutdown()
+
+        self.assertEqual(
+            log, [('pull', 0), ('run', 0), ('pull', 1), ('run', 1), ('pull', 2), ('run', 2)],
+        )
+
+    def test_empty_tasks(self):
+        executor = SharedExecutor(1)
+
+        try:
+            executor.run(iter([]), self.result, limit=1)
+        finally:
+            executor.shutdown()
+
+    def test_error_of_tasks_is_raised(self):
+        counter = Counter()
+        executor = SharedExecutor(1)
+
+        def generate():
+            yield counter
+            raise ValueError('build error')
+
+        try:
+            with self.assertRaises(ValueError):
+                executor.run(generate(), self.result, limit=1)
+        finally:
+            executor.shutdown()
+
+        self.assertEqual(counter.calls, 1)
+
+    def test_busy_resources_do_not_take_thread(self):
+        log = []
+        free_started = threading.Event()
+        config = config_factory.create(RESOURCES={'db': 1})
+        suite = suite_factory.create(config=config)
+
+        class ResourceCase(Case):
+            __resources__ = {'db': 1}
+
+            def test(self):
+                pass
+
+            def __run__(self, result):
+                with resources.hold(self):
+                    # second resource case must wait without thread,
+                    # so free case is started while db is held
+                    log.append(free_started.wait(5))
+
+        class FreeCase(Case):
+
+            def test(self):
+                pass
+
+            def __run__(self, result):
+                free_started.set()
+
+        ResourceCase.mount_to(suite)
+        FreeCase.mount_to(suite)
+
+        executor = SharedExecutor(2)
+
+        try:
+            executor.run(
+                [
+                    ResourceCase('test', config=config),
+                    ResourceCase('test', config=config),
+                    FreeCase('test', config=config),
+                ],
+                self.result,
+                limit=2,
+            )
+        finally:
+            executor.shutdown()
+
+        self.assertEqual(log, [True, True])
+
+    @unittest.skipIf(pyv.IS_PYTHON_2, 'concurrent.futures is not supported on python 2')
+    def test_submit(self):
+        executor = SharedExecutor(2)
+
+        try:
+            futures = [executor.submit(pow, 2, i) for i in range(5)]
+            self.assertEqual([f.result(timeout=5) for f in futures], [1, 2, 4, 8, 16])
+        finally:
+            executor.shutdown()
+
+
+class TestThreadsPoolSize(BaseTestCase):
+
+    def setUp(self):
+        self.config = config_factory.create()
+        self.config.ASYNC_SUITES = 3
+        self.config.ASYNC_TESTS = 100
+
+    def test_max_threads(self):
+        self.config.MAX_THREADS = 7
+
+        self.assertEqual(get_threads_pool_size(self.config), 7)
+
+    def test_cases_of_all_suites(self):
+        self.assertEqual(get_threads_pool_size(self.config), 300)
+
+    def test_cases_of_one_suite_per_process(self):
+        self.config.MULTIPROCESSING = True
+
+        self.assertEqual(get_threads_pool_size(self.config), 100)
+
+    def test_asyncio(self):
+        from multiprocessing import cpu_count
+
+        self.config.ASYNCIO = True
+
+        self.assertEqual(
+            get_threads_pool_size(self.config),
+            cpu_count() + ASYNCIO_EXTRA_THREADS,
+        )
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import time
+import signal
+import threading
+
+from seismograph import watchdog
+from seismograph.exceptions import CaseTimeout
+
+from .lib.case import BaseTestCase
+
+
+def busy(seconds):
+    deadline = time.time() + seconds
+
+    while time.time() < deadline:
+        pass
+
+
+class TestSignalLimit(BaseTestCase):
+
+    def setUp(self):
+        if not hasattr(signal, 'setitimer'):
+            self.skipTest('setitimer is not supported')
+
+    def test_timeout(self):
+        with self.assertRaises(CaseTimeout):
+            with watchdog.signal_limit(0.05):
+                busy(2)
+
+    def test_handler_is_restored(self):
+        previous = signal.getsignal(signal.SIGALRM)
+
+        with watchdog.signal_limit(0.05):
+            pass
+
+        self.assertIs(signal.getsignal(signal.SIGALRM), previous)
+
+
+class TestThreadLimit(BaseTestCase):
+
+    def run_in_thread(self, timeout, seconds):
+        errors = []
+
+        def target():
+            try:
+                with watchdog.thread_limit(timeout):
+                    busy(seconds)
+            except CaseTimeout as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join(5)
+
+        return errors
+
+    def test_timeout(self):
+        errors = self.run_in_thread(0.05, 2)
+        self.assertEqual(len(errors), 1)
+
+    def test_not_exceeded(self):
+        errors = self.run_in_thread(1, 0.01)
+        self.assertEqual(errors, [])
+
+    def test_pending_exception_is_cleared(self):
+        errors = []
+        blocked = threading.Event()
+        released = threading.Event()
+
+        def target():
+            try:
+                blocked.set()
+                released.wait()
+                busy(0.05)
+            except CaseTimeout as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        blocked.wait()
+
+        watchdog.async_raise(thread.ident, CaseTimeout)
+        watchdog.async_raise(thread.ident, None)
+
+        released.set()
+        thread.join(5)
+
+        self.assertEqual(errors, [])
+
+
+class TestDisarm(BaseTestCase):
+
+    def test_interrupted_watch_is_disarmed(self):
+        dog = watchdog.Watchdog()
+        thread_id = threading.current_thread().ident
+
+        interrupted = dog.watch(60, on_kill=lambda stack: None)
+        interrupted.was_interrupted = True
+        running = dog.watch(60)
+
+        dog.disarm(thread_id)
+
+        self.assertFalse(interrupted.is_active)
+        self.assertTrue(running.is_active)
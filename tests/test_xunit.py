@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+from xml.etree import ElementTree
+
+from seismograph import xunit
+from seismograph.exceptions import ConfigError
+
+from .lib.case import BaseTestCase
+from .lib.factories import case_factory
+from .lib.factories import config_factory
+from .lib.factories import result_factory
+
+
+def create_xunit_data(method_name, reason=None):
+    return xunit.XUnitData(
+        runtime=0.1,
+        reason=reason,
+        class_name='Case',
+        method_name=method_name,
+        exc_type='AssertionError',
+        exc_message='a & b',
+    )
+
+
+class XUnitTestCase(BaseTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'report.xml')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def read(self):
+        with open(self.file_path, 'rb') as fp:
+            return fp.read()
+
+    def get_cases(self):
+        root = ElementTree.parse(self.file_path).getroot()
+        return [case.get('name') for case in root.iter('testcase')]
+
+
+class TestXUnitStream(XUnitTestCase):
+
+    def test_cases_are_written_on_add(self):
+        stream = xunit.XUnitStream(self.file_path, name='test')
+        stream.write(create_xunit_data('test_a'))
+        stream.write(create_xunit_data('test_b', reason='reason'), 'failure')
+
+        self.assertIn(b'name="test_b"', self.read())
+
+        stream.close()
+
+        self.assertEqual(self.get_cases(), ['test_a', 'test_b'])
+
+    def test_complete_document_on_close(self):
+        config = config_factory.create()
+        config.XUNIT_REPORT = self.file_path
+        result = result_factory.create(config)
+        case = case_factory.create()
+
+        with result:
+            with result.proxy() as result_proxy:
+                result_proxy.add_success(case, 0.1)
+
+        document = xunit.create_xml_document(result)
+
+        if not isinstance(document, bytes):
+            document = document.encode('utf-8')
+
+        self.assertEqual(self.get_cases(), ['test'])
+        self.assertEqual(self.read(), document)
+        self.assertFalse(os.path.exists(self.file_path + xunit.TMP_SUFFIX))
+
+
+class TestRepairXmlDocument(XUnitTestCase):
+
+    def test_truncated_case_is_dropped(self):
+        stream = xunit.XUnitStream(self.file_path, name='test')
+        stream.write(create_xunit_data('test_a', reason='<line>\n/>\n'), 'error')
+        stream.write(create_xunit_data('test_b'))
+
+        with open(self.file_path, 'ab') as fp:
+            fp.write(b'<testcase time="0.1" name="test_c" cla')
+
+        self.assertTrue(xunit.repair_xml_document(self.file_path))
+        self.assertEqual(self.get_cases(), ['test_a', 'test_b'])
+
+    def test_truncated_header(self):
+        xunit.XUnitStream(self.file_path, name='test')
+
+        with open(self.file_path, 'rb+') as fp:
+            fp.truncate(10)
+
+        self.assertTrue(xunit.repair_xml_document(self.file_path))
+        self.assertEqual(self.get_cases(), [])
+
+    def test_complete_document_is_not_changed(self):
+        stream = xunit.XUnitStream(self.file_path, name='test')
+        stream.write(create_xunit_data('test_a'))
+        stream.close()
+        data = self.read()
+
+        self.assertFalse(xunit.repair_xml_document(self.file_path))
+        self.assertEqual(self.read(), data)
+
+    def test_missing_file(self):
+        with self.assertRaises(ConfigError):
+            xunit.repair_xml_document(self.file_path)